@@ -0,0 +1,256 @@
+"""
+Aggregate path statistics — how many bounded attack paths lead from the
+start set to a target, the total risk they carry and how many of them use
+each edge, without materialising (or even enumerating) the paths.
+
+Paths are counted exactly as the top-k search would find them: simple
+paths over collapsed edges, `min_depth <= hops <= max_depth`, one path set
+per start node, risk as in `search_top_k`.  Only nodes that lie on some
+start -> target walk within the hop budget are considered.
+
+- If that subgraph is acyclic every walk is a simple path, and a
+  depth-layered DP (counts and risk sums split by "high-value seen" and
+  "critical edge seen") gives the exact numbers in O(max_depth * E).
+- Otherwise the simple paths are counted by a pruned depth-first search
+  while it stays within `COUNT_EXPANSION_BUDGET` expansions (exact).
+- Past that budget the DP result is returned flagged `exact: false`: it
+  counts walks that may revisit nodes, so counts, risk and incidences are
+  upper bounds.
+"""
+
+from __future__ import annotations
+
+from math import sqrt
+
+from .graph_engine import (
+    CHECK_INTERVAL, CRITICAL_EDGE_BONUS, HV_MULTIPLIER, GraphEngine, SearchControl, distances_from,
+)
+
+# DFS expansions spent on exact counting before falling back to the walk DP
+COUNT_EXPANSION_BUDGET = 200_000
+
+# Flag bits of a partial path: high-value node seen, critical edge seen
+_HV, _CRIT = 1, 2
+_MULT = [1.0, HV_MULTIPLIER, CRITICAL_EDGE_BONUS, HV_MULTIPLIER * CRITICAL_EDGE_BONUS]
+
+
+class _Budget(Exception):
+    pass
+
+
+def path_statistics(
+    engine: GraphEngine, start_nodes: list[str], target: str,
+    min_depth: int, max_depth: int, top_edges: int = 20, control: SearchControl | None = None,
+) -> dict:
+    """
+    Count the paths `engine.find_paths` would return for an unbounded `k`.
+    Returns {totalPaths, globalRisk, byLength, exact, method, relevantNodes,
+    edgeIncidence}; `edgeIncidence` lists the `top_edges` edges on the most
+    paths.  `globalRisk` sums unrounded path risks, so it can differ from
+    an analysis total in the last decimal.  Progress goes to `control`,
+    which can abort the count (see `SearchControl`).
+    """
+    core = engine.core
+    t = core.index.get(target)
+    blocked = core.blocked()
+    starts = list(dict.fromkeys(
+        i for i in map(core.index.get, start_nodes) if i is not None and not blocked[i]
+    ))
+    result = {"totalPaths": 0, "globalRisk": 0.0, "byLength": [], "exact": True,
+              "method": "none", "relevantNodes": 0, "edgeIncidence": []}
+    if t is None or not starts:
+        return result
+
+    dt = engine.distances(t)
+    df = distances_from(core, starts, max_depth)
+    relevant = [x for x in range(core.num_nodes) if df[x] + dt[x] <= max_depth]
+    crit_edge = engine._crit_edge()
+    result["relevantNodes"] = len(relevant)
+
+    by_len: dict[int, list[float]] = {}   # hops -> [count, raw risk]
+    if min_depth == 0 and t in starts:
+        by_len[0] = [1, core.priv[t] * (HV_MULTIPLIER if core.hv[t] else 1.0)]
+    if _has_cycle(core, relevant, df, dt, t, max_depth):
+        try:
+            incidence = _count_dfs(core, starts, t, min_depth, max_depth, dt, crit_edge, by_len, control)
+            result["method"] = "enumeration"
+        except _Budget:
+            by_len = {h: v for h, v in by_len.items() if h == 0}
+            incidence = _count_dp(core, starts, t, min_depth, max_depth, df, dt, crit_edge, by_len, control)
+            result["method"] = "walks"
+            result["exact"] = False
+    else:
+        incidence = _count_dp(core, starts, t, min_depth, max_depth, df, dt, crit_edge, by_len, control)
+        result["method"] = "dp"
+
+    total = sum(c for c, _ in by_len.values())
+    result["totalPaths"] = total
+    result["globalRisk"] = round(sum(r for _, r in by_len.values()), 2)
+    result["byLength"] = [{"hops": h, "paths": c, "risk": round(r, 2)} for h, (c, r) in sorted(by_len.items())]
+    ranked = sorted(incidence.items(), key=lambda kv: (-kv[1], kv[0]))[:top_edges]
+    result["edgeIncidence"] = [
+        {"edgeId": rec["edgeId"], "source": rec["source"], "relation": rec["relation"],
+         "target": rec["target"], "paths": n, "percentOfPaths": round(n / total * 100, 1)}
+        for j, n in ranked for rec in (core.edge_record(j),)
+    ]
+    return result
+
+
+def _live_succs(core, u: int, h: int, dt, t: int, max_depth: int, blocked):
+    """Collapsed out-edges of `u` (at depth h) that can still finish in budget."""
+    for v, w, j in core.succs(u):
+        if not blocked[v] and h + 1 + dt[v] <= max_depth:
+            yield v, w, j
+
+
+def _has_cycle(core, relevant: list[int], df, dt, t: int, max_depth: int) -> bool:
+    """Cycle check (Kahn) on the relevant subgraph, never leaving the target."""
+    rel = set(relevant)
+    blocked = core.blocked()
+    indeg = dict.fromkeys(relevant, 0)
+    out: dict[int, list[int]] = {}
+    for u in relevant:
+        if u == t:
+            continue
+        nxt = [v for v, _, _ in _live_succs(core, u, df[u], dt, t, max_depth, blocked) if v in rel]
+        out[u] = nxt
+        for v in nxt:
+            indeg[v] += 1
+    queue = [u for u, d in indeg.items() if d == 0]
+    seen = 0
+    while queue:
+        u = queue.pop()
+        seen += 1
+        for v in out.get(u, ()):
+            indeg[v] -= 1
+            if indeg[v] == 0:
+                queue.append(v)
+    return seen < len(relevant)
+
+
+def _count_dp(core, starts, t, min_depth, max_depth, df, dt, crit_edge, by_len, control) -> dict[int, int]:
+    """Walk counts and risk sums by depth layer; returns per-edge incidence."""
+    priv, hv = core.priv, core.hv
+    blocked = core.blocked()
+    # layer[u] = [count per flag state] + [risk-sum per flag state]
+    layers: list[dict[int, list]] = []
+    layer: dict[int, list] = {}
+    for s in starts:
+        if s == t:
+            continue
+        f = _HV if hv[s] else 0
+        row = layer.setdefault(s, [0] * 8)
+        row[f] += 1
+        row[4 + f] += priv[s]
+    for h in range(max_depth):
+        if control is not None:
+            control.tick(len(layer), 0, done=True)
+        layers.append(layer)
+        nxt: dict[int, list] = {}
+        for u, row in layer.items():
+            for v, w, j in _live_succs(core, u, h, dt, t, max_depth, blocked):
+                add = w + priv[v]
+                bits = (_HV if hv[v] else 0) | (_CRIT if j == crit_edge else 0)
+                if v == t:
+                    if h + 1 < min_depth:
+                        continue
+                    acc = by_len.setdefault(h + 1, [0, 0.0])
+                    scale = 1.0 / sqrt(h + 1)
+                    for f in range(4):
+                        c = row[f]
+                        if c:
+                            acc[0] += c
+                            acc[1] += (row[4 + f] + c * add) * scale * _MULT[f | bits]
+                    continue
+                dst = nxt.get(v)
+                if dst is None:
+                    dst = nxt[v] = [0] * 8
+                for f in range(4):
+                    c = row[f]
+                    if c:
+                        g = f | bits
+                        dst[g] += c
+                        dst[4 + g] += row[4 + f] + c * add
+        layer = nxt
+
+    # Backward walk counts to t by exact remaining hops, then per-edge sums
+    back: dict[int, list[int]] = {t: [1] + [0] * max_depth}
+    frontier = {t}
+    for r in range(1, max_depth + 1):
+        nxt = set()
+        for v in frontier:
+            cnt = back[v][r - 1]
+            for u in core.preds(v):
+                if u == t or blocked[u] or df[u] + r > max_depth:
+                    continue
+                row = back.get(u)
+                if row is None:
+                    row = back[u] = [0] * (max_depth + 1)
+                row[r] += cnt
+                nxt.add(u)
+        frontier = nxt
+    incidence: dict[int, int] = {}
+    for h, layer in enumerate(layers):
+        lo = max(0, min_depth - h - 1)
+        for u, row in layer.items():
+            c = sum(row[:4])
+            for v, _, j in _live_succs(core, u, h, dt, t, max_depth, blocked):
+                tail = back.get(v)
+                if tail is None:
+                    continue
+                n = c * sum(tail[lo:max_depth - h])
+                if n:
+                    incidence[j] = incidence.get(j, 0) + n
+    return incidence
+
+
+def _count_dfs(core, starts, t, min_depth, max_depth, dt, crit_edge, by_len, control) -> dict[int, int]:
+    """Enumerate simple paths (pruned by `dt`) within the expansion budget."""
+    priv, hv = core.priv, core.hv
+    blocked = core.blocked()
+    incidence: dict[int, int] = {}
+    expanded = 0
+    for s in starts:
+        if s == t:
+            continue
+        on_path = bytearray(blocked)
+        on_path[s] = 1
+        epath: list[int] = []
+        state = [(0, priv[s], _HV if hv[s] else 0)]
+        stack = [_live_succs(core, s, 0, dt, t, max_depth, blocked)]
+        nodes = [s]
+        while stack:
+            nxt = next(stack[-1], None)
+            if nxt is None:
+                stack.pop()
+                state.pop()
+                on_path[nodes.pop()] = 0
+                if epath:
+                    epath.pop()
+                continue
+            v, w, j = nxt
+            if on_path[v]:
+                continue
+            sw, sp, f = state[-1]
+            f |= (_HV if hv[v] else 0) | (_CRIT if j == crit_edge else 0)
+            hops = len(nodes)
+            if v == t:
+                if hops >= min_depth:
+                    acc = by_len.setdefault(hops, [0, 0.0])
+                    acc[0] += 1
+                    acc[1] += (sw + w + sp + priv[v]) / sqrt(hops) * _MULT[f]
+                    for e in epath:
+                        incidence[e] = incidence.get(e, 0) + 1
+                    incidence[j] = incidence.get(j, 0) + 1
+                continue
+            expanded += 1
+            if expanded > COUNT_EXPANSION_BUDGET:
+                raise _Budget
+            if control is not None and expanded % CHECK_INTERVAL == 0:
+                control.tick(CHECK_INTERVAL, 0, done=True)
+            nodes.append(v)
+            epath.append(j)
+            on_path[v] = 1
+            state.append((sw + w, sp + priv[v], f))
+            stack.append(_live_succs(core, v, hops, dt, t, max_depth, blocked))
+    return incidence
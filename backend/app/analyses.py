@@ -0,0 +1,189 @@
+"""
+Analysis store — the path lists of past analyses, addressed as
+(analysisId, pathId) by /explain and other drill-down endpoints.
+
+An analysis id is a hash of the dataset version and the request
+parameters, so every worker that runs (or reruns) the same analysis
+hands out the same id for the same paths.  Paths are kept as compact
+records (see `compact`) in a bounded LRU; with a spill directory each
+analysis is also written there as one small JSON file, which lets any
+worker sharing the directory answer for it and lets entries evicted
+from memory come back.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from .cache import ResultCache
+from .graph_engine import GraphEngine
+from .pathset import PathSet
+
+# In-memory bounds (the byte count is that of the compact JSON records)
+ANALYSIS_MAX_ENTRIES = 512
+ANALYSIS_MAX_BYTES = 64 * 1024 * 1024
+
+# Spilled analyses kept on disk (least recently used are deleted)
+ANALYSIS_SPILL_KEEP = 4096
+
+# Shape of the ids `analysis_id` hands out (anything else is never looked up)
+_ID = re.compile(r"[0-9a-f]{16}")
+
+
+def analysis_id(version: str, kind: str, *params) -> str:
+    """Stable id of an analysis of dataset `version` with `params`."""
+    key = json.dumps([version, kind, *params], sort_keys=True, default=str)
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def compact(path: dict) -> list:
+    """
+    Path record as [pathId, nodes, [[edgeId, relation, weight], …], risk,
+    normalizedScore, impactEstimation, criticalEdgesInPath]; the rest of
+    the record is derived from these (see `expand`).
+    """
+    return [
+        path["pathId"], path["nodes"],
+        [[e["edgeId"], e["relation"], e["weight"]] for e in path["edges"]],
+        path["risk"], path["normalizedScore"], path["impactEstimation"], path["criticalEdgesInPath"],
+    ]
+
+
+def compact_set(paths: PathSet) -> list[list]:
+    """`compact` records of a `PathSet`, ranked, without building path dicts."""
+    core = paths.core
+    hops: dict[int, list] = {}
+    out = []
+    for i in paths.order:
+        edge_ids = paths.path_edges(i)
+        for j in edge_ids:
+            if j not in hops:
+                rec = core.edge_record(j)
+                hops[j] = [rec["edgeId"], rec["relation"], rec["weight"]]
+        grade = GraphEngine._grade(paths.raw[i])
+        out.append([
+            paths.path_id(i), [core.names[x] for x in paths.path_nodes(i)], [hops[j] for j in edge_ids],
+            grade["risk"], grade["normalizedScore"], grade["impactEstimation"],
+            [core.edge_ids[j] for j in edge_ids if j == paths.crit_edge],
+        ])
+    return out
+
+
+def expand(rec: list) -> dict:
+    """Full path record (as returned by /analyze) from a compact one."""
+    path_id, nodes, hops, risk, normalized, impact, critical = rec
+    edges = [
+        {"edgeId": eid, "source": nodes[i], "target": nodes[i + 1], "relation": rel, "weight": w}
+        for i, (eid, rel, w) in enumerate(hops)
+    ]
+    return {
+        "pathId": path_id,
+        "nodes": nodes,
+        "edges": edges,
+        "hops": len(edges),
+        "edgeTypes": [e["relation"] for e in edges],
+        "sumWeights": sum(e["weight"] for e in edges),
+        "risk": risk,
+        "normalizedScore": normalized,
+        "impactEstimation": impact,
+        "throughCritical": bool(critical),
+        "criticalEdgesInPath": critical,
+    }
+
+
+class AnalysisStore:
+    """Bounded, optionally disk-backed store of analysed path lists."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_entries: int = ANALYSIS_MAX_ENTRIES,
+        max_bytes: int = ANALYSIS_MAX_BYTES,
+        keep: int = ANALYSIS_SPILL_KEEP,
+    ):
+        # Stored analyses never change, so no time-to-live
+        self._cache = ResultCache(max_entries, max_bytes, ttl=float("inf"))
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        self.latest: str | None = None
+        self._written = 0
+
+    def put(self, aid: str, paths: list[dict] | PathSet, latest: bool = True) -> str:
+        """
+        Store `paths` under `aid` (replacing any earlier copy) and, unless
+        `latest` is false, make it the analysis `path(None, …)` refers to.
+        Returns `aid`.
+        """
+        records = compact_set(paths) if isinstance(paths, PathSet) else [compact(p) for p in paths]
+        body = json.dumps(records, separators=(",", ":")).encode()
+        self._cache.put(aid, {r[0]: r for r in records}, len(body))
+        if latest:
+            self.latest = aid
+        if self.directory is not None:
+            self._spill(aid, body)
+        return aid
+
+    def get(self, aid: str) -> dict[str, list] | None:
+        """{pathId: compact record} of analysis `aid`, or None if unknown."""
+        hit = self._cache.get(aid)
+        if hit is not None or self.directory is None or not _ID.fullmatch(aid):
+            return hit
+        path = self._file(aid)
+        try:
+            body = path.read_bytes()
+            path.touch()
+        except OSError:
+            return None
+        hit = {r[0]: r for r in json.loads(body)}
+        self._cache.put(aid, hit, len(body))
+        return hit
+
+    def path(self, aid: str | None, path_id: str) -> dict | None:
+        """Full record of one path; `aid` None means the latest analysis."""
+        records = self.get(aid or self.latest or "")
+        rec = records.get(path_id) if records is not None else None
+        return expand(rec) if rec is not None else None
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "spillDirectory": str(self.directory) if self.directory else None}
+
+    # ── spill files ─────────────────────────────────────────────────────────
+    def _file(self, aid: str) -> Path:
+        return self.directory / f"{aid}.json"
+
+    def _spill(self, aid: str, body: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, self._file(aid))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self._written += 1
+        if self._written % 64 == 0:
+            self._trim()
+
+    def _trim(self) -> None:
+        files = []
+        for p in self.directory.glob("*.json"):
+            try:
+                files.append((p.stat().st_mtime, p))
+            except OSError:
+                pass
+        files.sort(reverse=True)
+        for _, p in files[self.keep:]:
+            try:
+                p.unlink()
+            except OSError:
+                pass
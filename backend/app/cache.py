@@ -0,0 +1,141 @@
+"""
+Result cache — LRU + TTL store for analysis results, bounded by entry
+count and by an estimate of the bytes the cached objects occupy.
+
+Keys start with the dataset content hash (`dataset.VERSION`), so results
+computed for one dataset can never be served for another; after a patch,
+`migrate` carries over the entries the patch cannot have changed.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Defaults for the process-wide analysis cache
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_TTL_SECONDS = 15 * 60
+
+
+def estimate_size(obj) -> int:
+    """Approximate deep size in bytes; shared sub-objects count once."""
+    seen: set[int] = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+    return total
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a time-to-live and a byte budget."""
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttl: float = CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: OrderedDict[tuple, tuple[object, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple):
+        """Return the cached value or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, stored = entry
+            if time.monotonic() - stored > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value, size: int | None = None) -> None:
+        """Store `value`; values larger than the whole budget are skipped."""
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._data[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _drop(self, key: tuple) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def migrate(self, old_version: str, new_version: str, keep) -> tuple[int, int]:
+        """
+        Re-key entries of dataset `old_version` for which `keep(key, value)`
+        is true to `new_version` and drop the rest.  `keep` runs outside the
+        lock.  Returns (kept, dropped).
+        """
+        with self._lock:
+            entries = [(k, v) for k, (v, _, _) in self._data.items() if k[0] == old_version]
+        verdicts = [(k, keep(k, v)) for k, v in entries]
+        kept = dropped = 0
+        with self._lock:
+            for key, ok in verdicts:
+                entry = self._data.pop(key, None)
+                if entry is None:
+                    continue
+                if ok:
+                    new_key = (new_version,) + key[1:]
+                    if new_key in self._data:
+                        self._drop(new_key)   # replaced: its bytes go with it
+                    self._data[new_key] = entry
+                    kept += 1
+                else:
+                    self._bytes -= entry[1]
+                    dropped += 1
+        return kept, dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl,
+            }
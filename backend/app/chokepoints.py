@@ -0,0 +1,235 @@
+"""
+Structural chokepoints — the nodes and edges every bounded attack path
+from a start set to a target must cross, and a minimum edge cut that
+separates them, computed from the graph rather than from an enumerated
+(and truncated) path list.
+
+Both work on the relevant subgraph: nodes and collapsed edges that lie on
+some start -> target walk within `max_depth` hops.  Every bounded path
+lives there, so whatever every path of the subgraph must cross, every
+bounded path crosses too; a cut of the subgraph cuts every bounded path
+(it can be larger than the smallest cut for the hop bound alone).
+
+- Must-pass nodes / edges: dominator tree of the reversed subgraph rooted
+  at the target, with every edge subdivided into a node of its own so
+  edges can dominate too (Cooper-Harvey-Kennedy iteration, near-linear on
+  these graphs).  x is on every path from start s iff x is an ancestor of
+  s in that tree, so the chokepoints of the whole start set are the
+  ancestors of the starts' lowest common ancestor.
+- Minimum cut: unit-capacity max flow (each parallel edge is a unit) from
+  the start set to the target.  Its value is the number of edge-disjoint
+  paths; the saturated edges leaving the source side form the cut.  Flow
+  stops at `CUT_FLOW_LIMIT`, beyond which no cut is reported.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+from .graph_engine import GraphEngine, SearchControl, distances_from
+
+# Edge-disjoint paths counted before giving up on a minimum cut
+CUT_FLOW_LIMIT = 64
+
+
+def chokepoints(
+    engine: GraphEngine, start_nodes: list[str], target: str, max_depth: int,
+    cut_limit: int = CUT_FLOW_LIMIT, control: SearchControl | None = None,
+) -> dict:
+    """
+    Return {reachable, relevantNodes, nodes, edges, edgeDisjointPaths,
+    cutComplete, minCut}.  `nodes` / `edges` are the must-pass chokepoints
+    ordered from the start side to the target (start nodes and the target
+    itself are not listed); edge entries carry every parallel edge id of
+    their node pair, as all of them have to go to cut it.  Progress goes
+    to `control`, which can abort the computation (see `SearchControl`).
+    """
+    core = engine.core
+    t = core.index.get(target)
+    blocked = core.blocked()
+    starts = list(dict.fromkeys(
+        i for i in map(core.index.get, start_nodes) if i is not None and not blocked[i] and i != t
+    ))
+    result = {"reachable": False, "relevantNodes": 0, "nodes": [], "edges": [],
+              "edgeDisjointPaths": 0, "cutComplete": True, "minCut": []}
+    if t is None or not starts:
+        return result
+    dt = engine.distances(t)
+    starts = [s for s in starts if dt[s] <= max_depth]
+    if not starts:
+        return result
+    df = distances_from(core, starts, max_depth)
+
+    # Relevant subgraph: adjacency (v, edge index) per node, none out of t
+    out: dict[int, list[tuple[int, int]]] = {}
+    for u in range(core.num_nodes):
+        if u == t or df[u] + dt[u] > max_depth:
+            continue
+        out[u] = [(v, j) for v, _, j in core.succs(u) if not blocked[v] and df[u] + 1 + dt[v] <= max_depth]
+    result["reachable"] = True
+    result["relevantNodes"] = len(out) + 1
+
+    node_chain, edge_chain = _must_pass(core, out, starts, t, control)
+    start_set = set(starts)
+    result["nodes"] = [_node_record(core, x) for x in node_chain if x not in start_set]
+    result["edges"] = [_edge_record(core, j) for j in edge_chain]
+    flow, cut = _min_cut(core, out, starts, t, cut_limit, control)
+    result["edgeDisjointPaths"] = flow
+    result["cutComplete"] = cut is not None
+    result["minCut"] = [_edge_record(core, j) for j in cut or ()]
+    return result
+
+
+def _node_record(core, x: int) -> dict:
+    return {"name": core.names[x], "highValue": bool(core.hv[x])}
+
+
+def _edge_record(core, j: int) -> dict:
+    rec = core.edge_record(j)
+    pair = core.pair_edges(core.edge_src[j], core.edge_dst[j])
+    return {"edgeId": rec["edgeId"], "source": rec["source"], "relation": rec["relation"],
+            "target": rec["target"], "parallelEdgeIds": [core.edge_ids[p] for p in pair]}
+
+
+def _must_pass(core, out, starts: list[int], t: int, control) -> tuple[list[int], list[int]]:
+    """
+    (node ids, edge indices) on every start -> t path of `out`, start side
+    first.  In the subdivided graph nodes keep their id and edge j becomes
+    vertex `core.num_nodes + j`.
+    """
+    n = core.num_nodes
+    # Reverse adjacency of the subdivided graph: v <- e(u->v) <- u
+    rev: dict[int, list[int]] = {t: []}
+    fwd: dict[int, list[int]] = {}
+    for u, nbrs in out.items():
+        rev.setdefault(u, [])
+        fwd[u] = []
+        for v, j in nbrs:
+            e = n + j
+            rev.setdefault(v, []).append(e)
+            rev[e] = [u]
+            fwd[u].append(e)
+            fwd[e] = [v]
+
+    # Reverse postorder of the reversed graph from t
+    order: list[int] = []
+    seen = {t}
+    stack = [(t, iter(rev[t]))]
+    while stack:
+        x, it = stack[-1]
+        y = next(it, None)
+        if y is None:
+            stack.pop()
+            order.append(x)
+        elif y not in seen:
+            seen.add(y)
+            stack.append((y, iter(rev[y])))
+    order.reverse()
+    rank = {x: i for i, x in enumerate(order)}
+
+    # Cooper-Harvey-Kennedy: predecessors in the reversed graph are the
+    # forward successors.
+    idom = {t: t}
+    changed = True
+    while changed:
+        if control is not None:
+            control.tick(len(order), 0, done=True)
+        changed = False
+        for x in order[1:]:
+            new = -1
+            for p in fwd.get(x, ()):
+                if p not in idom:
+                    continue
+                if new < 0:
+                    new = p
+                    continue
+                a, b = p, new
+                while a != b:
+                    while rank[a] > rank[b]:
+                        a = idom[a]
+                    while rank[b] > rank[a]:
+                        b = idom[b]
+                new = a
+            if idom.get(x) != new:
+                idom[x] = new
+                changed = True
+
+    # Lowest common ancestor of the starts, then its ancestors up to t
+    def chain(x: int) -> list[int]:
+        up = [x]
+        while x != t:
+            x = idom[x]
+            up.append(x)
+        return up
+
+    common = chain(starts[0])
+    for s in starts[1:]:
+        on = set(chain(s))
+        while common[0] not in on:
+            common.pop(0)
+    nodes = [x for x in common[:-1] if x < n]
+    edges = [x - n for x in common if x >= n]
+    return nodes, edges
+
+
+def _min_cut(core, out, starts: list[int], t: int, limit: int, control) -> tuple[int, list[int] | None]:
+    """
+    Max flow from the start set to t, one unit per (parallel) edge.
+    Returns (flow, collapsed edge indices of a minimum cut), or (flow so
+    far, None) if more flow is left once it has reached `limit`.
+    """
+    cap: dict[tuple[int, int], int] = {}
+    radj: dict[int, set[int]] = {}
+    rep: dict[tuple[int, int], int] = {}
+    for u, nbrs in out.items():
+        for v, j in nbrs:
+            cap[(u, v)] = len(core.pair_edges(u, v))
+            rep[(u, v)] = j
+            radj.setdefault(u, set()).add(v)
+            radj.setdefault(v, set()).add(u)
+    flow: dict[tuple[int, int], int] = {}
+
+    def residual(u: int, v: int) -> int:
+        return cap.get((u, v), 0) - flow.get((u, v), 0) + flow.get((v, u), 0)
+
+    def source_side() -> dict[int, int]:
+        parent = {s: -1 for s in starts}
+        queue = deque(starts)
+        while queue:
+            u = queue.popleft()
+            if u == t:
+                break
+            for v in radj.get(u, ()):
+                if v not in parent and residual(u, v) > 0:
+                    parent[v] = u
+                    queue.append(v)
+        return parent
+
+    total = 0
+    while True:
+        parent = source_side()
+        if control is not None:
+            control.tick(len(parent), 0, done=True)
+        if t not in parent:
+            break
+        if total >= limit:
+            return total, None
+        path = []
+        v = t
+        while parent[v] >= 0:
+            path.append((parent[v], v))
+            v = parent[v]
+        push = min(residual(u, v) for u, v in path)
+        for u, v in path:
+            back = flow.get((v, u), 0)
+            if back:
+                undo = min(back, push)
+                flow[(v, u)] = back - undo
+                if push > undo:
+                    flow[(u, v)] = flow.get((u, v), 0) + push - undo
+            else:
+                flow[(u, v)] = flow.get((u, v), 0) + push
+        total += push
+    side = source_side()
+    cut = sorted(rep[(u, v)] for (u, v) in cap if u in side and v not in side)
+    return total, cut
@@ -0,0 +1,540 @@
+"""
+Compiled graph core — an integer-indexed, read-only snapshot of the attack
+graph that the path search and scoring run on.
+
+Node names are interned to ints and parallel edges are collapsed to their
+highest-weight edge.  Adjacency is stored CSR-style in flat `array`s for
+both directions, so a 100k-edge graph costs a few MB instead of the
+dict-of-dict-of-dict overhead of a NetworkX MultiDiGraph.
+
+`OverlayGraph` layers a small copy-on-write delta (removed / added nodes
+and edges) over a shared `CompiledGraph` for what-if simulations.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+
+class CompiledGraph:
+    """CSR adjacency plus per-node / per-edge attribute columns."""
+
+    __slots__ = (
+        "names", "index", "priv", "hv",
+        "edge_ids", "edge_index", "edge_src", "edge_dst", "edge_w", "edge_rel",
+        "relations",
+        "out_ptr", "out_dst", "out_w", "out_edge",
+        "in_ptr", "in_src", "in_edge",
+        "parallel", "max_weight", "max_priv", "any_hv",
+        "__weakref__",
+    )
+
+    # Columns the search kernels read; enough for a read-only search view.
+    SEARCH_COLUMNS = (
+        ("priv", "d"), ("hv", "B"),
+        ("out_ptr", "i"), ("out_dst", "i"), ("out_w", "i"), ("out_edge", "i"),
+        ("in_ptr", "i"), ("in_src", "i"),
+    )
+    SCALARS = ("max_weight", "max_priv", "any_hv")
+
+    is_overlay = False
+
+    @classmethod
+    def build(cls, nodes: list[dict], edges: list[dict], priv_weight: dict[str, float]) -> CompiledGraph:
+        """
+        Compile node / edge dicts.  Node `i` corresponds to `nodes[i]`;
+        edge endpoints that are not declared nodes are interned after them
+        with default attributes.  Edge `j` corresponds to `edges[j]`.
+        """
+        g = cls.__new__(cls)
+        g.names = [n["name"] for n in nodes]
+        g.index = {name: i for i, name in enumerate(g.names)}
+        g.priv = array("d", (priv_weight.get(n.get("privilegeLevel", ""), 1.0) for n in nodes))
+        g.hv = bytearray(1 if n.get("highValue", False) else 0 for n in nodes)
+
+        rel_index: dict[str, int] = {}
+        g.relations = []
+        g.edge_ids = []
+        g.edge_src = array("i")
+        g.edge_dst = array("i")
+        g.edge_w = array("i")
+        g.edge_rel = array("i")
+        for e in edges:
+            g.edge_ids.append(e["id"])
+            g.edge_src.append(g._intern(e["source"], priv_weight))
+            g.edge_dst.append(g._intern(e["target"], priv_weight))
+            g.edge_w.append(e["weight"])
+            rel = e["relation"]
+            if rel not in rel_index:
+                rel_index[rel] = len(g.relations)
+                g.relations.append(rel)
+            g.edge_rel.append(rel_index[rel])
+        g.edge_index = {eid: j for j, eid in enumerate(g.edge_ids)}
+
+        g._compile(range(len(g.edge_ids)))
+        g.max_weight = max(g.edge_w, default=0)
+        g.max_priv = max(g.priv, default=1.0)
+        g.any_hv = any(g.hv)
+        return g
+
+    def _intern(self, name: str, priv_weight: dict[str, float]) -> int:
+        idx = self.index.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self.names.append(name)
+            self.index[name] = idx
+            self.priv.append(priv_weight.get("", 1.0))
+            self.hv.append(0)
+        return idx
+
+    def _compile(self, live_edges) -> None:
+        """Collapse parallel edges and lay out forward / reverse CSR arrays."""
+        src, dst, w = self.edge_src, self.edge_dst, self.edge_w
+        best: dict[tuple[int, int], int] = {}
+        multi: set[tuple[int, int]] = set()
+        for j in live_edges:
+            key = (src[j], dst[j])
+            cur = best.get(key)
+            if cur is None:
+                best[key] = j
+            else:
+                multi.add(key)
+                if w[j] > w[cur]:
+                    best[key] = j
+        # All edges of pairs that have several (kept for overlay fallback)
+        self.parallel: dict[tuple[int, int], list[int]] = {}
+        if multi:
+            for j in live_edges:
+                key = (src[j], dst[j])
+                if key in multi:
+                    self.parallel.setdefault(key, []).append(j)
+
+        n = len(self.names)
+        out_deg = [0] * (n + 1)
+        in_deg = [0] * (n + 1)
+        for u, v in best:
+            out_deg[u + 1] += 1
+            in_deg[v + 1] += 1
+        for i in range(n):
+            out_deg[i + 1] += out_deg[i]
+            in_deg[i + 1] += in_deg[i]
+        self.out_ptr = array("i", out_deg)
+        self.in_ptr = array("i", in_deg)
+
+        m = len(best)
+        self.out_dst = array("i", bytes(4 * m))
+        self.out_w = array("i", bytes(4 * m))
+        self.out_edge = array("i", bytes(4 * m))
+        self.in_src = array("i", bytes(4 * m))
+        self.in_edge = array("i", bytes(4 * m))
+        out_fill = out_deg[:-1]
+        in_fill = in_deg[:-1]
+        for (u, v), j in best.items():
+            pos = out_fill[u]
+            out_fill[u] += 1
+            self.out_dst[pos] = v
+            self.out_w[pos] = w[j]
+            self.out_edge[pos] = j
+            pos = in_fill[v]
+            in_fill[v] += 1
+            self.in_src[pos] = u
+            self.in_edge[pos] = j
+
+    # ── lookups ─────────────────────────────────────────────────────────────
+    @property
+    def num_nodes(self) -> int:
+        return len(self.priv)
+
+    def succs(self, u: int):
+        """(target, weight, edge index) for each collapsed out-edge of `u`."""
+        a, b = self.out_ptr[u], self.out_ptr[u + 1]
+        return zip(self.out_dst[a:b], self.out_w[a:b], self.out_edge[a:b])
+
+    def preds(self, v: int):
+        """Source node of each collapsed in-edge of `v`."""
+        return self.in_src[self.in_ptr[v]:self.in_ptr[v + 1]]
+
+    def blocked(self) -> bytearray:
+        """Per-node flags, set for nodes traversal must skip (none here)."""
+        return bytearray(self.num_nodes)
+
+    def edge_between(self, u: int, v: int) -> int:
+        """Collapsed (highest-weight) edge index from u to v, or -1."""
+        for dst, _, j in self.succs(u):
+            if dst == v:
+                return j
+        return -1
+
+    def pair_edges(self, u: int, v: int) -> list[int]:
+        """Indices of every edge from u to v, parallel ones included."""
+        edges = self.parallel.get((u, v))
+        if edges is not None:
+            return list(edges)
+        j = self.edge_between(u, v)
+        return [j] if j >= 0 else []
+
+    def overlay(self) -> OverlayGraph:
+        """Empty copy-on-write delta over this graph."""
+        return OverlayGraph(self)
+
+    def edge_record(self, j: int) -> dict:
+        """Path-style edge dict (`edgeId`, `source`, …) for edge index `j`."""
+        return {
+            "edgeId": self.edge_ids[j],
+            "source": self.names[self.edge_src[j]],
+            "target": self.names[self.edge_dst[j]],
+            "relation": self.relations[self.edge_rel[j]],
+            "weight": self.edge_w[j],
+        }
+
+    # ── flat buffer export (shared memory / snapshots) ──────────────────────
+    def column_layout(self, columns=SEARCH_COLUMNS) -> tuple[list[tuple[str, str, int, int]], int]:
+        """
+        Lay `columns` out back to back, 8-byte aligned.  Returns
+        (name, typecode, byte offset, item count) per column and the total
+        number of bytes.
+        """
+        layout = []
+        offset = 0
+        for name, typecode in columns:
+            col = getattr(self, name)
+            layout.append((name, typecode, offset, len(col)))
+            offset += len(col) * array(typecode).itemsize
+            offset = (offset + 7) & ~7
+        return layout, offset
+
+    def pack_into(self, buf, layout) -> None:
+        """Copy the columns described by `layout` into writable `buf`."""
+        mv = memoryview(buf)
+        for name, typecode, offset, count in layout:
+            raw = memoryview(getattr(self, name)).cast("B")
+            mv[offset:offset + len(raw)] = raw
+
+    def scalars(self) -> dict:
+        return {name: getattr(self, name) for name in self.SCALARS}
+
+    @classmethod
+    def from_buffer(cls, buf, layout, scalars: dict) -> CompiledGraph:
+        """
+        Read-only view over columns packed by `pack_into`.  Only the
+        columns in `layout` are set; names and edge tables stay empty.
+        """
+        g = cls.__new__(cls)
+        mv = memoryview(buf).toreadonly()
+        for name, typecode, offset, count in layout:
+            size = count * array(typecode).itemsize
+            setattr(g, name, mv[offset:offset + size].cast(typecode))
+        for name, value in scalars.items():
+            setattr(g, name, value)
+        return g
+
+    def nbytes(self) -> int:
+        """Approximate size of the array columns (excludes name strings)."""
+        arrays = (
+            self.priv, self.edge_src, self.edge_dst, self.edge_w, self.edge_rel,
+            self.out_ptr, self.out_dst, self.out_w, self.out_edge,
+            self.in_ptr, self.in_src, self.in_edge,
+        )
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.hv)
+
+
+class _Chain:
+    """Read-only sequence: a base sequence followed by an extension list."""
+
+    __slots__ = ("base", "extra")
+
+    def __init__(self, base, extra: list):
+        self.base = base
+        self.extra = extra
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.extra)
+
+    def __getitem__(self, i: int):
+        n = len(self.base)
+        return self.base[i] if i < n else self.extra[i - n]
+
+
+class _Patched(_Chain):
+    """`_Chain` with some entries overridden ({index: value})."""
+
+    __slots__ = ("over",)
+
+    def __init__(self, base, extra: list, over: dict):
+        super().__init__(base, extra)
+        self.over = over
+
+    def __getitem__(self, i: int):
+        v = self.over.get(i)
+        if v is not None:
+            return v
+        n = len(self.base)
+        return self.base[i] if i < n else self.extra[i - n]
+
+
+class _Masked:
+    """Name -> id lookup over a base dict with additions and removed ids."""
+
+    __slots__ = ("base", "extra", "removed")
+
+    def __init__(self, base: dict, extra: dict, removed):
+        self.base = base
+        self.extra = extra
+        self.removed = removed
+
+    def get(self, key, default=None):
+        i = self.extra.get(key)
+        if i is None:
+            i = self.base.get(key)
+        if i is None or self.removed(i):
+            return default
+        return i
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        i = self.get(key)
+        if i is None:
+            raise KeyError(key)
+        return i
+
+
+class OverlayGraph:
+    """
+    Copy-on-write view of a `CompiledGraph` with a small mutation delta.
+
+    Creating one is O(1) and the base is never modified, so any number of
+    overlays can share one baseline.  Removing a node only flags it (the
+    search treats flagged nodes as already on the path); removing or adding
+    an edge re-collapses just that node pair and overrides the adjacency of
+    its two endpoints.  Node attribute changes are sparse overrides of the
+    base columns.  Added nodes / edges get ids after the base ones.
+    """
+
+    is_overlay = True
+
+    def __init__(self, base: CompiledGraph):
+        self.base = base
+        self.removed_nodes: set[int] = set()
+        self.removed_edges: set[int] = set()
+        self.new_names: list[str] = []
+        self.new_index: dict[str, int] = {}
+        self.new_edges: list[tuple[str, int, int, int, str]] = []  # (id, src, dst, weight, relation)
+        self.new_edge_index: dict[str, int] = {}
+        self.new_pairs: dict[tuple[int, int], list[int]] = {}   # (src, dst) -> added edge indices
+        self.out_over: dict[int, list[tuple[int, int, int]]] = {}
+        self.in_over: dict[int, list[int]] = {}
+        self.new_priv: list[float] = []
+        self.new_hv: list[int] = []
+        self.priv_over: dict[int, float] = {}
+        self.hv_over: dict[int, int] = {}
+        self._max_weight = base.max_weight
+        self._max_priv = base.max_priv
+        self._any_hv = base.any_hv
+        self._chain_columns()
+
+    def _chain_columns(self) -> None:
+        base, new = self.base, self.new_edges
+        self.names = _Chain(base.names, self.new_names)
+        self.edge_ids = _Chain(base.edge_ids, [e[0] for e in new])
+        self.edge_src = _Chain(base.edge_src, [e[1] for e in new])
+        self.edge_dst = _Chain(base.edge_dst, [e[2] for e in new])
+        self.edge_w = _Chain(base.edge_w, [e[3] for e in new])
+        self._priv = _Patched(base.priv, self.new_priv, self.priv_over)
+        self._hv = _Patched(base.hv, self.new_hv, self.hv_over)
+
+    def copy(self) -> OverlayGraph:
+        """Independent overlay with the same delta (cost ~ delta size)."""
+        o = OverlayGraph.__new__(OverlayGraph)
+        o.base = self.base
+        o.removed_nodes = set(self.removed_nodes)
+        o.removed_edges = set(self.removed_edges)
+        o.new_names = list(self.new_names)
+        o.new_index = dict(self.new_index)
+        o.new_edges = list(self.new_edges)
+        o.new_edge_index = dict(self.new_edge_index)
+        o.new_pairs = {pair: list(lst) for pair, lst in self.new_pairs.items()}
+        o.out_over = {u: list(lst) for u, lst in self.out_over.items()}
+        o.in_over = {v: list(lst) for v, lst in self.in_over.items()}
+        o.new_priv = list(self.new_priv)
+        o.new_hv = list(self.new_hv)
+        o.priv_over = dict(self.priv_over)
+        o.hv_over = dict(self.hv_over)
+        o._max_weight = self._max_weight
+        o._max_priv = self._max_priv
+        o._any_hv = self._any_hv
+        o._chain_columns()
+        return o
+
+    overlay = copy
+
+    # ── CompiledGraph-compatible reads ──────────────────────────────────────
+    @property
+    def num_nodes(self) -> int:
+        return self.base.num_nodes + len(self.new_names)
+
+    @property
+    def index(self) -> _Masked:
+        return _Masked(self.base.index, self.new_index, self.removed_nodes.__contains__)
+
+    @property
+    def edge_index(self) -> _Masked:
+        return _Masked(self.base.edge_index, self.new_edge_index, self._edge_removed)
+
+    # The base columns themselves (and their fast indexing) until a node
+    # is added or changed.
+    @property
+    def priv(self):
+        return self._priv if self.new_priv or self.priv_over else self.base.priv
+
+    @property
+    def hv(self):
+        return self._hv if self.new_hv or self.hv_over else self.base.hv
+
+    # Bounds stay valid after removals, so only additions can raise them.
+    @property
+    def max_weight(self) -> int:
+        return self._max_weight
+
+    @property
+    def max_priv(self) -> float:
+        return self._max_priv
+
+    @property
+    def any_hv(self) -> bool:
+        return self._any_hv
+
+    def delta_size(self) -> int:
+        """Number of node / edge changes layered over the base."""
+        return (len(self.removed_nodes) + len(self.removed_edges)
+                + len(self.new_names) + len(self.new_edges))
+
+    def succs(self, u: int):
+        over = self.out_over.get(u)
+        if over is not None:
+            return over
+        if u >= self.base.num_nodes:
+            return ()
+        return self.base.succs(u)
+
+    def preds(self, v: int):
+        over = self.in_over.get(v)
+        if over is not None:
+            return over
+        if v >= self.base.num_nodes:
+            return ()
+        return self.base.preds(v)
+
+    def blocked(self) -> bytearray:
+        flags = bytearray(self.num_nodes)
+        for i in self.removed_nodes:
+            flags[i] = 1
+        return flags
+
+    def edge_between(self, u: int, v: int) -> int:
+        if u in self.removed_nodes or v in self.removed_nodes:
+            return -1
+        for dst, _, j in self.succs(u):
+            if dst == v:
+                return j
+        return -1
+
+    def edge_record(self, j: int) -> dict:
+        m = len(self.base.edge_ids)
+        if j < m:
+            return self.base.edge_record(j)
+        eid, src, dst, w, rel = self.new_edges[j - m]
+        return {"edgeId": eid, "source": self.names[src], "target": self.names[dst],
+                "relation": rel, "weight": w}
+
+    def _edge_removed(self, j: int) -> bool:
+        if j in self.removed_edges:
+            return True
+        return self.edge_src[j] in self.removed_nodes or self.edge_dst[j] in self.removed_nodes
+
+    # ── mutations ───────────────────────────────────────────────────────────
+    def remove_edge(self, edge_id: str) -> bool:
+        j = self.edge_index.get(edge_id)
+        if j is None:
+            return False
+        self.removed_edges.add(j)
+        self._recollapse(self.edge_src[j], self.edge_dst[j])
+        return True
+
+    def remove_node(self, name: str) -> bool:
+        i = self.index.get(name)
+        if i is None:
+            return False
+        self.removed_nodes.add(i)
+        return True
+
+    def add_edge(
+        self, edge_id: str, source: str, target: str, relation: str, weight: int,
+        default_priv: float = 1.0,
+    ) -> int:
+        u = self._intern(source, default_priv)
+        v = self._intern(target, default_priv)
+        j = len(self.base.edge_ids) + len(self.new_edges)
+        self.new_edges.append((edge_id, u, v, weight, relation))
+        for col, value in zip((self.edge_ids, self.edge_src, self.edge_dst, self.edge_w),
+                              (edge_id, u, v, weight)):
+            col.extra.append(value)
+        self.new_edge_index[edge_id] = j
+        self.new_pairs.setdefault((u, v), []).append(j)
+        if weight > self._max_weight:
+            self._max_weight = weight
+        self._recollapse(u, v)
+        return j
+
+    def set_node(self, name: str, priv: float, hv: bool) -> int:
+        """Add node `name`, or change its privilege weight / high-value flag."""
+        i = self._intern(name, priv)
+        n = self.base.num_nodes
+        if i < n:
+            self.priv_over[i] = priv
+            self.hv_over[i] = 1 if hv else 0
+        else:
+            self.new_priv[i - n] = priv
+            self.new_hv[i - n] = 1 if hv else 0
+        self._max_priv = max(self._max_priv, priv)
+        self._any_hv = self._any_hv or bool(hv)
+        return i
+
+    def _intern(self, name: str, default_priv: float) -> int:
+        i = self.index.get(name)
+        if i is None:
+            # Unknown (or removed) endpoint: a fresh node with default attributes
+            i = self.num_nodes
+            self.new_names.append(name)
+            self.new_index[name] = i
+            self.new_priv.append(default_priv)
+            self.new_hv.append(0)
+            self._max_priv = max(self._max_priv, default_priv)
+            self.out_over[i] = []
+            self.in_over[i] = []
+        return i
+
+    def pair_edges(self, u: int, v: int) -> list[int]:
+        if u in self.removed_nodes or v in self.removed_nodes:
+            return []
+        base = self.base
+        edges = base.pair_edges(u, v) if u < base.num_nodes and v < base.num_nodes else []
+        edges += self.new_pairs.get((u, v), ())
+        return [j for j in edges if j not in self.removed_edges]
+
+    def _recollapse(self, u: int, v: int) -> None:
+        """Recompute the best live edge for pair (u, v) and patch adjacency."""
+        best = -1
+        for j in self.pair_edges(u, v):
+            if best < 0 or self.edge_w[j] > self.edge_w[best]:
+                best = j
+
+        out = [t for t in self.succs(u) if t[0] != v]
+        if best >= 0:
+            out.append((v, self.edge_w[best], best))
+        self.out_over[u] = out
+        inn = [x for x in self.preds(v) if x != u]
+        if best >= 0:
+            inn.append(u)
+        self.in_over[v] = inn
@@ -8,9 +8,13 @@ via the /upload-dataset endpoint.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import copy
 from pathlib import Path
+from typing import BinaryIO, Callable
+
+from .jsonstream import ARRAY_START, iter_object
 
 # ── Default weight table (used when edges don't carry their own weight) ──
 DEFAULT_WEIGHTS = {
@@ -36,33 +40,42 @@ def _materialise(raw: dict) -> dict:
     """
     Convert a raw JSON dict into the runtime structures:
     NODES, EDGES (with computed weights), SUBNETS, WEIGHTS,
-    CRITICAL_EDGE_ID, START_OPTIONS, SCENARIO_PRESETS.
+    CRITICAL_EDGE_ID, START_OPTIONS, SCENARIO_PRESETS, and VERSION
+    (a content hash of everything the analysis depends on).
     """
     weights = raw.get("weights", DEFAULT_WEIGHTS)
+    nodes = [_node_record(n) for n in raw["nodes"]]
+    edges = [_edge_record(e, weights) for e in raw["edges"]]
+    return assemble(raw, weights, nodes, edges)
 
-    subnets = raw.get("subnets", [])
 
-    nodes = []
-    for n in raw["nodes"]:
-        nodes.append({
-            "id": n["id"],
-            "name": n["name"],
-            "type": n["type"],
-            "privilegeLevel": n.get("privilegeLevel", ""),
-            "highValue": n.get("highValue", False),
-            "subnet": n.get("subnet", ""),
-        })
-
-    edges = []
-    for e in raw["edges"]:
-        edges.append({
-            "id": e["id"],
-            "source": e["source"],
-            "target": e["target"],
-            "relation": e["relation"],
-            "weight": e.get("weight", weights.get(e["relation"], 5)),
-        })
+def _node_record(n: dict) -> dict:
+    return {
+        "id": n["id"],
+        "name": n["name"],
+        "type": n["type"],
+        "privilegeLevel": n.get("privilegeLevel", ""),
+        "highValue": n.get("highValue", False),
+        "subnet": n.get("subnet", ""),
+    }
+
+
+def _edge_record(e: dict, weights: dict | None) -> dict:
+    """Edge dict; weight stays None if it has to wait for the weight table."""
+    weight = e.get("weight")
+    if weight is None and weights is not None:
+        weight = weights.get(e["relation"], 5)
+    return {
+        "id": e["id"],
+        "source": e["source"],
+        "target": e["target"],
+        "relation": e["relation"],
+        "weight": weight,
+    }
+
 
+def assemble(raw: dict, weights: dict, nodes: list, edges: list) -> dict:
+    subnets = raw.get("subnets", [])
     critical_edge_id = raw.get("criticalEdgeId", "")
     start_options = raw.get("startOptions", [])
     scenario_presets = raw.get("scenarioPresets", {})
@@ -75,9 +88,23 @@ def _materialise(raw: dict) -> dict:
         "CRITICAL_EDGE_ID": critical_edge_id,
         "START_OPTIONS": start_options,
         "SCENARIO_PRESETS": scenario_presets,
+        "VERSION": content_hash(nodes, edges, critical_edge_id),
     }
 
 
+def content_hash(nodes: list, edges: list, critical_edge_id: str) -> str:
+    """Stable hash of the materialised graph (used as a cache key)."""
+    h = hashlib.sha256()
+    for n in nodes:
+        h.update(repr((n["id"], n["name"], n["type"], n["privilegeLevel"],
+                       n["highValue"], n["subnet"])).encode())
+    h.update(b"|")
+    for e in edges:
+        h.update(repr((e["id"], e["source"], e["target"], e["relation"], e["weight"])).encode())
+    h.update(b"|" + critical_edge_id.encode())
+    return h.hexdigest()[:16]
+
+
 def _init_empty() -> dict:
     """Return an empty dataset (app starts blank until user uploads)."""
     return {
@@ -88,6 +115,7 @@ def _init_empty() -> dict:
         "CRITICAL_EDGE_ID": "",
         "START_OPTIONS": [],
         "SCENARIO_PRESETS": {},
+        "VERSION": content_hash([], [], ""),
     }
 
 
@@ -108,6 +136,11 @@ EDGES: list            = _active["EDGES"]
 CRITICAL_EDGE_ID: str  = _active["CRITICAL_EDGE_ID"]
 START_OPTIONS: list    = _active["START_OPTIONS"]
 SCENARIO_PRESETS: dict = _active["SCENARIO_PRESETS"]
+VERSION: str           = _active["VERSION"]
+# Compiled graph mapped from a snapshot (None when built from JSON)
+CORE                   = None
+# Patches applied since the dataset was activated (see `patch`)
+REVISION: int          = 0
 
 
 def is_loaded() -> bool:
@@ -120,9 +153,17 @@ def reload_from_json(raw: dict) -> dict:
     Hot-swap the active dataset from an already-parsed JSON dict.
     Returns a summary dict with node/edge counts.
     """
-    global WEIGHTS, SUBNETS, NODES, EDGES, CRITICAL_EDGE_ID, START_OPTIONS, SCENARIO_PRESETS, _active
+    return activate(_materialise(raw))
+
+
+def activate(data: dict) -> dict:
+    """
+    Make materialised `data` the active dataset; returns its summary.
+    `data` may carry a prebuilt graph under "CORE" (see `snapshot.load`).
+    """
+    global WEIGHTS, SUBNETS, NODES, EDGES, CRITICAL_EDGE_ID, START_OPTIONS, SCENARIO_PRESETS, VERSION, CORE, REVISION
+    global _active
 
-    data = _materialise(raw)
     _active = data
 
     WEIGHTS          = data["WEIGHTS"]
@@ -132,6 +173,9 @@ def reload_from_json(raw: dict) -> dict:
     CRITICAL_EDGE_ID = data["CRITICAL_EDGE_ID"]
     START_OPTIONS    = data["START_OPTIONS"]
     SCENARIO_PRESETS = data["SCENARIO_PRESETS"]
+    VERSION          = data["VERSION"]
+    CORE             = data.get("CORE")
+    REVISION         = data.get("REVISION", 0)
 
     return {
         "nodes": len(NODES),
@@ -142,10 +186,224 @@ def reload_from_json(raw: dict) -> dict:
     }
 
 
+def parse_stream(
+    fp: BinaryIO,
+    progress: Callable[[int, int, int], None] | None = None,
+) -> tuple[dict | None, list[str]]:
+    """
+    Incrementally parse, validate and materialise a dataset file.
+
+    Records are converted one at a time while the file is read (see
+    `jsonstream`), so peak memory is about the size of the materialised
+    dataset rather than a multiple of the file size.  Returns
+    (materialised data, []) or (None, validation errors) with the same
+    messages as `validate_dataset`.  `progress(bytes read, nodes, edges)`
+    is called as parsing advances.  Malformed JSON raises
+    `json.JSONDecodeError`.
+    """
+    raw: dict = {}
+    nodes: list[dict] = []
+    edges: list[dict] = []
+    errors: list[str] = []
+    arrays = set()
+
+    read = 0
+
+    def report(nbytes: int):
+        nonlocal read
+        read = nbytes
+        if progress is not None:
+            progress(nbytes, len(nodes), len(edges))
+
+    for key, value in iter_object(fp, ("nodes", "edges"), on_read=report):
+        if value is ARRAY_START:
+            arrays.add(key)
+        elif key not in arrays:
+            raw[key] = value
+        elif key == "nodes":
+            missing = [f for f in ("id", "name", "type") if not isinstance(value, dict) or f not in value]
+            for field in missing:
+                errors.append(f"Node {len(nodes)}: missing required field '{field}'")
+            nodes.append(None if missing else _node_record(value))
+        elif key == "edges":
+            missing = [f for f in ("id", "source", "target", "relation")
+                       if not isinstance(value, dict) or f not in value]
+            for field in missing:
+                errors.append(f"Edge {len(edges)}: missing required field '{field}'")
+            edges.append(None if missing else _edge_record(value, raw.get("weights")))
+    report(read)
+
+    # Arrays are streamed, so their presence / emptiness is checked here
+    if "nodes" not in arrays and "nodes" not in raw:
+        errors.insert(0, "Missing required field: 'nodes'")
+    elif not nodes:
+        errors.insert(0, "'nodes' must be a non-empty array")
+    if "edges" not in arrays and "edges" not in raw:
+        errors.append("Missing required field: 'edges'")
+    elif not edges:
+        errors.append("'edges' must be a non-empty array")
+    if errors:
+        return None, errors
+
+    node_names = {n["name"] for n in nodes}
+    for i, e in enumerate(edges):
+        if e["source"] not in node_names:
+            errors.append(f"Edge {i} ('{e['id']}'): source '{e['source']}' not found in nodes")
+        if e["target"] not in node_names:
+            errors.append(f"Edge {i} ('{e['id']}'): target '{e['target']}' not found in nodes")
+    if errors:
+        return None, errors
+
+    # Edges that preceded the weight table get their default weight now
+    weights = raw.get("weights", DEFAULT_WEIGHTS)
+    for e in edges:
+        if e["weight"] is None:
+            e["weight"] = weights.get(e["relation"], 5)
+    return assemble(raw, weights, nodes, edges), []
+
+
+# ── incremental patches ─────────────────────────────────────────────────
+_NODE_FIELDS = ("type", "privilegeLevel", "highValue", "subnet")
+
+
+def patch(ops: list[dict]) -> tuple[dict | None, list[dict], list[str]]:
+    """
+    Apply add / update / remove operations to the active dataset without
+    re-materialising it.  Nodes are addressed by `name`, edges by `id`;
+    removing a node also removes its edges.  Ops apply in order and all
+    or nothing.
+
+    Returns (data, changes, []) with `data` ready for `activate` (new node
+    / edge lists, REVISION + 1, a VERSION chained from the old one and the
+    ops) and `changes` the normalised effect for `GraphEngine.patched`:
+    `removeEdge` / `removeNode` / `addEdge` / `setNode` records, an edge
+    update being a remove plus an add.  Returns (None, [], errors) if any
+    op is invalid.
+    """
+    nodes: list[dict | None] = list(NODES)
+    edges: list[dict | None] = list(EDGES)
+    node_pos = {n["name"]: i for i, n in enumerate(nodes)}
+    edge_pos = {e["id"]: j for j, e in enumerate(edges)}
+    incident: dict[str, set[int]] | None = None   # built on the first node removal
+    changes: list[dict] = []
+    errors: list[str] = []
+
+    def add_edge(e: dict) -> None:
+        edge_pos[e["id"]] = len(edges)
+        if incident is not None:
+            incident.setdefault(e["source"], set()).add(len(edges))
+            incident.setdefault(e["target"], set()).add(len(edges))
+        edges.append(e)
+        changes.append({"op": "addEdge", **e})
+
+    def drop_edge(j: int) -> dict:
+        e = edges[j]
+        edges[j] = None
+        del edge_pos[e["id"]]
+        if incident is not None:
+            incident[e["source"]].discard(j)
+            incident[e["target"]].discard(j)
+        return e
+
+    for i, op in enumerate(ops):
+        kind = op.get("op")
+        name, eid = op.get("name"), op.get("id")
+        if kind in ("addNode", "updateNode", "removeNode") and not name:
+            errors.append(f"Op {i} ({kind}): missing required field 'name'")
+        elif kind in ("addEdge", "updateEdge", "removeEdge") and not eid:
+            errors.append(f"Op {i} ({kind}): missing required field 'id'")
+        elif kind == "addNode":
+            if name in node_pos:
+                errors.append(f"Op {i} (addNode): node '{name}' already exists")
+            elif not op.get("type"):
+                errors.append(f"Op {i} (addNode): missing required field 'type'")
+            else:
+                n = _node_record({**op, "id": eid or name})
+                node_pos[name] = len(nodes)
+                nodes.append(n)
+                changes.append({"op": "setNode", **n})
+        elif kind == "updateNode":
+            if name not in node_pos:
+                errors.append(f"Op {i} (updateNode): node '{name}' not found")
+            else:
+                pos = node_pos[name]
+                n = {**nodes[pos], **{f: op[f] for f in _NODE_FIELDS if op.get(f) is not None}}
+                if eid:
+                    n["id"] = eid
+                nodes[pos] = n
+                changes.append({"op": "setNode", **n})
+        elif kind == "removeNode":
+            if name not in node_pos:
+                errors.append(f"Op {i} (removeNode): node '{name}' not found")
+            else:
+                if incident is None:
+                    incident = {}
+                    for j, e in enumerate(edges):
+                        if e is not None:
+                            incident.setdefault(e["source"], set()).add(j)
+                            incident.setdefault(e["target"], set()).add(j)
+                for j in list(incident.get(name, ())):
+                    drop_edge(j)
+                incident.pop(name, None)
+                nodes[node_pos.pop(name)] = None
+                changes.append({"op": "removeNode", "name": name})
+        elif kind in ("addEdge", "updateEdge"):
+            if kind == "addEdge" and eid in edge_pos:
+                errors.append(f"Op {i} (addEdge): edge '{eid}' already exists")
+                continue
+            if kind == "updateEdge" and eid not in edge_pos:
+                errors.append(f"Op {i} (updateEdge): edge '{eid}' not found")
+                continue
+            old = edges[edge_pos[eid]] if kind == "updateEdge" else {}
+            e = {f: op.get(f) if op.get(f) is not None else old.get(f)
+                 for f in ("id", "source", "target", "relation", "weight")}
+            if kind == "updateEdge" and op.get("relation") and op.get("weight") is None:
+                e["weight"] = None   # re-derive from the weight table
+            problems = [f"Op {i} ({kind}): missing required field '{f}'"
+                        for f in ("source", "target", "relation") if not e[f]]
+            problems += [f"Op {i} ({kind}): {end} '{e[end]}' not found in nodes"
+                         for end in ("source", "target") if e[end] and e[end] not in node_pos]
+            if problems:
+                errors.extend(problems)
+                continue
+            if kind == "updateEdge":
+                drop_edge(edge_pos[eid])
+                changes.append({"op": "removeEdge", "id": eid})
+            add_edge(_edge_record(e, WEIGHTS))
+        elif kind == "removeEdge":
+            if eid not in edge_pos:
+                errors.append(f"Op {i} (removeEdge): edge '{eid}' not found")
+            else:
+                drop_edge(edge_pos[eid])
+                changes.append({"op": "removeEdge", "id": eid})
+        else:
+            errors.append(f"Op {i}: unknown op '{kind}'")
+    if errors:
+        return None, [], errors
+
+    live = {n["name"] for n in nodes if n is not None}
+    data = {
+        **_active,
+        "NODES": [n for n in nodes if n is not None],
+        "EDGES": [e for e in edges if e is not None],
+        "START_OPTIONS": [s for s in START_OPTIONS if s in live],
+        "CORE": None,
+        "REVISION": REVISION + 1,
+        "VERSION": hashlib.sha256(
+            (VERSION + json.dumps(ops, sort_keys=True)).encode()
+        ).hexdigest()[:16],
+    }
+    return data, changes, []
+
+
+def load_default() -> dict:
+    """Materialised bundled default dataset (not activated)."""
+    return _init_default()
+
+
 def reset_to_default() -> dict:
     """Reset back to the bundled default dataset."""
-    raw = _load_json(_DEFAULT_JSON)
-    return reload_from_json(raw)
+    return activate(load_default())
 
 
 def validate_dataset(raw: dict) -> list[str]:
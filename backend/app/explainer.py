@@ -1,8 +1,16 @@
 """
 Explanation Engine — generates human-readable step-by-step attack chain
 reasoning from a discovered path.
+
+`explain_steps` builds the structured form (one entry per edge), and
+`render_text` / `explain_path` turn it into the text shown by the UI.
+The two sentences of a step depend only on (relation, source, target),
+so they are rendered once and memoized across paths, analyses and
+dataset versions.
 """
 
+from functools import lru_cache
+
 RELATION_DESC = {
     "WriteDACL": (
         "has WriteDACL on {target}\n"
@@ -44,49 +52,83 @@ PRIV_GAIN = {
 }
 
 
-def explain_path(path_info: dict) -> str:
-    """Return multi-line explanation text for one attack path."""
-    edges = path_info["edges"]
+# Rendered (description, privilege gained) pairs kept
+STEP_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=STEP_CACHE_SIZE)
+def step_text(relation: str, source: str, target: str) -> tuple[str, str]:
+    """(description, privilege gained) sentences for one edge."""
+    desc = RELATION_DESC.get(relation, f"connects to {target} via {relation}")
+    priv = PRIV_GAIN.get(relation, f"Access to {target}")
+    return desc.format(source=source, target=target), priv.format(source=source, target=target)
+
+
+def explain_steps(path_info: dict) -> dict:
+    """Return the structured explanation of one attack path."""
+    steps = []
+    cumulative = 0
+    for i, edge in enumerate(path_info["edges"]):
+        cumulative += edge["weight"]
+        desc, priv = step_text(edge["relation"], edge["source"], edge["target"])
+        steps.append({
+            "step": i + 1,
+            "edgeId": edge["edgeId"],
+            "source": edge["source"],
+            "target": edge["target"],
+            "relation": edge["relation"],
+            "weight": edge["weight"],
+            "cumulativeWeight": cumulative,
+            "description": desc,
+            "privilegeGained": priv,
+        })
+    return {
+        "pathId": path_info["pathId"],
+        "risk": path_info["risk"],
+        "normalizedScore": path_info.get("normalizedScore"),
+        "impactEstimation": path_info.get("impactEstimation", "Unknown"),
+        "hops": path_info["hops"],
+        "sumWeights": path_info["sumWeights"],
+        "throughCritical": path_info["throughCritical"],
+        "steps": steps,
+    }
+
+
+def render_text(info: dict) -> str:
+    """Multi-line text of a structured explanation (see `explain_steps`)."""
+    steps = info["steps"]
+    normalized = info["normalizedScore"]
     lines: list[str] = [
-        f"═══ Attack Chain: {path_info['pathId']} ═══",
-        f"Risk Score: {path_info['risk']}  |  Normalized: {path_info.get('normalizedScore', 'N/A')}/100",
-        f"Impact: {path_info.get('impactEstimation', 'Unknown')}  |  Hops: {path_info['hops']}",
-        f"Through Critical Edge: {'Yes ★' if path_info['throughCritical'] else 'No'}",
+        f"═══ Attack Chain: {info['pathId']} ═══",
+        f"Risk Score: {info['risk']}  |  Normalized: {'N/A' if normalized is None else normalized}/100",
+        f"Impact: {info['impactEstimation']}  |  Hops: {info['hops']}",
+        f"Through Critical Edge: {'Yes ★' if info['throughCritical'] else 'No'}",
         "",
     ]
 
-    for i, edge in enumerate(edges):
-        step = i + 1
-        rel = edge["relation"]
-        src = edge["source"]
-        tgt = edge["target"]
-        desc = RELATION_DESC.get(rel, f"connects to {tgt} via {rel}")
-        desc = desc.format(source=src, target=tgt)
-        priv = PRIV_GAIN.get(rel, f"Access to {tgt}").format(source=src, target=tgt)
-
-        lines.append(f"STEP {step}: {src}")
-        lines.append(f"  │ {desc}")
-        lines.append(f"  │ Privilege gained: {priv}")
-
-        if step < len(edges):
-            lines.append("  ▼")
-        else:
-            lines.append("  ▼")
-            lines.append(f"RESULT: {tgt} — Target Reached")
+    for st in steps:
+        lines.append(f"STEP {st['step']}: {st['source']}")
+        lines.append(f"  │ {st['description']}")
+        lines.append(f"  │ Privilege gained: {st['privilegeGained']}")
+        lines.append("  ▼")
+    if steps:
+        lines.append(f"RESULT: {steps[-1]['target']} — Target Reached")
 
     lines.append("")
     lines.append("── Risk Breakdown ──")
-    cumulative = 0
-    for i, edge in enumerate(edges):
-        cumulative += edge["weight"]
+    for st in steps:
         lines.append(
-            f"  Step {i + 1}: [{edge['edgeId']}] {edge['relation']}"
-            f"  (weight={edge['weight']}, cumulative={cumulative})"
+            f"  Step {st['step']}: [{st['edgeId']}] {st['relation']}"
+            f"  (weight={st['weight']}, cumulative={st['cumulativeWeight']})"
         )
 
-    from math import sqrt
     lines.append(
-        f"  Total: {path_info['sumWeights']} / √{path_info['hops']}"
-        f" = {path_info['risk']}"
+        f"  Total: {info['sumWeights']} / √{info['hops']}"
+        f" = {info['risk']}"
     )
     return "\n".join(lines)
+
+
+def explain_path(path_info: dict) -> str:
+    """Return multi-line explanation text for one attack path."""
+    return render_text(explain_steps(path_info))
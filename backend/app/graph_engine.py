@@ -1,6 +1,6 @@
 """
-Core graph engine — builds a NetworkX MultiDiGraph, finds bounded attack
-paths, computes risk scores & identifies critical edges.
+Core graph engine — compiles the dataset into an integer-indexed CSR graph,
+finds bounded attack paths, computes risk scores & identifies critical edges.
 
 Enhanced with:
 - Privilege-aware risk scoring
@@ -11,12 +11,15 @@ Enhanced with:
 
 from __future__ import annotations
 
-import copy
-from math import sqrt, log2
+import heapq
+import time
+from math import sqrt
 
 import networkx as nx
 
 from . import dataset as ds
+from .compiled import CompiledGraph, OverlayGraph
+from .reach import ReachIndex, nearest_distances
 
 # ── Privilege level weights (higher = more valuable to attacker) ────────────
 PRIV_WEIGHT = {
@@ -33,108 +36,648 @@ PRIV_WEIGHT = {
 # High-value target multiplier
 HV_MULTIPLIER = 2.0
 
+# Critical edge bonus
+CRITICAL_EDGE_BONUS = 1.5
+
 # Maximum results cap
 MAX_RESULTS_DEFAULT = 20
 
+# Recompile a patched graph once its overlay holds this share of the edges
+PATCH_COMPACT_FRACTION = 0.05
+
+# Edge directions `get_neighborhood` can follow
+NEIGHBOR_DIRECTIONS = ("in", "out", "both")
+
+# Expansions between cancellation / budget checks
+CHECK_INTERVAL = 256
+
+
+class SearchAborted(Exception):
+    """A search was cancelled or ran out of its budget."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason   # "cancelled" | "timeLimit" | "pathBudget"
+
+
+class SearchControl:
+    """
+    Progress counters, cancellation flag and budgets shared by the searches
+    of one analysis.  Searches report to it every `CHECK_INTERVAL` node
+    expansions and raise `SearchAborted` once it says stop.
+
+    Anytime budgets (`set_budget`) are softer.  Each search gets an equal
+    share of what is left of them (`start_slice`), so budget a search does
+    not use carries over to the next; once its share runs out `tick`
+    returns True and the search ends with the best paths it has found.
+    `stopped` then names the budget and the analysis is partial.
+    """
+
+    def __init__(self, time_limit: float | None = None, max_paths: int | None = None):
+        self.deadline = time.monotonic() + time_limit if time_limit else None
+        self.max_paths = max_paths
+        self.nodes_expanded = 0
+        self.paths_found = 0
+        self.branches_pruned = 0
+        self.cancelled = False
+        self.budget_deadline: float | None = None
+        self.max_expansions: int | None = None
+        self._slice_deadline: float | None = None
+        self._slice_expansions: int | None = None
+        self.stopped: str | None = None   # "timeBudget" | "expansionBudget"
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    @property
+    def budgeted(self) -> bool:
+        return self.budget_deadline is not None or self.max_expansions is not None
+
+    def set_budget(self, time_budget: float | None = None, max_expansions: int | None = None) -> None:
+        """Start anytime budgets: seconds from now and / or node expansions."""
+        self.budget_deadline = time.monotonic() + time_budget if time_budget else None
+        self.max_expansions = max_expansions
+        self._slice_deadline = self.budget_deadline
+        self._slice_expansions = max_expansions
+
+    def start_slice(self, searches_left: int) -> None:
+        """Give the next search an equal share of the anytime budgets left."""
+        if self.budget_deadline is not None:
+            now = time.monotonic()
+            self._slice_deadline = now + max(0.0, self.budget_deadline - now) / searches_left
+        if self.max_expansions is not None:
+            left = max(0, self.max_expansions - self.nodes_expanded)
+            self._slice_expansions = self.nodes_expanded + left // searches_left
+
+    def tick(self, expanded: int, paths: int, pruned: int = 0, done: bool = False) -> bool:
+        """
+        Add progress; True if the reporting search has used up its share of
+        an anytime budget and should stop (`done`: it has finished anyway).
+        """
+        self.nodes_expanded += expanded
+        self.paths_found += paths
+        self.branches_pruned += pruned
+        if self.cancelled:
+            raise SearchAborted("cancelled")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SearchAborted("timeLimit")
+        if self.max_paths is not None and self.paths_found > self.max_paths:
+            raise SearchAborted("pathBudget")
+        if done:
+            return False
+        if self._slice_deadline is not None and time.monotonic() > self._slice_deadline:
+            self.stopped = "timeBudget"
+        elif self._slice_expansions is not None and self.nodes_expanded >= self._slice_expansions:
+            self.stopped = "expansionBudget"
+        else:
+            return False
+        return True
+
+    def progress(self) -> dict:
+        return {"nodesExpanded": self.nodes_expanded, "pathsFound": self.paths_found}
+
+    def stats(self) -> dict:
+        """Search statistics reported with an analysis."""
+        return {"nodesExpanded": self.nodes_expanded, "branchesPruned": self.branches_pruned,
+                "pathsScored": self.paths_found}
+
+
+# ── search kernels (module-level so pool workers can run them too) ──────────
+def distances_to(core: CompiledGraph | OverlayGraph, t: int, max_depth: int) -> list[int]:
+    """
+    Reverse BFS from node `t`: hop distance of every node that reaches
+    it within `max_depth`; all other nodes get `max_depth + 1`.
+    """
+    preds = core.preds
+    blocked = core.blocked()
+    dist = [max_depth + 1] * core.num_nodes
+    dist[t] = 0
+    frontier = [t]
+    for d in range(1, max_depth + 1):
+        nxt = []
+        for v in frontier:
+            for u in preds(v):
+                if dist[u] > d and not blocked[u]:
+                    dist[u] = d
+                    nxt.append(u)
+        if not nxt:
+            break
+        frontier = nxt
+    return dist
+
+
+def distances_from(core: CompiledGraph | OverlayGraph, sources: list[int], max_depth: int) -> list[int]:
+    """Forward counterpart of `distances_to`, from a set of source nodes."""
+    succs = core.succs
+    blocked = core.blocked()
+    dist = [max_depth + 1] * core.num_nodes
+    frontier = [s for s in sources if not blocked[s]]
+    for s in frontier:
+        dist[s] = 0
+    for d in range(1, max_depth + 1):
+        nxt = []
+        for u in frontier:
+            for v, _, _ in succs(u):
+                if dist[v] > d and not blocked[v]:
+                    dist[v] = d
+                    nxt.append(v)
+        if not nxt:
+            break
+        frontier = nxt
+    return dist
+
+
+def via_distances(core: CompiledGraph | OverlayGraph, via: set[int], dist: list[int], max_depth: int) -> list[int]:
+    """
+    Minimum hop count from every node to the target of `dist` along a walk
+    that crosses at least one edge in `via`; `max_depth + 1` if none fits.
+    """
+    best = [max_depth + 1] * core.num_nodes
+    for j in via:
+        tail = 1 + dist[core.edge_dst[j]]
+        if tail > max_depth:
+            continue
+        for x, d in enumerate(distances_to(core, core.edge_src[j], max_depth - tail)):
+            if d + tail < best[x]:
+                best[x] = d + tail
+    return best
+
+
+def path_raw_risk(core: CompiledGraph | OverlayGraph, path: list[int], hop_edges: list[int], crit_edge: int = -1) -> float:
+    """Raw risk of a known path, computed exactly as `search_top_k` does."""
+    hops = len(path) - 1
+    w = 0
+    pv = core.priv[path[0]]
+    for i in path[1:]:
+        pv += core.priv[i]
+    for j in hop_edges:
+        w += core.edge_w[j]
+    raw = (w + pv) * (1.0 / sqrt(hops) if hops > 0 else 1.0)
+    if any(core.hv[i] for i in path):
+        raw *= HV_MULTIPLIER
+    if crit_edge >= 0 and crit_edge in hop_edges:
+        raw *= CRITICAL_EDGE_BONUS
+    return raw
+
+
+def search_top_k(
+    core: CompiledGraph | OverlayGraph, s: int, t: int, min_depth: int, max_depth: int,
+    k: int, dist: list[int], crit_edge: int = -1, first_hop: int = -1,
+    via: set[int] | None = None, via_dist: list[int] | None = None,
+    control: SearchControl | None = None,
+) -> list[tuple[float, list[int], list[int]]]:
+    """
+    Depth-first branch-and-bound search for the `k` highest-risk paths
+    from node `s` to node `t`.  Returns (raw risk, node ids, edge ids)
+    tuples, highest risk first; equal risks are ordered by node-id
+    sequence so the result is the same however the search is split.
+    `first_hop` (a node id) restricts the search to paths whose second
+    node is `first_hop`.  `via` (edge indices) restricts
+    it to paths using at least one of those edges; `via_dist` must then
+    hold each node's minimum hop count to `t` through one of them (see
+    `via_distances`).  `control` receives progress and can abort the
+    search, or end it early with the best paths found so far once an
+    anytime budget runs out (see `SearchControl`).
+
+    Every partial path carries an optimistic bound on the risk of any
+    completion.  Each remaining hop adds at most the graph's maximum
+    edge weight and each remaining intermediate node at most its maximum
+    privilege weight; the target contributes its own privilege.  For a
+    fixed prefix the bound has the form a/sqrt(H) + c*sqrt(H), which is
+    convex in sqrt(H), so its maximum over the feasible hop range lies
+    at one of the two endpoints.  Children are explored best-bound
+    first and a branch is cut as soon as its bound cannot beat the
+    current k-th best complete path.
+    """
+    priv, hv = core.priv, core.hv
+    succs = core.succs
+
+    if s == t:
+        if min_depth > 0 or first_hop >= 0 or via is not None:
+            return []
+        raw = priv[s] * (HV_MULTIPLIER if hv[s] else 1.0)
+        return [(raw, [s], [])]
+
+    max_w = core.max_weight
+    max_p = core.max_priv
+    priv_t = priv[t]
+    # Multipliers any completion could still pick up
+    mult = (HV_MULTIPLIER if core.any_hv else 1.0) * \
+        (CRITICAL_EDGE_BONUS if crit_edge >= 0 else 1.0)
+    inv_sqrt = [1.0] + [1.0 / sqrt(h) for h in range(1, max_depth + 1)]
+
+    def children(u: int, hops: int, w: int, pv: float, has_hv: bool, has_crit: bool, used: bool):
+        nh = hops + 1
+        need_via = not used
+        out = []
+        only = first_hop if hops == 0 else -1
+        for v, ew, j in succs(u):
+            if on_path[v] or (only >= 0 and v != only):
+                continue
+            d = via_dist[v] if need_via and j not in via else dist[v]
+            lo = nh + d
+            if lo > max_depth:
+                continue
+            nw = w + ew
+            npv = pv + priv[v]
+            if v == t:
+                if nh < min_depth or d:
+                    continue
+                bound = (nw + npv) * inv_sqrt[nh] \
+                    * (HV_MULTIPLIER if has_hv or hv[v] else 1.0) \
+                    * (CRITICAL_EDGE_BONUS if has_crit or j == crit_edge else 1.0)
+            else:
+                if lo < min_depth:
+                    lo = min_depth
+                r = lo - nh
+                bound = (nw + npv + r * max_w + (r - 1) * max_p + priv_t) * inv_sqrt[lo]
+                r = max_depth - nh
+                hi = (nw + npv + r * max_w + (r - 1) * max_p + priv_t) * inv_sqrt[max_depth]
+                if hi > bound:
+                    bound = hi
+                bound *= mult
+            out.append((bound, v, ew, j))
+        out.sort(reverse=True)
+        return iter(out)
+
+    # Min-heap of the best k as (raw, negated node ids, nodes, edges): the
+    # root is the lowest risk and, among ties, the largest node sequence.
+    # Complete paths all end at `t`, so none is a prefix of another and
+    # negating the ids exactly reverses their lexicographic order.
+    heap: list[tuple[float, tuple, list[int], list[int]]] = []
+    on_path = core.blocked()   # removed overlay nodes count as visited
+    on_path[s] = 1
+    path = [s]
+    epath: list[int] = []
+    # Per-depth running state: (weight sum, priv sum, hv seen, critical seen,
+    # via edge used)
+    state = [(0, priv[s], bool(hv[s]), False, via is None)]
+    stack = [children(s, 0, *state[0])]
+    expanded = leaves = pruned = 0
+
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            state.pop()
+            on_path[path.pop()] = 0
+            if epath:
+                epath.pop()
+            continue
+        bound, v, ew, j = child
+        if len(heap) >= k and bound < heap[0][0]:
+            # Children are sorted by bound, so the rest are no better.
+            stack[-1] = iter(())
+            pruned += 1
+            continue
+        if v == t:
+            # Leaf bounds are exact risks.
+            leaves += 1
+            full = path + [v]
+            entry = (bound, tuple(-i for i in full), full, epath + [j])
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            continue
+        w, pv, has_hv, has_crit, used = state[-1]
+        nstate = (
+            w + ew, pv + priv[v], has_hv or bool(hv[v]), has_crit or j == crit_edge,
+            used or j in via,
+        )
+        path.append(v)
+        epath.append(j)
+        on_path[v] = 1
+        state.append(nstate)
+        stack.append(children(v, len(path) - 1, *nstate))
+        expanded += 1
+        if control is not None and expanded >= CHECK_INTERVAL:
+            stop = control.tick(expanded, leaves, pruned)
+            expanded = leaves = pruned = 0
+            if stop:
+                break
+
+    if control is not None:
+        control.tick(expanded, leaves, pruned, done=True)
+    heap.sort(reverse=True)
+    return [(raw, p, e) for raw, _, p, e in heap]
+
+
+def search_multi_top_k(
+    core: CompiledGraph | OverlayGraph, s: int, targets: list[int], min_depth: int, max_depth: int,
+    k: int, dist: list[int], crit_edge: int = -1, control: SearchControl | None = None,
+) -> dict[int, list[tuple[float, list[int], list[int]]]]:
+    """
+    `search_top_k` for several targets in one traversal: {target: top `k`
+    paths from `s`}, each list exactly what a single-target search would
+    return.  `dist` must hold every node's hop count to the nearest target
+    (see `reach.nearest_distances`).
+
+    A path may run through one target on its way to another, so a target
+    is both a leaf (scored exactly against its own top-k) and, if hops
+    remain, an inner node.  Inner bounds use the largest target privilege
+    and are cut against the lowest k-th best risk over all targets (or
+    not at all while some target has fewer than `k` paths).
+    """
+    priv, hv = core.priv, core.hv
+    succs = core.succs
+    found: dict[int, list] = {}
+    if s in targets and min_depth == 0:
+        found[s] = [(priv[s] * (HV_MULTIPLIER if hv[s] else 1.0), [s], [])]
+    # Targets out of reach would never fill their heap and so never let
+    # the search cut anything; `s` itself is never reached again.
+    reach = distances_from(core, [s], max_depth)
+    heaps: dict[int, list] = {t: [] for t in targets if t != s and reach[t] <= max_depth}
+    if not heaps:
+        return found
+
+    max_w = core.max_weight
+    max_p = core.max_priv
+    priv_t = max(priv[t] for t in heaps)
+    mult = (HV_MULTIPLIER if core.any_hv else 1.0) * \
+        (CRITICAL_EDGE_BONUS if crit_edge >= 0 else 1.0)
+    inv_sqrt = [1.0] + [1.0 / sqrt(h) for h in range(1, max_depth + 1)]
+    # Lowest k-th best risk over all targets (-1 while any heap is short)
+    floor = -1.0
+
+    def inner_bound(nw: int, npv: float, nh: int, lo: int) -> float:
+        if lo < min_depth:
+            lo = min_depth
+        r = lo - nh
+        bound = (nw + npv + r * max_w + (r - 1) * max_p + priv_t) * inv_sqrt[lo]
+        r = max_depth - nh
+        hi = (nw + npv + r * max_w + (r - 1) * max_p + priv_t) * inv_sqrt[max_depth]
+        return (hi if hi > bound else bound) * mult
+
+    def children(u: int, hops: int, w: int, pv: float, has_hv: bool, has_crit: bool):
+        nh = hops + 1
+        out = []
+        for v, ew, j in succs(u):
+            if on_path[v]:
+                continue
+            lo = nh + dist[v]
+            if lo > max_depth:
+                continue
+            nw = w + ew
+            npv = pv + priv[v]
+            if v in heaps:
+                if nh >= min_depth:
+                    exact = (nw + npv) * inv_sqrt[nh] \
+                        * (HV_MULTIPLIER if has_hv or hv[v] else 1.0) \
+                        * (CRITICAL_EDGE_BONUS if has_crit or j == crit_edge else 1.0)
+                    out.append((exact, True, v, ew, j))
+                lo = nh + 1
+                if lo > max_depth:
+                    continue
+            out.append((inner_bound(nw, npv, nh, lo), False, v, ew, j))
+        out.sort(reverse=True)
+        return iter(out)
+
+    on_path = core.blocked()
+    on_path[s] = 1
+    path = [s]
+    epath: list[int] = []
+    state = [(0, priv[s], bool(hv[s]), False)]
+    stack = [children(s, 0, *state[0])]
+    expanded = leaves = pruned = 0
+
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            state.pop()
+            on_path[path.pop()] = 0
+            if epath:
+                epath.pop()
+            continue
+        bound, leaf, v, ew, j = child
+        if bound < floor:
+            stack[-1] = iter(())
+            pruned += 1
+            continue
+        if leaf:
+            heap = heaps[v]
+            leaves += 1
+            full = path + [v]
+            entry = (bound, tuple(-i for i in full), full, epath + [j])
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                continue
+            if len(heap) >= k and heap[0][0] > floor:
+                floor = min((h[0][0] if len(h) >= k else -1.0) for h in heaps.values())
+            continue
+        w, pv, has_hv, has_crit = state[-1]
+        nstate = (w + ew, pv + priv[v], has_hv or bool(hv[v]), has_crit or j == crit_edge)
+        path.append(v)
+        epath.append(j)
+        on_path[v] = 1
+        state.append(nstate)
+        stack.append(children(v, len(path) - 1, *nstate))
+        expanded += 1
+        if control is not None and expanded >= CHECK_INTERVAL:
+            stop = control.tick(expanded, leaves, pruned)
+            expanded = leaves = pruned = 0
+            if stop:
+                break
+
+    if control is not None:
+        control.tick(expanded, leaves, pruned, done=True)
+    for t, heap in heaps.items():
+        if heap:
+            heap.sort(reverse=True)
+            found[t] = [(raw, p, e) for raw, _, p, e in heap]
+    return found
+
 
 class GraphEngine:
-    """Wraps a NetworkX MultiDiGraph with attack-path analysis helpers."""
+    """
+    Attack-path analysis over a `CompiledGraph`.
 
-    def __init__(self, nodes: list | None = None, edges: list | None = None):
-        self.nodes = nodes if nodes is not None else copy.deepcopy(ds.NODES)
-        self.edges = edges if edges is not None else copy.deepcopy(ds.EDGES)
-        self.G = nx.MultiDiGraph()
-        self._node_map: dict[str, dict] = {}
-        self._build()
+    Node and edge dicts are shared (not copied) with the dataset module;
+    the engine never mutates them in place.  `clone()` is O(1): mutations
+    on a clone go into a copy-on-write `OverlayGraph` over the shared core,
+    and node / edge lists are only materialised when something asks for
+    them.  A NetworkX view is only built on demand.
+    """
+
+    def __init__(
+        self, nodes: list | None = None, edges: list | None = None,
+        core: CompiledGraph | None = None,
+    ):
+        """`core`, if given, must be the compiled form of `nodes` / `edges`."""
+        self._base_nodes = nodes if nodes is not None else ds.NODES
+        self._base_edges = edges if edges is not None else ds.EDGES
+        self._nodes: list | None = self._base_nodes
+        self._edges: list | None = self._base_edges
+        self._core: CompiledGraph | OverlayGraph | None = core
+        self._G: nx.MultiDiGraph | None = None
+        # (node list, {name: node dict}) for neighbourhood lookups
+        self._node_map: tuple[list, dict] | None = None
+        # Overlay edge slots below this are already in the base edge list
+        self._patch_slots = 0
+        self._reach = ReachIndex()
+        if core is None:
+            self._build()
 
     # ── graph construction ──────────────────────────────────────────────────
     def _build(self):
-        for n in self.nodes:
-            self.G.add_node(n["name"], **n)
-            self._node_map[n["name"]] = n
-        for e in self.edges:
-            self.G.add_edge(
-                e["source"], e["target"], key=e["id"],
-                id=e["id"], relation=e["relation"], weight=e["weight"],
-            )
+        self._core = CompiledGraph.build(self._base_nodes, self._base_edges, PRIV_WEIGHT)
+        self._G = None
+
+    @property
+    def core(self) -> CompiledGraph | OverlayGraph:
+        if self._core is None:
+            self._build()
+        return self._core
+
+    @property
+    def nodes(self) -> list[dict]:
+        """Node dicts of the current graph (removed nodes filtered out)."""
+        if self._nodes is None:
+            index = self.core.index
+            self._nodes = [n for n in self._base_nodes if n["name"] in index]
+        return self._nodes
+
+    @property
+    def edges(self) -> list[dict]:
+        """Edge dicts of the current graph, simulated additions last."""
+        if self._edges is None:
+            core = self.core
+            index = core.edge_index
+            m = len(core.base.edge_ids)
+            gone = core._edge_removed
+            edges = [e for e in self._base_edges if e["id"] in index]
+            for k, (eid, src, dst, w, rel) in enumerate(core.new_edges):
+                if m + k >= self._patch_slots and not gone(m + k):
+                    edges.append({
+                        "id": eid, "source": core.names[src], "target": core.names[dst],
+                        "relation": rel, "weight": w,
+                    })
+            self._edges = edges
+        return self._edges
+
+    @property
+    def G(self) -> nx.MultiDiGraph:
+        """NetworkX view of the current graph (built on first access)."""
+        if self._G is None:
+            G = nx.MultiDiGraph()
+            for n in self.nodes:
+                G.add_node(n["name"], **n)
+            for e in self.edges:
+                G.add_edge(
+                    e["source"], e["target"], key=e["id"],
+                    id=e["id"], relation=e["relation"], weight=e["weight"],
+                )
+            self._G = G
+        return self._G
+
+    def _overlay(self) -> OverlayGraph:
+        """The mutable overlay of this engine, created on first mutation."""
+        if not self.core.is_overlay:
+            self._core = self._core.overlay()
+        self._nodes = self._edges = None
+        self._G = None
+        return self._core
 
     def clone(self) -> GraphEngine:
         eng = GraphEngine.__new__(GraphEngine)
-        eng.nodes = copy.deepcopy(self.nodes)
-        eng.edges = copy.deepcopy(self.edges)
-        eng.G = self.G.copy()
-        eng._node_map = {n["name"]: n for n in eng.nodes}
+        eng._base_nodes = self._base_nodes
+        eng._base_edges = self._base_edges
+        core = self.core
+        # The compiled core is immutable and shared; an overlay is copied
+        # so the clone's mutations stay private.
+        eng._core = core.copy() if core.is_overlay else core
+        eng._nodes = self._nodes
+        eng._edges = self._edges
+        eng._patch_slots = self._patch_slots
+        eng._reach = self._reach.copy()
+        eng._node_map = self._node_map
+        eng._G = None
+        return eng
+
+    def patched(self, nodes: list[dict], edges: list[dict], changes: list[dict]) -> GraphEngine:
+        """
+        Engine for the patched dataset lists `nodes` / `edges`, which differ
+        from this engine's by `changes` (see `dataset.patch`).  The changes
+        go into a copy of the overlay, so node / edge indices of this engine
+        stay valid in the new one; once the overlay grows past
+        `PATCH_COMPACT_FRACTION` of the edges the graph is recompiled
+        instead (the result then has a plain `CompiledGraph` core).
+        """
+        eng = self.clone()
+        for c in changes:
+            op = c["op"]
+            if op == "removeEdge":
+                eng.remove_edge(c["id"])
+            elif op == "removeNode":
+                eng.remove_node_full(c["name"])
+            elif op == "addEdge":
+                eng._add_edge(c["id"], c["source"], c["target"], c["relation"], c["weight"])
+            elif op == "setNode":
+                eng._overlay().set_node(c["name"], PRIV_WEIGHT.get(c["privilegeLevel"], 1.0), c["highValue"])
+        core = eng._overlay()
+        if core.delta_size() > PATCH_COMPACT_FRACTION * len(core.base.edge_ids):
+            return GraphEngine(nodes, edges)
+        eng._base_nodes, eng._base_edges = nodes, edges
+        eng._nodes, eng._edges = nodes, edges
+        eng._patch_slots = len(core.edge_ids)
         return eng
 
     # ── mutations ───────────────────────────────────────────────────────────
     def remove_edge(self, edge_id: str) -> bool:
-        for u, v, k in list(self.G.edges(keys=True)):
-            if k == edge_id:
-                self.G.remove_edge(u, v, key=k)
-                self.edges = [e for e in self.edges if e["id"] != edge_id]
-                return True
-        return False
+        j = self.core.edge_index.get(edge_id)
+        if j is None:
+            return False
+        core = self._overlay()
+        u, v = core.edge_src[j], core.edge_dst[j]
+        core.remove_edge(edge_id)
+        self._reach.edge_removed(core, u, v)
+        return True
 
     def remove_node_full(self, node_name: str) -> bool:
-        if node_name in self.G:
-            self.G.remove_node(node_name)
-            self.nodes = [n for n in self.nodes if n["name"] != node_name]
-            self.edges = [
-                e for e in self.edges
-                if e["source"] != node_name and e["target"] != node_name
-            ]
-            if node_name in self._node_map:
-                del self._node_map[node_name]
-            return True
-        return False
+        i = self.core.index.get(node_name)
+        if i is None:
+            return False
+        core = self._overlay()
+        core.remove_node(node_name)
+        self._reach.node_removed(core, i)
+        return True
 
     def add_edge(self, source: str, target: str, relation: str, weight: int = 5) -> str:
         """Add a new edge to the graph. Returns the new edge ID."""
-        eid = f"SIM{len(self.edges) + 1:03d}"
-        edge = {
-            "id": eid, "source": source, "target": target,
-            "relation": relation, "weight": weight,
-        }
-        self.edges.append(edge)
-        self.G.add_edge(source, target, key=eid,
-                        id=eid, relation=relation, weight=weight)
+        core = self.core
+        taken = core.edge_index
+        # Counting edge slots rather than live edges never reuses an ID
+        seq = len(core.edge_ids) + 1
+        while f"SIM{seq:03d}" in taken:
+            seq += 1
+        eid = f"SIM{seq:03d}"
+        self._add_edge(eid, source, target, relation, weight)
         return eid
 
-    # ── enhanced risk scoring ───────────────────────────────────────────────
-    def _compute_path_risk(self, path: list[str], edges_info: list[dict], sum_weights: int, hops: int) -> dict:
+    def _add_edge(self, edge_id: str, source: str, target: str, relation: str, weight: int) -> None:
+        core = self._overlay()
+        j = core.add_edge(edge_id, source, target, relation, weight, PRIV_WEIGHT.get("", 1.0))
+        self._reach.edge_added(core, core.edge_src[j], core.edge_dst[j])
+
+    # ── reachability ────────────────────────────────────────────────────────
+    def distances(self, t: int) -> list[int]:
         """
-        Compute enhanced risk score considering:
-        - Edge weight sum
-        - Node privilege levels along path
-        - Path length penalty (shorter = riskier)
-        - Critical asset multiplier
-        - Critical edge bonus
+        Hop distance of every node to node `t` (see `reach.ReachIndex`);
+        cached per target and kept current across mutations.
         """
-        # 1. Base edge risk
-        edge_risk = sum_weights
-
-        # 2. Node privilege escalation bonus
-        priv_bonus = 0.0
-        for node_name in path:
-            node = self._node_map.get(node_name, {})
-            priv_bonus += PRIV_WEIGHT.get(node.get("privilegeLevel", ""), 1.0)
-
-        # 3. Path length penalty (shorter paths are more dangerous)
-        length_penalty = 1.0 / sqrt(hops) if hops > 0 else 1.0
-
-        # 4. Critical asset multiplier
-        critical_mult = 1.0
-        for node_name in path:
-            node = self._node_map.get(node_name, {})
-            if node.get("highValue", False):
-                critical_mult = max(critical_mult, HV_MULTIPLIER)
-
-        # 5. Critical edge bonus
-        has_critical = any(e["edgeId"] == ds.CRITICAL_EDGE_ID for e in edges_info)
-        critical_edge_bonus = 1.5 if has_critical else 1.0
-
-        # Combined risk
-        raw_risk = (edge_risk + priv_bonus) * length_penalty * critical_mult * critical_edge_bonus
+        return self._reach.distances(self.core, t)
+
+    def reach_stats(self) -> dict:
+        return self._reach.stats()
+
+    # ── risk grading ────────────────────────────────────────────────────────
+    @staticmethod
+    def _grade(raw_risk: float) -> dict:
+        """Round a raw risk and derive the normalized score / impact band."""
         risk_score = round(raw_risk, 2)
 
         # Normalized score (0-100 scale, capped)
@@ -156,7 +699,7 @@ class GraphEngine:
             "impactEstimation": impact,
         }
 
-    # ── path finding (bounded DFS via NetworkX) ─────────────────────────────
+    # ── path finding (best-first branch-and-bound) ─────────────────────────
     def find_paths(
         self,
         start_nodes: list[str],
@@ -164,67 +707,115 @@ class GraphEngine:
         min_depth: int = 4,
         max_depth: int = 7,
         k: int = MAX_RESULTS_DEFAULT,
+        parallel: bool = False,
+        control: SearchControl | None = None,
     ) -> list[dict]:
-        results: list[dict] = []
+        """
+        Return the `k` riskiest simple paths from each start node to `target`
+        with `min_depth <= hops <= max_depth`, sorted by risk.
+
+        Paths are labelled per start node (A1, A2, … for the first start)
+        in descending risk order.  Parallel edges collapse to their
+        highest-weight edge, so every node sequence appears at most once.
+        With `parallel=True` the per-start searches run on a process pool
+        (see `parallel.py`); results and labels are identical.  Simulated
+        (overlay) graphs are not published to the pool and search serially.
+        `control` tracks progress and can cancel or budget the search; pool
+        searches only check it once they complete, so with an anytime budget
+        (`SearchControl.set_budget`) the searches run serially, each start
+        with its share of the budget; a start whose share runs out keeps the
+        best paths it has found.
+        """
+        chains, found = self._search(start_nodes, target, min_depth, max_depth, k, parallel, control)
+        return self._records(chains, found)
+
+    def _search(
+        self, start_nodes: list[str], target: str, min_depth: int, max_depth: int,
+        k: int, parallel: bool = False, control: SearchControl | None = None,
+    ) -> tuple[dict[int, str], dict[int, list]]:
+        """
+        Run the top-k search for every usable start node.  Returns
+        ({start id: chain letter}, {start id: [(raw, node ids, edge ids)]}).
+        """
+        core = self.core
+        t = core.index.get(target)
+        if t is None or k <= 0:
+            return {}, {}
+        dist = self.distances(t)
+        crit_edge = self._crit_edge()
+        chains: dict[int, str] = {}
         for idx, start in enumerate(start_nodes):
-            if start not in self.G or target not in self.G:
-                continue
-            chain = chr(65 + idx)  # A, B, C, D …
-            count = 0
-            try:
-                for path in nx.all_simple_paths(self.G, start, target, cutoff=max_depth):
-                    hops = len(path) - 1
-                    if hops < min_depth:
-                        continue
-                    count += 1
-                    edges_info, edge_types, sw, crit = self._resolve_edges(path)
-
-                    # Enhanced risk scoring
-                    risk_data = self._compute_path_risk(path, edges_info, sw, hops)
-                    critical_edges_in_path = [
-                        e["edgeId"] for e in edges_info if e["edgeId"] == ds.CRITICAL_EDGE_ID
-                    ]
-
-                    results.append({
-                        "pathId": f"{chain}{count}",
-                        "nodes": list(path),
-                        "edges": edges_info,
-                        "hops": hops,
-                        "edgeTypes": edge_types,
-                        "sumWeights": sw,
-                        "risk": risk_data["risk"],
-                        "normalizedScore": risk_data["normalizedScore"],
-                        "impactEstimation": risk_data["impactEstimation"],
-                        "throughCritical": crit,
-                        "criticalEdgesInPath": critical_edges_in_path,
-                    })
-                    if count >= k:
-                        break
-            except nx.NetworkXError:
-                continue
-        results.sort(key=lambda p: p["risk"], reverse=True)
-        return results
-
-    def _resolve_edges(self, path: list[str]):
-        edges_info: list[dict] = []
-        edge_types: list[str] = []
-        sw = 0
-        crit = False
-        for j in range(len(path) - 1):
-            u, v = path[j], path[j + 1]
-            edge_data = self.G.get_edge_data(u, v)
-            if not edge_data:
+            s = core.index.get(start)
+            if s is None or dist[s] > max_depth:
                 continue
-            best = max(edge_data.values(), key=lambda e: e.get("weight", 0))
-            edges_info.append({
-                "edgeId": best["id"], "source": u, "target": v,
-                "relation": best["relation"], "weight": best["weight"],
-            })
-            edge_types.append(best["relation"])
-            sw += best["weight"]
-            if best["id"] == ds.CRITICAL_EDGE_ID:
-                crit = True
-        return edges_info, edge_types, sw, crit
+            chains.setdefault(s, chr(65 + idx))  # A, B, C, D …
+
+        if parallel and not core.is_overlay and not (control is not None and control.budgeted):
+            from .parallel import parallel_top_k
+            found = parallel_top_k(core, list(chains), t, min_depth, max_depth, k, dist, crit_edge)
+            if control is not None:
+                control.tick(0, sum(map(len, found.values())), done=True)
+        else:
+            found = {}
+            for i, s in enumerate(chains):
+                if control is not None:
+                    control.start_slice(len(chains) - i)
+                found[s] = search_top_k(core, s, t, min_depth, max_depth, k, dist, crit_edge, control=control)
+        return chains, found
+
+    def find_paths_multi(
+        self,
+        start_nodes: list[str],
+        targets: list[str],
+        min_depth: int = 4,
+        max_depth: int = 7,
+        k: int = MAX_RESULTS_DEFAULT,
+        control: SearchControl | None = None,
+    ) -> dict[str, list[dict]]:
+        """
+        `find_paths` for every target in `targets` from one traversal per
+        start node (see `search_multi_top_k`).  Returns {target: paths},
+        each list labelled and ranked exactly as `find_paths` would; unknown
+        targets are left out.
+        """
+        core = self.core
+        ids = list(dict.fromkeys(i for i in map(core.index.get, targets) if i is not None))
+        if not ids or k <= 0:
+            return {}
+        dist = nearest_distances(core, ids)
+        crit_edge = self._crit_edge()
+        chains: dict[int, str] = {}
+        for idx, start in enumerate(start_nodes):
+            s = core.index.get(start)
+            if s is not None and dist[s] <= max_depth:
+                chains.setdefault(s, chr(65 + idx))
+        found = {}
+        for i, s in enumerate(chains):
+            if control is not None:
+                control.start_slice(len(chains) - i)
+            found[s] = search_multi_top_k(core, s, ids, min_depth, max_depth, k, dist, crit_edge, control)
+        return {
+            core.names[t]: self._records(chains, {s: per_target.get(t, []) for s, per_target in found.items()})
+            for t in ids
+        }
+
+    def high_value_targets(self) -> list[str]:
+        """Names of every high-value node, in dataset order."""
+        core = self.core
+        blocked = core.blocked()
+        return [core.names[i] for i in range(core.num_nodes) if core.hv[i] and not blocked[i]]
+
+    def _records(self, chains: dict[int, str], found: dict[int, list]) -> list[dict]:
+        """Label and materialise search results, highest risk first."""
+        return self._path_set(chains, found).records()
+
+    def _path_set(self, chains: dict[int, str], found: dict[int, list]):
+        """Search results as a compact, ranked `pathset.PathSet`."""
+        from .pathset import PathSet
+        return PathSet(self.core, self._crit_edge(), chains, found)
+
+    def _crit_edge(self) -> int:
+        return self.core.edge_index.get(ds.CRITICAL_EDGE_ID, -1) if ds.CRITICAL_EDGE_ID else -1
 
     # ── aggregation helpers ─────────────────────────────────────────────────
     def compute_critical_edges(self, paths: list[dict]) -> list[dict]:
@@ -244,50 +835,222 @@ class GraphEngine:
                 counts[eid]["traversalCount"] += 1
         for c in counts.values():
             c["percentOfPaths"] = round(c["traversalCount"] / total * 100, 1)
-        return sorted(counts.values(), key=lambda x: x["traversalCount"], reverse=True)
+        return sorted(counts.values(), key=_critical_rank)
+
+    def rank_mitigations(self, paths: list[dict], top: int | None = None, cut_size: int = 0) -> dict:
+        """
+        Score single-edge removals against an enumerated path set in one pass.
+
+        An edge's removal eliminates every listed path that traverses it,
+        unless the path's node pair has another (parallel) edge, which the
+        path would fall back to.  Each candidate reports the number of
+        eliminated paths and the global risk they carry.  `top` restricts
+        the candidates to the N most-traversed edges.  With `cut_size` > 0 a
+        greedy pass also picks up to that many edges, each one eliminating
+        the most risk among the paths still standing.  Paths beyond the
+        enumerated top-k are not considered; use `/simulate` for an exact
+        re-analysis of a chosen cut.
+        """
+        core = self.core
+        baseline = self.global_risk(paths)
+        traversal: dict[str, int] = {}
+        # edge id -> indices of paths it cuts (None: a parallel edge takes over)
+        incidence: dict[str, list[int] | None] = {}
+        records: dict[str, dict] = {}
+        for i, p in enumerate(paths):
+            for e in p["edges"]:
+                eid = e["edgeId"]
+                traversal[eid] = traversal.get(eid, 0) + 1
+                records.setdefault(eid, e)
+                if eid not in incidence:
+                    u, v = core.index.get(e["source"]), core.index.get(e["target"])
+                    cuts = u is not None and v is not None and len(core.pair_edges(u, v)) == 1
+                    incidence[eid] = [] if cuts else None
+                if incidence[eid] is not None:
+                    incidence[eid].append(i)
+
+        ranked = sorted(traversal, key=lambda eid: traversal[eid], reverse=True)
+        if top is not None:
+            ranked = ranked[:top]
+
+        def reduction(eid: str, alive=None) -> tuple[int, float]:
+            hit = [i for i in incidence[eid] or () if alive is None or alive[i]]
+            return len(hit), round(sum(paths[i]["risk"] for i in hit), 2)
+
+        def percent(risk: float) -> float:
+            return round(risk / baseline * 100, 1) if baseline > 0 else 0.0
+
+        candidates = []
+        for eid in ranked:
+            e = records[eid]
+            count, risk = reduction(eid)
+            candidates.append({
+                "edgeId": eid, "source": e["source"], "relation": e["relation"],
+                "target": e["target"], "traversalCount": traversal[eid],
+                "eliminatedPaths": count, "riskReduction": risk,
+                "riskReductionPercent": percent(risk),
+            })
+        candidates.sort(key=lambda c: (c["riskReduction"], c["eliminatedPaths"]), reverse=True)
+
+        # Greedy cut: lazy max-heap of gains, re-scored when popped stale
+        cut: list[dict] = []
+        alive = [True] * len(paths)
+        remaining = len(paths)
+        total = 0.0
+        heap = [(-c["riskReduction"], c["edgeId"]) for c in candidates if c["eliminatedPaths"]]
+        heapq.heapify(heap)
+        while heap and len(cut) < cut_size:
+            neg, eid = heapq.heappop(heap)
+            count, risk = reduction(eid, alive)
+            if not count:
+                continue
+            if risk < -neg:
+                heapq.heappush(heap, (-risk, eid))
+                continue
+            for i in incidence[eid]:
+                alive[i] = False
+            remaining -= count
+            total = round(total + risk, 2)
+            cut.append({
+                "edgeId": eid, "eliminatedPaths": count, "riskReduction": risk,
+                "cumulativeRiskReduction": total,
+                "cumulativeReductionPercent": percent(total),
+                "remainingPaths": remaining,
+            })
+
+        return {
+            "totalPaths": len(paths),
+            "globalRisk": baseline,
+            "candidates": candidates,
+            "greedyCut": cut,
+        }
 
     @staticmethod
     def global_risk(paths: list[dict]) -> float:
         return round(sum(p["risk"] for p in paths), 2)
 
     # ── neighbor finding for focus mode ─────────────────────────────────────
-    def get_neighbors(self, node_name: str, radius: int = 2) -> dict:
+    def get_neighbors(self, node_name: str, radius: int = 2, direction: str = "both") -> dict:
         """Return nodes and edges within `radius` hops of node_name."""
-        if node_name not in self.G:
-            return {"nodes": [], "edges": []}
+        return self.get_neighborhood([node_name], radius, direction)
 
-        # BFS to find reachable nodes within radius (both directions)
-        visited = {node_name}
-        frontier = {node_name}
+    def get_neighborhood(self, node_names: list[str], radius: int = 2, direction: str = "both") -> dict:
+        """
+        Nodes within `radius` hops of any of `node_names`, following edges
+        forwards (`out`), backwards (`in`) or both ways, and every edge
+        between them.  Works from the adjacency arrays, so the cost grows
+        with the neighbourhood, not with the graph.
+        """
+        if direction not in NEIGHBOR_DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(NEIGHBOR_DIRECTIONS)}")
+        core = self.core
+        blocked = core.blocked()
+        frontier = [i for i in dict.fromkeys(map(core.index.get, node_names)) if i is not None]
+        visited = set(frontier)
+        fwd, back = direction != "in", direction != "out"
         for _ in range(radius):
-            next_frontier = set()
+            next_frontier = []
             for n in frontier:
-                # Successors
-                for succ in self.G.successors(n):
-                    if succ not in visited:
-                        visited.add(succ)
-                        next_frontier.add(succ)
-                # Predecessors
-                for pred in self.G.predecessors(n):
-                    if pred not in visited:
-                        visited.add(pred)
-                        next_frontier.add(pred)
+                if fwd:
+                    for succ, _, _ in core.succs(n):
+                        if succ not in visited and not blocked[succ]:
+                            visited.add(succ)
+                            next_frontier.append(succ)
+                if back:
+                    for pred in core.preds(n):
+                        if pred not in visited and not blocked[pred]:
+                            visited.add(pred)
+                            next_frontier.append(pred)
             frontier = next_frontier
 
-        # Collect relevant edges
-        relevant_edges = []
-        for e in self.edges:
-            if e["source"] in visited and e["target"] in visited:
-                relevant_edges.append(e)
+        # Every edge (parallel ones included) between two visited nodes
+        hops = sorted(
+            j for u in visited for v, _, _ in core.succs(u) if v in visited for j in core.pair_edges(u, v)
+        )
+        by_name = self._node_dicts()
+        return {
+            "nodes": [by_name[core.names[i]] for i in sorted(visited)],
+            "edges": [
+                {"id": rec["edgeId"], "source": rec["source"], "target": rec["target"],
+                 "relation": rec["relation"], "weight": rec["weight"]}
+                for rec in map(core.edge_record, hops)
+            ],
+        }
+
+    def _node_dicts(self) -> dict[str, dict]:
+        """Node dicts by name, rebuilt only when the node list changes."""
+        nodes = self.nodes
+        if self._node_map is None or self._node_map[0] is not nodes:
+            self._node_map = (nodes, {n["name"]: n for n in nodes})
+        return self._node_map[1]
 
-        relevant_nodes = [n for n in self.nodes if n["name"] in visited]
-        return {"nodes": relevant_nodes, "edges": relevant_edges}
+    # ── streaming analysis ──────────────────────────────────────────────────
+    def iter_analysis(
+        self, start_nodes, target, min_depth=4, max_depth=7, k=MAX_RESULTS_DEFAULT, control=None,
+        into=None,
+    ):
+        """
+        Incremental `analyze`: yields one `paths` frame per start node as
+        soon as its search finishes (labelled and ranked as in
+        `find_paths`), each followed by a `progress` frame with the running
+        aggregates, and finally a `summary` frame.  Only the aggregates are
+        kept between frames, never the path dicts; with `into` (an empty
+        `_path_set`) each start's paths are also added to it, compactly.
+        Each start searches for its share of `control`'s anytime budget
+        (see `SearchControl.start_slice`).
+        """
+        core = self.core
+        t = core.index.get(target)
+        starts: dict[int, str] = {}
+        if t is not None and k > 0:
+            dist = self.distances(t)
+            crit_edge = self._crit_edge()
+            for idx, start in enumerate(start_nodes):
+                s = core.index.get(start)
+                if s is not None and dist[s] <= max_depth:
+                    starts.setdefault(s, chr(65 + idx))
+
+        summary = RunningSummary()
+        for done, (s, chain) in enumerate(starts.items(), start=1):
+            if control is not None:
+                control.start_slice(len(starts) - done + 1)
+            found = search_top_k(core, s, t, min_depth, max_depth, k, dist, crit_edge, control=control)
+            if into is not None:
+                into.add(s, chain, found)
+            paths = self._records({s: chain}, {s: found})
+            summary.add(paths)
+            yield {"type": "paths", "chain": chain, "startNode": core.names[s], "paths": paths}
+            yield {"type": "progress", "completedStarts": done, "totalStarts": len(starts),
+                   **summary.snapshot()}
+        yield {"type": "summary", **summary.snapshot()}
 
     # ── combined analysis ───────────────────────────────────────────────────
     def analyze(
         self, start_nodes, target, min_depth=4, max_depth=7, k=MAX_RESULTS_DEFAULT,
+        parallel=False, control=None,
     ) -> dict:
-        paths = self.find_paths(start_nodes, target, min_depth, max_depth, k)
+        paths = self.find_paths(start_nodes, target, min_depth, max_depth, k, parallel, control)
+        return self.summarise(paths)
+
+    def analyze_multi(
+        self, start_nodes, targets, min_depth=4, max_depth=7, k=MAX_RESULTS_DEFAULT, control=None,
+    ) -> dict:
+        """
+        `analyze` for several targets at once: one summary per target,
+        riskiest first, plus totals over all of them.
+        """
+        per_target = self.find_paths_multi(start_nodes, targets, min_depth, max_depth, k, control)
+        groups = [{"targetNode": t, **self.summarise(paths)} for t, paths in per_target.items()]
+        groups.sort(key=lambda g: g["globalRisk"], reverse=True)
+        return {
+            "targets": groups,
+            "targetsReachable": sum(1 for g in groups if g["totalPaths"]),
+            "totalPaths": sum(g["totalPaths"] for g in groups),
+            "globalRisk": round(sum(g["globalRisk"] for g in groups), 2),
+        }
+
+    def summarise(self, paths: list[dict]) -> dict:
+        """Assemble the `/analyze` response body for a ranked path list."""
         crit = self.compute_critical_edges(paths)
         gr = self.global_risk(paths)
         shortest = min((p["hops"] for p in paths), default=0)
@@ -299,3 +1062,56 @@ class GraphEngine:
             "criticalEdges": crit[:10],
             "globalRisk": gr,
         }
+
+
+def _critical_rank(c: dict) -> tuple:
+    """Critical-edge order: most traversed first, ties by edge id."""
+    return -c["traversalCount"], c["edgeId"]
+
+
+class RunningSummary:
+    """
+    `summarise` aggregates maintained path by path: totals, the current
+    top 5 and the critical-edge counts, without keeping the paths.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.risk = 0.0
+        self.shortest: int | None = None
+        self._top: list[tuple[float, int, dict]] = []   # min-heap (risk, -arrival, path)
+        self._counts: dict[str, dict] = {}
+
+    def add(self, paths: list[dict]) -> None:
+        for p in paths:
+            self.total += 1
+            self.risk += p["risk"]
+            if self.shortest is None or p["hops"] < self.shortest:
+                self.shortest = p["hops"]
+            entry = (p["risk"], -self.total, p)
+            if len(self._top) < 5:
+                heapq.heappush(self._top, entry)
+            elif entry[:2] > self._top[0][:2]:
+                heapq.heapreplace(self._top, entry)
+            for e in p["edges"]:
+                eid = e["edgeId"]
+                if eid not in self._counts:
+                    self._counts[eid] = {
+                        "edgeId": eid, "source": e["source"],
+                        "relation": e["relation"], "target": e["target"],
+                        "traversalCount": 0,
+                    }
+                self._counts[eid]["traversalCount"] += 1
+
+    def snapshot(self) -> dict:
+        crit = sorted(self._counts.values(), key=_critical_rank)[:10]
+        return {
+            "totalPaths": self.total,
+            "top5": [p for _, _, p in sorted(self._top, key=lambda e: e[:2], reverse=True)],
+            "shortestHops": self.shortest or 0,
+            "criticalEdges": [
+                {**c, "percentOfPaths": round(c["traversalCount"] / self.total * 100, 1)}
+                for c in crit
+            ],
+            "globalRisk": round(self.risk, 2),
+        }
@@ -0,0 +1,141 @@
+"""
+/graph payloads — the node / edge lists in the shapes the UI asks for,
+serialised (and gzip-compressed) once per dataset version and view.
+
+Views:
+- full: every node and edge, optionally restricted to some subnets
+  (nodes in them, edges with both ends in them) and paginated by node
+  (`offset` / `limit`): a page carries the edges whose later endpoint is
+  on it, so every edge comes exactly once and only refers to nodes of
+  that page or earlier ones;
+- overview: nodes collapsed into one group per subnet or per type, with
+  member counts, and edges collapsed into one per ordered group pair with
+  counts per relation.
+
+Payloads are keyed by `dataset.VERSION` and the view parameters; the
+ETag is derived from the same key, so a client revalidating with
+If-None-Match gets a 304 until the dataset changes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+
+from . import dataset as ds
+from .cache import ResultCache
+
+# Serialised views kept (least recently used are dropped)
+GRAPH_CACHE_ENTRIES = 32
+
+# Bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+
+_NODE_FIELDS = (("id", ""), ("name", ""), ("type", ""), ("privilegeLevel", ""), ("highValue", False), ("subnet", ""))
+_EDGE_FIELDS = ("id", "source", "target", "relation", "weight")
+
+
+class Payload:
+    """One serialised view: JSON body, gzip body (or None) and ETag."""
+
+    __slots__ = ("body", "gzipped", "etag")
+
+    def __init__(self, key: tuple, doc: dict):
+        self.body = json.dumps(doc, separators=(",", ":")).encode()
+        self.gzipped = gzip.compress(self.body, 6) if len(self.body) >= GZIP_MIN_BYTES else None
+        self.etag = '"' + hashlib.sha256(repr(key).encode()).hexdigest()[:24] + '"'
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """True if an If-None-Match header already names this payload."""
+        if not if_none_match:
+            return False
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+
+def _node(n: dict) -> dict:
+    return {f: n.get(f, default) for f, default in _NODE_FIELDS}
+
+
+def _edge(e: dict) -> dict:
+    return {f: e[f] for f in _EDGE_FIELDS}
+
+
+def full_view(subnets: tuple[str, ...] = (), offset: int = 0, limit: int | None = None) -> dict:
+    """Node and edge lists, optionally per subnet and paginated by node."""
+    nodes, edges = ds.NODES, ds.EDGES
+    if subnets:
+        wanted = set(subnets)
+        nodes = [n for n in nodes if n.get("subnet", "") in wanted]
+        names = {n["name"] for n in nodes}
+        edges = [e for e in edges if e["source"] in names and e["target"] in names]
+    total_nodes, total_edges = len(nodes), len(edges)
+    end = total_nodes if limit is None else min(offset + limit, total_nodes)
+    if offset > 0 or end < total_nodes:
+        pos = {n["name"]: i for i, n in enumerate(nodes)}
+        edges = [e for e in edges if offset <= max(pos[e["source"]], pos[e["target"]]) < end]
+    return {
+        "nodes": [_node(n) for n in nodes[offset:end]],
+        "edges": [_edge(e) for e in edges],
+        "totalNodes": total_nodes,
+        "totalEdges": total_edges,
+        "offset": offset,
+        "nextOffset": end if end < total_nodes else None,
+    }
+
+
+def overview(group_by: str) -> dict:
+    """Nodes grouped by subnet or type, edges counted per group pair."""
+    labels = {s["id"]: s.get("label", s["id"]) for s in ds.SUBNETS} if group_by == "subnet" else {}
+    group_of: dict[str, str] = {}
+    groups: dict[str, dict] = {}
+    for n in ds.NODES:
+        gid = n.get(group_by, "") or ""
+        group_of[n["name"]] = gid
+        g = groups.get(gid)
+        if g is None:
+            g = groups[gid] = {"id": gid, "label": labels.get(gid, gid or "(none)"),
+                               "nodes": 0, "highValue": 0, "types": {}}
+        g["nodes"] += 1
+        g["highValue"] += bool(n.get("highValue"))
+        g["types"][n["type"]] = g["types"].get(n["type"], 0) + 1
+    links: dict[tuple[str, str], dict] = {}
+    for e in ds.EDGES:
+        pair = (group_of[e["source"]], group_of[e["target"]])
+        link = links.get(pair)
+        if link is None:
+            link = links[pair] = {"source": pair[0], "target": pair[1], "edges": 0, "relations": {}}
+        link["edges"] += 1
+        link["relations"][e["relation"]] = link["relations"].get(e["relation"], 0) + 1
+    return {
+        "groupBy": group_by,
+        "groups": list(groups.values()),
+        "edges": list(links.values()),
+        "totalNodes": len(ds.NODES),
+        "totalEdges": len(ds.EDGES),
+    }
+
+
+class GraphViews:
+    """Per-version cache of serialised /graph views."""
+
+    def __init__(self, max_entries: int = GRAPH_CACHE_ENTRIES):
+        # Views never go stale for their version, so no time-to-live
+        self._cache = ResultCache(max_entries=max_entries, ttl=float("inf"))
+
+    def get(self, view: str, group_by: str = "subnet", subnets: tuple[str, ...] = (),
+            offset: int = 0, limit: int | None = None) -> Payload:
+        if view == "overview":
+            key = (ds.VERSION, "overview", group_by)
+        else:
+            key = (ds.VERSION, "full", tuple(sorted(subnets)), offset, limit)
+        hit = self._cache.get(key)
+        if hit is None:
+            doc = overview(group_by) if view == "overview" else full_view(key[2], offset, limit)
+            hit = Payload(key, doc)
+            self._cache.put(key, hit, len(hit.body) + len(hit.gzipped or b""))
+        return hit
+
+    def stats(self) -> dict:
+        return self._cache.stats()
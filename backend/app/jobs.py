@@ -0,0 +1,167 @@
+"""
+Job queue — runs analyses and simulations on a bounded worker pool so
+deep searches cannot tie up the web server's own threads.
+
+Each job gets an id, reports progress (nodes expanded, paths found) while
+it runs, and can be cancelled or stopped by a time / path budget through
+its `SearchControl`.  Results are kept for polling only as long as the
+history's byte budget allows; jobs submitted with `keep_result=False` keep
+none, and their inline caller `release`s the future once it has the result.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from .cache import estimate_size
+from .graph_engine import SearchAborted, SearchControl
+
+# Concurrent searches; further jobs wait in the queue
+JOB_WORKERS = 2
+
+# Finished jobs kept for polling before the oldest are forgotten
+JOB_HISTORY = 100
+
+# Bytes of finished-job results kept for polling, likewise
+JOB_HISTORY_BYTES = 64 * 1024 * 1024
+
+# Job states
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+CANCELLED, TIMED_OUT, OVER_BUDGET = "cancelled", "timedOut", "overBudget"
+
+_ABORT_STATUS = {"cancelled": CANCELLED, "timeLimit": TIMED_OUT, "pathBudget": OVER_BUDGET}
+
+
+class Job:
+    """One submitted analysis or simulation."""
+
+    def __init__(self, job_id: str, kind: str, control: SearchControl, keep_result: bool = True):
+        self.id = job_id
+        self.kind = kind
+        self.control = control
+        self.keep_result = keep_result
+        self.status = QUEUED
+        self.result = None
+        self.result_size = 0
+        self.error: str | None = None
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.future: Future | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status not in (QUEUED, RUNNING)
+
+    def describe(self, with_result: bool = True) -> dict:
+        out = {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.control.progress(),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+        if with_result:
+            out["result"] = self.result
+        return out
+
+
+class JobManager:
+    """Bounded thread pool plus a registry of recent jobs."""
+
+    def __init__(
+        self, workers: int = JOB_WORKERS, history: int = JOB_HISTORY,
+        history_bytes: int = JOB_HISTORY_BYTES,
+    ):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="apf-job")
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._history = history
+        self._history_bytes = history_bytes
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(
+        self, kind: str, fn: Callable[[SearchControl], object],
+        time_limit: float | None = None, max_paths: int | None = None,
+        keep_result: bool = True,
+    ) -> Job:
+        """
+        Queue `fn(control)`; its return value becomes the job result, kept
+        for polling unless `keep_result` is false (only `future` has it).
+        """
+        control = SearchControl(time_limit, max_paths)
+        with self._lock:
+            job = Job(f"job-{next(self._ids)}", kind, control, keep_result)
+            self._jobs[job.id] = job
+            self._trim()
+        job.future = self._pool.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn):
+        job.started = time.time()
+        try:
+            if job.control.cancelled:
+                raise SearchAborted("cancelled")
+            job.status = RUNNING
+            result = fn(job.control)
+            if job.keep_result:
+                job.result, job.result_size = result, estimate_size(result)
+            job.status = DONE
+            with self._lock:
+                self._trim(job)
+            return result
+        except SearchAborted as exc:
+            job.status = _ABORT_STATUS[exc.reason]
+            job.error = exc.reason
+            raise
+        except Exception as exc:
+            job.status = FAILED
+            job.error = str(exc)
+            raise
+        finally:
+            job.finished = time.time()
+
+    def _trim(self, newest: Job | None = None) -> None:
+        """Forget the oldest finished jobs past the history's count / byte bounds."""
+        finished = [jid for jid, j in self._jobs.items() if j.done and j is not newest]
+        drop = max(0, len(self._jobs) - self._history)
+        held = sum(self._jobs[jid].result_size for jid in finished)
+        held += newest.result_size if newest is not None else 0
+        for i, jid in enumerate(finished):
+            if i >= drop and held <= self._history_bytes:
+                break
+            held -= self._jobs[jid].result_size
+            del self._jobs[jid]
+
+    def release(self, job: Job) -> None:
+        """Drop a finished job's result once its inline caller has it."""
+        job.result, job.result_size = None, 0
+        job.future = None
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Flag a job for cancellation; running searches stop at their next check."""
+        job = self.get(job_id)
+        if job is not None and not job.done:
+            job.control.cancel()
+        return job
+
+    def shutdown(self) -> None:
+        for job in self.list():
+            job.control.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,142 @@
+"""
+Incremental JSON reader for large dataset files.
+
+Walks a top-level JSON object and yields its members one at a time; the
+elements of selected array members are yielded one by one instead of as
+a list.  Only a bounded window of the text is held in memory, so a
+multi-GB export is parsed in roughly constant space beyond what the
+caller keeps.  Uses only the stdlib `json` decoder.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import BinaryIO, Callable, Iterator
+
+# Bytes read from the file per refill
+CHUNK_SIZE = 1 << 20
+
+# A single value larger than this is treated as malformed
+MAX_VALUE_CHARS = 64 << 20
+
+_WS = " \t\n\r"
+
+# Yielded as the value when a streamed array member starts
+ARRAY_START = object()
+
+
+class _Reader:
+    """Sliding text window over a binary file, decoded as UTF-8."""
+
+    def __init__(self, fp: BinaryIO, on_read: Callable[[int], None] | None = None):
+        self.fp = fp
+        self.on_read = on_read
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self.offset = 0   # characters dropped from the front of the window
+        self.decode = json.JSONDecoder().raw_decode
+
+    def fill(self) -> bool:
+        """Append the next chunk; False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(CHUNK_SIZE)
+        self.offset += self.pos
+        if not chunk:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self.decoder.decode(b"", final=True)
+        else:
+            self.bytes_read += len(chunk)
+            self.buf = self.buf[self.pos:] + self.decoder.decode(chunk)
+            if self.on_read is not None:
+                self.on_read(self.bytes_read)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise self.error(f"Expecting {' or '.join(repr(c) for c in chars)}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode one complete JSON value at the cursor."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decode(self.buf, self.pos)
+            except json.JSONDecodeError as exc:
+                # Possibly cut off by the window: widen it and retry
+                if len(self.buf) - self.pos > MAX_VALUE_CHARS or not self.fill():
+                    raise self.error(exc.msg, exc.pos) from None
+                continue
+            # A number touching the window end may continue in the next chunk
+            if end == len(self.buf) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+    def error(self, msg: str, pos: int | None = None) -> json.JSONDecodeError:
+        """Decode error positioned in the whole input, not the window."""
+        pos = self.offset + (self.pos if pos is None else pos)
+        err = json.JSONDecodeError(msg, "", 0)
+        err.pos = pos
+        err.args = (f"{msg}: char {pos}",)
+        return err
+
+
+def iter_object(
+    fp: BinaryIO, stream_keys: tuple[str, ...] = (),
+    on_read: Callable[[int], None] | None = None,
+) -> Iterator[tuple[str, object]]:
+    """
+    Yield (key, value) for each member of the top-level object in `fp`.
+    For keys in `stream_keys` whose value is an array, yields
+    (key, ARRAY_START) and then (key, element) per element instead.
+    `on_read(bytes_read)` is called after every chunk.  Malformed input
+    raises `json.JSONDecodeError`.
+    """
+    r = _Reader(fp, on_read)
+    r.expect("{")
+    if r.peek() == "}":
+        r.pos += 1
+    else:
+        while True:
+            if r.peek() != '"':
+                raise r.error("Expecting property name enclosed in double quotes")
+            key = r.value()
+            r.expect(":")
+            if key in stream_keys and r.peek() == "[":
+                r.pos += 1
+                yield key, ARRAY_START
+                if r.peek() == "]":
+                    r.pos += 1
+                else:
+                    while True:
+                        yield key, r.value()
+                        if r.expect(",]") == "]":
+                            break
+            else:
+                yield key, r.value()
+            if r.expect(",}") == "}":
+                break
+    if r.peek():
+        raise r.error("Extra data")
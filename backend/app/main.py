@@ -1,24 +1,52 @@
 """
 Attack Path Forecaster — FastAPI application
-Endpoints: /graph, /analyze, /explain, /simulate, /scenarios,
-           /upload-dataset, /reset-dataset, /dataset-info
+Endpoints: /graph, /analyze, /analyze/multi, /analyze/stream, /analyze/aggregate, /explain, /explain/batch,
+           /explain/stream, /simulate, /mitigations, /chokepoints, /scenarios, /jobs, /upload-dataset, /upload-progress, /dataset/patch,
+           /reset-dataset, /snapshots, /dataset-info, /cache-stats
 """
 
+import asyncio
 import json
-
-from fastapi import FastAPI, HTTPException, Query, UploadFile, File
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from functools import partial
+from typing import Optional, Union
+
+from fastapi import FastAPI, HTTPException, Query, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 
 from .models import (
-    AnalysisRequest, AnalysisResponse,
-    GraphResponse,
+    AnalysisRequest, AnalysisResponse, PathInfo,
+    MultiTargetRequest, MultiTargetResponse,
+    GraphResponse, GraphOverviewResponse,
     SimulateRequest, SimulateResponse,
     AnalysisSummary, DeltaInfo,
+    ExplainBatchRequest, ExplainBatchResponse,
     NeighborRequest, NeighborResponse,
+    MitigationRequest, MitigationResponse,
+    AggregateRequest, AggregateResponse,
+    ChokepointRequest, ChokepointResponse,
+    AnalysisJobRequest, SimulationJobRequest, JobInfo,
+    DatasetPatch, PatchResponse,
 )
 from . import dataset as ds
-from .graph_engine import GraphEngine
-from .explainer import explain_path
+from .aggregate import path_statistics
+from .analyses import AnalysisStore, analysis_id, expand
+from .chokepoints import chokepoints as find_chokepoints
+from .graph_engine import GraphEngine, SearchAborted, SearchControl
+from .simulation import Simulator
+from .cache import ResultCache
+from .jobs import JobManager
+from .explainer import explain_steps, render_text
+from .graphview import GraphViews
+from . import sharphound
+from .snapshot import SnapshotError, SnapshotStore
 
 app = FastAPI(title="Attack Path Forecaster", version="1.0.0")
 
@@ -33,11 +61,48 @@ app.add_middleware(
 
 def _rebuild_engine() -> GraphEngine:
     """Create a fresh GraphEngine from the current active dataset."""
-    return GraphEngine(nodes=None, edges=None)
-
+    return GraphEngine(nodes=None, edges=None, core=ds.CORE)
+
+
+def _replay_patches(engine: GraphEngine, journal: list[list[dict]]) -> GraphEngine:
+    """Re-apply journalled `/dataset/patch` ops to `engine` and the dataset."""
+    for ops in journal:
+        data, changes, errors = ds.patch(ops)
+        if errors:
+            break
+        engine = engine.patched(data["NODES"], data["EDGES"], changes)
+        ds.activate(data)
+    return engine
+
+
+# Binary snapshots of activated datasets (enabled by APF_SNAPSHOT_DIR); the
+# most recent one is reopened at startup instead of starting empty, with
+# the patches journalled against it since.
+snapshots: SnapshotStore | None = None
+_restored = None
+if os.environ.get("APF_SNAPSHOT_DIR"):
+    snapshots = SnapshotStore(os.environ["APF_SNAPSHOT_DIR"])
+    try:
+        _restored = snapshots.latest()
+    except (OSError, SnapshotError):
+        _restored = None
+    if _restored is not None:
+        ds.activate(_restored)
 
 # Baseline graph engine (rebuilt when dataset changes)
 engine: GraphEngine = _rebuild_engine()
+# Stored snapshot the active dataset is (patched from), if any
+_snapshot_base: str | None = None
+if _restored is not None:
+    _snapshot_base = _restored["VERSION"]
+    engine = _replay_patches(engine, snapshots.patches(_snapshot_base))
+# Analysis results, keyed by dataset content hash + request parameters
+results = ResultCache()
+simulator = Simulator(engine, results)
+# Serialised /graph views, keyed by dataset version
+graph_views = GraphViews()
+# Bounded pool every analysis / simulation runs on
+jobs = JobManager()
 
 
 def _require_dataset():
@@ -45,17 +110,48 @@ def _require_dataset():
     if not ds.is_loaded():
         raise HTTPException(409, "No dataset loaded. Please upload a JSON dataset first.")
 
-# Cache last analysis for /explain lookups
-_last_analysis: dict[str, dict] = {}
+# Path lists of past analyses for /explain, by analysis id (spilled to
+# APF_ANALYSIS_DIR when set, so workers sharing it can answer for each other)
+analyses = AnalysisStore(os.environ.get("APF_ANALYSIS_DIR") or None)
+
+# Serialises dataset swaps and patches
+_dataset_lock = threading.Lock()
+
+# State of the current / last /upload-dataset call
+_upload_progress: dict = {"state": "idle", "bytesRead": 0, "totalBytes": 0, "nodes": 0, "edges": 0}
 
 
 # ── Endpoints ───────────────────────────────────────────────────────────────
 
-@app.get("/graph", response_model=GraphResponse)
-def get_graph():
-    """Return full node + edge lists for graph rendering."""
+@app.get(
+    "/graph", response_model=Union[GraphResponse, GraphOverviewResponse],
+    responses={304: {"description": "Not modified (If-None-Match matches the ETag)"}},
+)
+def get_graph(
+    request: Request,
+    view: str = Query("full", pattern="^(full|overview)$"),
+    groupBy: str = Query("subnet", pattern="^(subnet|type)$", description="overview grouping"),
+    subnet: list[str] = Query([], description="only nodes in these subnets (full view)"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, description="nodes per page, with their edges (full view)"),
+):
+    """
+    Return node + edge lists for graph rendering (`GraphResponse`; pages
+    carry the edges whose later endpoint is on them), or with
+    `view=overview` one group per subnet / type with edge counts between
+    groups (`GraphOverviewResponse`).  Bodies
+    are cached per dataset version, gzip-compressed when the client
+    accepts it and answered with 304 when If-None-Match still matches.
+    """
     _require_dataset()
-    return {"nodes": ds.NODES, "edges": ds.EDGES}
+    payload = graph_views.get(view, groupBy, tuple(subnet), offset, limit)
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if payload.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(payload.gzipped, media_type="application/json",
+                        headers={**headers, "Content-Encoding": "gzip"})
+    return Response(payload.body, media_type="application/json", headers=headers)
 
 
 @app.get("/subnets")
@@ -72,53 +168,268 @@ def get_start_options():
 
 @app.post("/neighbors", response_model=NeighborResponse)
 def get_neighbors(req: NeighborRequest):
-    """Return nodes/edges within N hops of a given node."""
-    result = engine.get_neighbors(req.nodeName, req.radius)
-    return result
+    """Return nodes/edges within N hops of a given node (or of several, combined)."""
+    names = ([req.nodeName] if req.nodeName else []) + req.nodeNames
+    try:
+        return engine.get_neighborhood(names, req.radius, req.direction)
+    except ValueError as exc:
+        raise HTTPException(422, str(exc))
 
 
-@app.post("/analyze", response_model=AnalysisResponse)
-def analyze(req: AnalysisRequest):
-    """Run bounded attack-path analysis and return ranked results."""
-    global _last_analysis
-    result = engine.analyze(
+def _analysis_id(start_nodes, target, min_depth, max_depth, k) -> str:
+    return analysis_id(ds.VERSION, "analysis", list(start_nodes), target, min_depth, max_depth, k)
+
+
+def _budgeted_id(req: AnalysisRequest, control: SearchControl) -> str:
+    """Analysis id of `req` once searched under `control`'s anytime budget."""
+    if control.stopped:
+        # Where a budget stops is not reproducible: the id covers the work done
+        return analysis_id(ds.VERSION, "partial", list(req.startNodes), req.targetNode,
+                           req.minDepth, req.maxDepth, req.k, control.stats())
+    return _analysis_id(req.startNodes, req.targetNode, req.minDepth, req.maxDepth, req.k)
+
+
+def _budget_report(control: SearchControl) -> dict:
+    return {"partial": control.stopped is not None, "stopReason": control.stopped,
+            "searchStats": control.stats()}
+
+
+def _reject_budget(a: AnalysisRequest) -> None:
+    """422 for anytime budgets where a partial baseline would skew the answer."""
+    if a.timeBudget is not None or a.expansionBudget is not None:
+        raise HTTPException(422, "timeBudget / expansionBudget apply to /analyze and /analyze/stream only.")
+
+
+def _run_analysis(req: AnalysisRequest, control: SearchControl) -> dict:
+    control.set_budget(req.timeBudget, req.expansionBudget)
+    paths, _ = simulator.analysis(
         req.startNodes, req.targetNode,
-        req.minDepth, req.maxDepth, req.k,
+        req.minDepth, req.maxDepth, req.k, req.parallel, control,
     )
-    _last_analysis = {p["pathId"]: p for p in result["paths"]}
+    aid = _budgeted_id(req, control)
+    analyses.put(aid, paths)
+    return {
+        **(paths.wire() if req.compact else paths.analysis()),
+        "analysisId": aid,
+        **_budget_report(control),
+    }
+
+
+async def _run_job(kind: str, fn):
+    """
+    Run `fn(control)` on the job pool and wait for it without holding a
+    server thread; 409 if it was stopped.  The job's history entry keeps
+    no result, and the job is cancelled if the client goes away.
+    """
+    job = jobs.submit(kind, fn, keep_result=False)
+    try:
+        return await asyncio.wrap_future(job.future)
+    except SearchAborted as exc:
+        raise HTTPException(409, f"Job {job.id} stopped: {exc.reason}")
+    except asyncio.CancelledError:
+        jobs.cancel(job.id)
+        raise
+    finally:
+        jobs.release(job)
+
+
+@app.post("/analyze", response_model=AnalysisResponse)
+async def analyze(req: AnalysisRequest):
+    """
+    Run bounded attack-path analysis and return ranked results.  With
+    `compact` set the body uses the compact wire format (see
+    `PathSet.wire`) and is sent as is, without response-model validation.
+    With `timeBudget` / `expansionBudget` each start searches for its share
+    of what is left of them, and a start whose share runs out keeps the
+    best paths found so far; the result is then flagged `partial`.
+    """
+    result = await _run_job("analysis", partial(_run_analysis, req))
+    if req.compact:
+        return Response(json.dumps(result, separators=(",", ":")), media_type="application/json")
     return result
 
 
+def _run_multi_analysis(req: MultiTargetRequest, targets: list[str], control: SearchControl) -> dict:
+    result = engine.analyze_multi(req.startNodes, targets, req.minDepth, req.maxDepth, req.k, control)
+    for group in result["targets"]:
+        # Same paths as a single-target /analyze, so the same id
+        group["analysisId"] = analyses.put(
+            _analysis_id(req.startNodes, group["targetNode"], req.minDepth, req.maxDepth, req.k),
+            group["paths"],
+        )
+    return result
+
+
+@app.post("/analyze/multi", response_model=MultiTargetResponse)
+async def analyze_multi(req: MultiTargetRequest):
+    """Analyse several targets (or every high-value node) in one shared traversal."""
+    targets = list(req.targetNodes)
+    if req.allHighValue:
+        targets += engine.high_value_targets()
+    if not targets:
+        raise HTTPException(422, "No targets: give targetNodes or set allHighValue.")
+    return await _run_job("analysis", partial(_run_multi_analysis, req, targets))
+
+
+@app.post("/analyze/stream")
+def analyze_stream(
+    req: AnalysisRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson or sse"),
+):
+    """
+    Stream the analysis as it runs: a `paths` frame per start node, a
+    `progress` frame with running aggregates after each, and a final
+    `summary` frame (an `error` frame instead if the job is stopped).
+    Sent as NDJSON lines or as Server-Sent Events.  The search runs as a
+    job on the pool; closing the stream cancels it.  `timeBudget` /
+    `expansionBudget` apply as for /analyze, each start getting its share,
+    and the summary reports `partial`, `stopReason` and `searchStats`.
+    """
+    frames: queue.Queue = queue.Queue()
+    eng = engine   # one graph for the search and the path set, even if the dataset swaps meanwhile
+    collected = eng._path_set({}, {})   # compact; the path dicts go out with their frames
+
+    def produce(control: SearchControl) -> None:
+        control.set_budget(req.timeBudget, req.expansionBudget)
+        try:
+            for frame in eng.iter_analysis(
+                req.startNodes, req.targetNode, req.minDepth, req.maxDepth, req.k, control, collected,
+            ):
+                frames.put(frame)
+        except SearchAborted as exc:
+            frames.put({"type": "error", "error": exc.reason})
+            raise
+        finally:
+            frames.put(None)
+
+    job = jobs.submit("analysis", produce, keep_result=False)
+
+    def body():
+        try:
+            while (frame := frames.get()) is not None:
+                if frame["type"] == "summary":
+                    aid = analyses.put(_budgeted_id(req, job.control), collected)
+                    frame = {**frame, "analysisId": aid, **_budget_report(job.control)}
+                data = json.dumps(frame)
+                yield f"event: {frame['type']}\ndata: {data}\n\n" if format == "sse" else data + "\n"
+        finally:
+            jobs.cancel(job.id)
+            jobs.release(job)
+
+    media = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media)
+
+
+@app.post("/analyze/aggregate", response_model=AggregateResponse)
+async def analyze_aggregate(req: AggregateRequest):
+    """
+    Count every bounded path to the target, their total risk and per-edge
+    path counts, without enumerating paths (no `k` cap).
+    """
+    return await _run_job("analysis", partial(
+        path_statistics, engine, req.startNodes, req.targetNode, req.minDepth, req.maxDepth,
+        req.topEdges,
+    ))
+
+
+def _stored_path(analysis_id: Optional[str], path_id: str) -> dict:
+    path = analyses.path(analysis_id, path_id)
+    if path is None:
+        where = f"analysis '{analysis_id}'" if analysis_id else "the latest analysis"
+        raise HTTPException(404, f"Path '{path_id}' not found in {where}. Run /analyze first.")
+    return path
+
+
 @app.get("/explain")
-def explain(pathId: str = Query(..., description="Path ID from /analyze")):
-    """Return step-by-step explanation for a discovered attack path."""
-    if pathId not in _last_analysis:
-        raise HTTPException(404, f"Path '{pathId}' not found. Run /analyze first.")
-    return {"pathId": pathId, "explanation": explain_path(_last_analysis[pathId])}
+def explain(
+    pathId: str = Query(..., description="Path ID from /analyze"),
+    analysisId: Optional[str] = Query(None, description="analysisId from /analyze (default: latest here)"),
+):
+    """Return step-by-step explanation (text and structured steps) for a discovered attack path."""
+    info = explain_steps(_stored_path(analysisId, pathId))
+    return {"pathId": pathId, "explanation": render_text(info), "steps": info["steps"]}
+
+
+def _stored_analysis(analysis_id: Optional[str]) -> tuple[str, dict[str, list]]:
+    aid = analysis_id or analyses.latest
+    records = analyses.get(aid) if aid else None
+    if records is None:
+        where = f"Analysis '{analysis_id}'" if analysis_id else "No analysis"
+        raise HTTPException(404, f"{where} not found. Run /analyze first.")
+    return aid, records
+
+
+def _explain_batch(req: ExplainBatchRequest):
+    """(analysis id, explanations generator, missing path ids) for a batch."""
+    aid, records = _stored_analysis(req.analysisId)
+    wanted = list(dict.fromkeys(req.pathIds)) or list(records)
+    missing = [pid for pid in wanted if pid not in records]
+
+    def explanations():
+        for pid in wanted:
+            rec = records.get(pid)
+            if rec is None:
+                continue
+            info = explain_steps(expand(rec))
+            info["explanation"] = render_text(info) if req.text else None
+            if not req.steps:
+                info["steps"] = None
+            yield info
+
+    return aid, explanations(), missing
+
+
+@app.post("/explain/batch", response_model=ExplainBatchResponse)
+def explain_batch(req: ExplainBatchRequest):
+    """
+    Explain many paths of one stored analysis (all of them if `pathIds` is
+    empty) in a single response; unknown path ids are listed in `missing`.
+    """
+    aid, explanations, missing = _explain_batch(req)
+    return {"analysisId": aid, "explanations": list(explanations), "missing": missing}
+
+
+@app.post("/explain/stream")
+def explain_stream(
+    req: ExplainBatchRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson or sse"),
+):
+    """
+    Same as /explain/batch, streamed: an `explanation` frame per path and
+    a final `summary` frame, as NDJSON lines or as Server-Sent Events.
+    """
+    aid, explanations, missing = _explain_batch(req)
+
+    def body():
+        count = 0
+        for info in explanations:
+            count += 1
+            data = json.dumps({"type": "explanation", **info})
+            yield f"event: explanation\ndata: {data}\n\n" if format == "sse" else data + "\n"
+        data = json.dumps({"type": "summary", "analysisId": aid, "explained": count, "missing": missing})
+        yield f"event: summary\ndata: {data}\n\n" if format == "sse" else data + "\n"
+
+    media = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media)
+
+
+@app.get("/analyses/{analysisId}/paths/{pathId}", response_model=PathInfo)
+def get_path(analysisId: str, pathId: str):
+    """Return one path record of a stored analysis."""
+    return _stored_path(analysisId, pathId)
 
 
 @app.post("/simulate", response_model=SimulateResponse)
-def simulate(req: SimulateRequest):
-    """Apply mutations, re-analyze, and return before/after comparison."""
-    # Before (baseline)
-    before = engine.analyze(
-        req.analysis.startNodes, req.analysis.targetNode,
-        req.analysis.minDepth, req.analysis.maxDepth, req.analysis.k,
-    )
+async def simulate(req: SimulateRequest):
+    """Apply mutations and return an incremental before/after comparison."""
+    _reject_budget(req.analysis)
+    return await _run_job("simulation", partial(_run_simulation, req))
+
 
-    # Clone and mutate
-    mutated = engine.clone()
-    for m in req.mutations:
-        if m.type == "removeEdge" and m.edgeId:
-            mutated.remove_edge(m.edgeId)
-        elif m.type == "removeNode" and m.nodeId:
-            mutated.remove_node_full(m.nodeId)
-        elif m.type == "addEdge" and m.source and m.target and m.relation:
-            mutated.add_edge(m.source, m.target, m.relation, m.weight or 5)
-
-    after = mutated.analyze(
-        req.analysis.startNodes, req.analysis.targetNode,
-        req.analysis.minDepth, req.analysis.maxDepth, req.analysis.k,
+def _run_simulation(req: SimulateRequest, control: SearchControl) -> dict:
+    before, after = simulator.run(
+        req.mutations, req.analysis.startNodes, req.analysis.targetNode,
+        req.analysis.minDepth, req.analysis.maxDepth, req.analysis.k, control,
     )
 
     # Delta
@@ -135,6 +446,14 @@ def simulate(req: SimulateRequest):
     else:
         reduction = 0.0
 
+    a = req.analysis
+    before_id = analyses.put(_analysis_id(a.startNodes, a.targetNode, a.minDepth, a.maxDepth, a.k), before["paths"])
+    after_id = analysis_id(
+        ds.VERSION, "simulation", [m.model_dump() for m in req.mutations],
+        a.startNodes, a.targetNode, a.minDepth, a.maxDepth, a.k,
+    )
+    analyses.put(after_id, after["paths"], latest=False)
+
     hv_names = {n["name"] for n in ds.NODES if n.get("highValue")}
     before_hvt = len({n for p in before["paths"] for n in p["nodes"] if n in hv_names})
     after_hvt = len({n for p in after["paths"] for n in p["nodes"] if n in hv_names})
@@ -146,6 +465,7 @@ def simulate(req: SimulateRequest):
             shortestHops=before["shortestHops"],
             highValueTargetsReachable=before_hvt,
             pathIds=[p["pathId"] for p in before["paths"]],
+            analysisId=before_id,
         ),
         after=AnalysisSummary(
             totalPaths=after["totalPaths"],
@@ -153,13 +473,93 @@ def simulate(req: SimulateRequest):
             shortestHops=after["shortestHops"],
             highValueTargetsReachable=after_hvt,
             pathIds=[p["pathId"] for p in after["paths"]],
+            analysisId=after_id,
         ),
         delta=DeltaInfo(
             pathReduction=before["totalPaths"] - after["totalPaths"],
             riskReductionPercent=reduction,
             eliminatedPaths=len(eliminated),
         ),
+    ).model_dump()
+
+
+def _run_mitigations(req: MitigationRequest, control: SearchControl) -> dict:
+    a = req.analysis
+    paths, _ = simulator.analysis(
+        a.startNodes, a.targetNode, a.minDepth, a.maxDepth, a.k, a.parallel, control,
     )
+    return engine.rank_mitigations(paths.records(), req.top, req.cutSize)
+
+
+@app.post("/mitigations", response_model=MitigationResponse)
+async def mitigations(req: MitigationRequest):
+    """Rank edge removals by the analysed risk they eliminate."""
+    _reject_budget(req.analysis)
+    return await _run_job("analysis", partial(_run_mitigations, req))
+
+
+@app.post("/chokepoints", response_model=ChokepointResponse)
+async def chokepoints(req: ChokepointRequest):
+    """Nodes / edges on every bounded path to the target, and a minimum edge cut."""
+    return await _run_job("analysis", lambda control: find_chokepoints(
+        engine, req.startNodes, req.targetNode, req.maxDepth, control=control,
+    ))
+
+
+# ── Job endpoints ───────────────────────────────────────────────────────────
+
+@app.post("/jobs/analyze", response_model=JobInfo, response_model_exclude_none=True)
+def submit_analysis(req: AnalysisJobRequest):
+    """Queue an analysis; poll `/jobs/{id}` for progress and the result."""
+    job = jobs.submit("analysis", partial(_run_analysis, req), req.timeLimit, req.maxPaths)
+    return job.describe(with_result=False)
+
+
+@app.post("/jobs/simulate", response_model=JobInfo, response_model_exclude_none=True)
+def submit_simulation(req: SimulationJobRequest):
+    """Queue a what-if simulation; poll `/jobs/{id}` for progress and the result."""
+    _reject_budget(req.analysis)
+    job = jobs.submit("simulation", partial(_run_simulation, req), req.timeLimit, req.maxPaths)
+    return job.describe(with_result=False)
+
+
+@app.get("/jobs", response_model=list[JobInfo], response_model_exclude_none=True)
+def list_jobs():
+    """Return recent jobs without their results."""
+    return [j.describe(with_result=False) for j in jobs.list()]
+
+
+def _job_or_404(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(404, f"Job '{job_id}' not found.")
+    return job
+
+
+@app.get("/jobs/{job_id}", response_model=JobInfo, response_model_exclude_none=True)
+def get_job(job_id: str):
+    """Return a job's status, progress and (once done) result."""
+    return _job_or_404(job_id).describe()
+
+
+@app.delete("/jobs/{job_id}", response_model=JobInfo, response_model_exclude_none=True)
+def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    return jobs.cancel(_job_or_404(job_id).id).describe(with_result=False)
+
+
+@app.get("/jobs/{job_id}/events")
+def job_events(job_id: str, interval: float = Query(0.5, gt=0, le=10)):
+    """Server-Sent Events: a `progress` event every `interval` seconds, then `end`."""
+    job = _job_or_404(job_id)
+
+    def body():
+        while not job.done:
+            yield f"event: progress\ndata: {json.dumps(job.describe(with_result=False))}\n\n"
+            time.sleep(interval)
+        yield f"event: end\ndata: {json.dumps(job.describe(with_result=False))}\n\n"
+
+    return StreamingResponse(body(), media_type="text/event-stream")
 
 
 @app.get("/scenarios")
@@ -173,43 +573,171 @@ def get_scenarios():
 @app.post("/upload-dataset")
 async def upload_dataset(file: UploadFile = File(...)):
     """
-    Upload a JSON dataset to replace the active graph.
-    Validates the JSON schema, swaps the dataset, and rebuilds the engine.
+    Upload a JSON dataset, or a SharpHound collection zip, to replace the
+    active graph.  The upload is spooled to disk, then parsed, validated
+    and materialised record by record off the event loop (progress at
+    /upload-progress), and the engine is rebuilt from the result.
     """
-    global engine, _last_analysis
+    total = file.size or 0
+    _upload_progress.update(state="parsing", bytesRead=0, totalBytes=total, nodes=0, edges=0)
 
-    # Read and parse
+    def progress(nbytes: int, nodes: int, edges: int):
+        _upload_progress.update(bytesRead=nbytes, nodes=nodes, edges=edges)
+
+    # Parse + validate
     try:
-        content = await file.read()
-        raw = json.loads(content)
-    except json.JSONDecodeError as exc:
+        head = file.file.read(4)
+        file.file.seek(0)
+        if sharphound.is_collection_zip(head):
+            _upload_progress["state"] = "importing"
+            data, errors = await run_in_threadpool(_import_collection, file.file)
+        else:
+            data, errors = await run_in_threadpool(ds.parse_stream, file.file, progress)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        _upload_progress["state"] = "failed"
         raise HTTPException(400, f"Invalid JSON: {exc}")
     except Exception as exc:
+        _upload_progress["state"] = "failed"
         raise HTTPException(400, f"Could not read file: {exc}")
-
-    # Validate
-    errors = ds.validate_dataset(raw)
     if errors:
+        _upload_progress["state"] = "failed"
         raise HTTPException(422, detail={"validationErrors": errors})
 
     # Swap
-    summary = ds.reload_from_json(raw)
-    engine = _rebuild_engine()
-    _last_analysis = {}
+    _upload_progress["state"] = "building"
+    summary = await run_in_threadpool(_switch_dataset, data)
+    _upload_progress["state"] = "done"
 
     return {"status": "ok", "message": "Dataset loaded successfully", **summary}
 
 
+def _switch_dataset(data: dict) -> dict:
+    """Activate materialised `data`, rebuild the engine and snapshot it."""
+    global engine, simulator
+
+    with _dataset_lock:
+        old_version = ds.VERSION
+        summary = ds.activate(data)
+        engine = _rebuild_engine()
+        if ds.VERSION != old_version:
+            results.clear()
+        simulator = Simulator(engine, results)
+        _save_snapshot(data)
+    return summary
+
+
+def _save_snapshot(data: dict) -> None:
+    global _snapshot_base
+
+    if snapshots is not None:
+        try:
+            snapshots.save(data, engine.core)
+            _snapshot_base = data["VERSION"]
+        except (OSError, SnapshotError):
+            _snapshot_base = None   # snapshots only speed up the next start; never fail a swap
+
+
+def _journal_patch(ops: list[dict]) -> None:
+    """Record patch `ops` against the stored snapshot they build on."""
+    if snapshots is not None and _snapshot_base is not None:
+        try:
+            snapshots.append_patch(_snapshot_base, ops)
+        except OSError:
+            pass
+
+
+def _import_collection(fp) -> tuple[dict | None, list[str]]:
+    """Copy an uploaded zip to a real file (workers reopen it) and import it."""
+    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
+        shutil.copyfileobj(fp, tmp)
+    try:
+        return sharphound.load_collection(tmp.name)
+    finally:
+        os.remove(tmp.name)
+
+
+@app.get("/upload-progress")
+def upload_progress():
+    """Return the state of the current / last dataset upload."""
+    return _upload_progress
+
+
+@app.post("/dataset/patch", response_model=PatchResponse)
+def patch_dataset(req: DatasetPatch):
+    """
+    Apply node / edge add, update and remove ops to the live dataset
+    without a re-upload.  The engine takes the ops as an overlay over the
+    compiled graph and cached analyses the ops cannot affect stay cached.
+    """
+    global engine, simulator
+
+    _require_dataset()
+    with _dataset_lock:
+        if req.baseRevision is not None and req.baseRevision != ds.REVISION:
+            raise HTTPException(409, f"Dataset is at revision {ds.REVISION}, not {req.baseRevision}.")
+        ops = [op.model_dump(exclude_none=True) for op in req.ops]
+        data, changes, errors = ds.patch(ops)
+        if errors:
+            raise HTTPException(422, detail={"validationErrors": errors})
+
+        old_version, base = ds.VERSION, engine
+        # Build first: if that fails, the dataset and engine stay as they were
+        patched = engine.patched(data["NODES"], data["EDGES"], changes)
+        ds.activate(data)
+        compacted = not patched.core.is_overlay
+        engine = patched
+        simulator = Simulator(engine, results)
+        if compacted:
+            # Node / edge indices changed, so cached search results are void
+            kept, dropped = 0, results.migrate(old_version, ds.VERSION, lambda k, v: False)[1]
+            _save_snapshot(data)
+        else:
+            kept, dropped = simulator.carry_over_cache(old_version, changes, base)
+            _journal_patch(ops)
+
+    return PatchResponse(
+        revision=ds.REVISION, version=ds.VERSION, applied=len(ops),
+        nodes=len(ds.NODES), edges=len(ds.EDGES), compacted=compacted,
+        cachedAnalysesKept=kept, cachedAnalysesDropped=dropped,
+    )
+
+
 @app.post("/reset-dataset")
 def reset_dataset():
     """Reset to the bundled default dataset."""
-    global engine, _last_analysis
+    summary = _switch_dataset(ds.load_default())
+    return {"status": "ok", "message": "Reset to default dataset", **summary}
 
-    summary = ds.reset_to_default()
-    engine = _rebuild_engine()
-    _last_analysis = {}
 
-    return {"status": "ok", "message": "Reset to default dataset", **summary}
+@app.get("/snapshots")
+def list_snapshots():
+    """Return stored dataset snapshots, most recently used first."""
+    return snapshots.list() if snapshots is not None else []
+
+
+@app.post("/snapshots/{version}/activate")
+def activate_snapshot(version: str):
+    """Switch to a stored dataset snapshot by its version (memory-mapped, no parsing)."""
+    if snapshots is None:
+        raise HTTPException(404, "Snapshots are disabled (set APF_SNAPSHOT_DIR).")
+    try:
+        data = snapshots.get(version)
+    except SnapshotError as exc:
+        raise HTTPException(422, str(exc))
+    if data is None:
+        raise HTTPException(404, f"Snapshot '{version}' not found.")
+    summary = _switch_dataset(data)
+    return {"status": "ok", "message": f"Activated snapshot {version}", **summary}
+
+
+@app.get("/cache-stats")
+def cache_stats():
+    """
+    Return analysis result cache counters and size bounds, plus
+    reachability tables, /graph views and the stored analyses.
+    """
+    return {**results.stats(), "reachability": engine.reach_stats(),
+            "graphViews": graph_views.stats(), "analyses": analyses.stats()}
 
 
 @app.get("/dataset-info")
@@ -221,4 +749,6 @@ def dataset_info():
         "subnets": len(ds.SUBNETS),
         "scenarios": len(ds.SCENARIO_PRESETS),
         "startOptions": ds.START_OPTIONS,
+        "version": ds.VERSION,
+        "revision": ds.REVISION,
     }
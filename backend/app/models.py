@@ -26,6 +26,33 @@ class GraphEdge(BaseModel):
 class GraphResponse(BaseModel):
     nodes: list[GraphNode]
     edges: list[GraphEdge]
+    totalNodes: int = 0
+    totalEdges: int = 0
+    offset: int = 0
+    nextOffset: Optional[int] = None   # set while more pages remain (pages go by node)
+
+
+class GraphGroup(BaseModel):
+    id: str                  # subnet id or node type ("" for none)
+    label: str
+    nodes: int
+    highValue: int
+    types: dict[str, int]    # node type -> members
+
+
+class GraphGroupLink(BaseModel):
+    source: str              # group ids
+    target: str
+    edges: int
+    relations: dict[str, int]
+
+
+class GraphOverviewResponse(BaseModel):
+    groupBy: str             # subnet | type
+    groups: list[GraphGroup]
+    edges: list[GraphGroupLink]
+    totalNodes: int
+    totalEdges: int
 
 
 # ── Analysis ────────────────────────────────────────────────────────────────
@@ -35,6 +62,10 @@ class AnalysisRequest(BaseModel):
     minDepth: int = 4
     maxDepth: int = 7
     k: int = 50
+    parallel: bool = False   # fan per-start searches out to a process pool
+    compact: bool = False    # compact wire format: shared node / edge tables, paths as indices
+    timeBudget: Optional[float] = None     # seconds (/analyze, /analyze/stream); then the best paths so far, flagged partial
+    expansionBudget: Optional[int] = None  # node expansions, likewise
 
 
 class PathEdgeInfo(BaseModel):
@@ -68,6 +99,12 @@ class CriticalEdge(BaseModel):
     percentOfPaths: float
 
 
+class SearchStats(BaseModel):
+    nodesExpanded: int
+    branchesPruned: int   # subtrees cut by the risk bound
+    pathsScored: int      # complete paths evaluated
+
+
 class AnalysisResponse(BaseModel):
     totalPaths: int
     paths: list[PathInfo]
@@ -75,6 +112,68 @@ class AnalysisResponse(BaseModel):
     shortestHops: int
     criticalEdges: list[CriticalEdge]
     globalRisk: float
+    analysisId: Optional[str] = None   # addresses these paths in /explain
+    partial: bool = False              # a budget ran out: best paths found so far
+    stopReason: Optional[str] = None   # timeBudget | expansionBudget
+    searchStats: Optional[SearchStats] = None
+
+
+class MultiTargetRequest(BaseModel):
+    startNodes: list[str]
+    targetNodes: list[str] = []
+    allHighValue: bool = False   # also target every highValue node
+    minDepth: int = 4
+    maxDepth: int = 7
+    k: int = 50
+
+
+class TargetAnalysis(AnalysisResponse):
+    targetNode: str
+
+
+class MultiTargetResponse(BaseModel):
+    targets: list[TargetAnalysis]    # riskiest target first
+    targetsReachable: int
+    totalPaths: int
+    globalRisk: float
+
+
+# ── Explanations ────────────────────────────────────────────────────────────
+class ExplainBatchRequest(BaseModel):
+    analysisId: Optional[str] = None   # default: the latest analysis
+    pathIds: list[str] = []            # empty: every path of the analysis
+    text: bool = True                  # include the rendered text
+    steps: bool = True                 # include the structured steps
+
+
+class ExplanationStep(BaseModel):
+    step: int
+    edgeId: str
+    source: str
+    target: str
+    relation: str
+    weight: int
+    cumulativeWeight: int
+    description: str
+    privilegeGained: str
+
+
+class PathExplanation(BaseModel):
+    pathId: str
+    risk: float
+    normalizedScore: Optional[float] = None
+    impactEstimation: str
+    hops: int
+    sumWeights: int
+    throughCritical: bool
+    steps: Optional[list[ExplanationStep]] = None
+    explanation: Optional[str] = None
+
+
+class ExplainBatchResponse(BaseModel):
+    analysisId: str
+    explanations: list[PathExplanation]   # in request order
+    missing: list[str]                    # requested path ids not in the analysis
 
 
 # ── Simulation ──────────────────────────────────────────────────────────────
@@ -100,6 +199,7 @@ class AnalysisSummary(BaseModel):
     shortestHops: int
     highValueTargetsReachable: int
     pathIds: list[str]
+    analysisId: Optional[str] = None   # for /explain on these paths
 
 
 class DeltaInfo(BaseModel):
@@ -114,9 +214,168 @@ class SimulateResponse(BaseModel):
     delta: DeltaInfo
 
 
+# ── Jobs ────────────────────────────────────────────────────────────────────
+class AnalysisJobRequest(AnalysisRequest):
+    timeLimit: Optional[float] = None   # seconds before the job is stopped
+    maxPaths: Optional[int] = None      # complete paths evaluated before it is stopped
+
+
+class SimulationJobRequest(SimulateRequest):
+    timeLimit: Optional[float] = None
+    maxPaths: Optional[int] = None
+
+
+class JobProgress(BaseModel):
+    nodesExpanded: int
+    pathsFound: int
+
+
+class JobInfo(BaseModel):
+    jobId: str
+    kind: str                # "analysis" | "simulation"
+    status: str              # queued | running | done | failed | cancelled | timedOut | overBudget
+    progress: JobProgress
+    created: float
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[dict] = None
+
+
+# ── Mitigation ranking ──────────────────────────────────────────────────────
+class MitigationRequest(BaseModel):
+    analysis: AnalysisRequest
+    top: Optional[int] = None   # only score the N most-traversed edges
+    cutSize: int = 0            # greedy best-m edge cut (0 = skip)
+
+
+class EdgeMitigation(BaseModel):
+    edgeId: str
+    source: str
+    relation: str
+    target: str
+    traversalCount: int
+    eliminatedPaths: int
+    riskReduction: float
+    riskReductionPercent: float
+
+
+class CutStep(BaseModel):
+    edgeId: str
+    eliminatedPaths: int
+    riskReduction: float
+    cumulativeRiskReduction: float
+    cumulativeReductionPercent: float
+    remainingPaths: int
+
+
+class MitigationResponse(BaseModel):
+    totalPaths: int
+    globalRisk: float
+    candidates: list[EdgeMitigation]
+    greedyCut: list[CutStep]
+
+
+# ── Chokepoints ─────────────────────────────────────────────────────────────
+class ChokepointRequest(BaseModel):
+    startNodes: list[str]
+    targetNode: str = "DC01"
+    maxDepth: int = 7
+
+
+class ChokepointNode(BaseModel):
+    name: str
+    highValue: bool
+
+
+class ChokepointEdge(BaseModel):
+    edgeId: str
+    source: str
+    relation: str
+    target: str
+    parallelEdgeIds: list[str]   # every edge of the node pair (all must go to cut it)
+
+
+class ChokepointResponse(BaseModel):
+    reachable: bool
+    relevantNodes: int
+    nodes: list[ChokepointNode]      # on every path, start side first
+    edges: list[ChokepointEdge]
+    edgeDisjointPaths: int
+    cutComplete: bool                # false: flow limit hit, no minCut
+    minCut: list[ChokepointEdge]
+
+
+# ── Aggregate path statistics ───────────────────────────────────────────────
+class AggregateRequest(BaseModel):
+    startNodes: list[str]
+    targetNode: str = "DC01"
+    minDepth: int = 4
+    maxDepth: int = 7
+    topEdges: int = 20
+
+
+class PathLengthBucket(BaseModel):
+    hops: int
+    paths: int
+    risk: float
+
+
+class EdgeIncidence(BaseModel):
+    edgeId: str
+    source: str
+    relation: str
+    target: str
+    paths: int
+    percentOfPaths: float
+
+
+class AggregateResponse(BaseModel):
+    totalPaths: int
+    globalRisk: float
+    byLength: list[PathLengthBucket]
+    exact: bool          # false: walk counts (upper bounds), see aggregate.py
+    method: str          # dp | enumeration | walks | none
+    relevantNodes: int
+    edgeIncidence: list[EdgeIncidence]
+
+
+# ── Dataset patches ─────────────────────────────────────────────────────────
+class PatchOp(BaseModel):
+    op: str            # addNode | updateNode | removeNode | addEdge | updateEdge | removeEdge
+    name: Optional[str] = None       # node name (node ops)
+    id: Optional[str] = None         # edge id (edge ops) / node id (addNode, updateNode)
+    type: Optional[str] = None
+    privilegeLevel: Optional[str] = None
+    highValue: Optional[bool] = None
+    subnet: Optional[str] = None
+    source: Optional[str] = None
+    target: Optional[str] = None
+    relation: Optional[str] = None
+    weight: Optional[int] = None
+
+
+class DatasetPatch(BaseModel):
+    ops: list[PatchOp]
+    baseRevision: Optional[int] = None   # reject (409) unless the live revision matches
+
+
+class PatchResponse(BaseModel):
+    revision: int
+    version: str
+    applied: int
+    nodes: int
+    edges: int
+    compacted: bool                      # graph recompiled instead of overlaid
+    cachedAnalysesKept: int
+    cachedAnalysesDropped: int
+
+
 class NeighborRequest(BaseModel):
-    nodeName: str
+    nodeName: Optional[str] = None
+    nodeNames: list[str] = []        # batch: the union of several neighbourhoods
     radius: int = 2
+    direction: str = "both"          # in | out | both
 
 
 class NeighborResponse(BaseModel):
@@ -0,0 +1,147 @@
+"""
+Process-pool path search — fans independent top-k searches out to worker
+processes for multi-core `/analyze` calls.
+
+The compiled graph's search columns are packed once into a file on a
+shared-memory filesystem (or, for a graph loaded from a snapshot, the
+snapshot file itself) and every worker maps it read-only, so tasks only
+carry a path and a few ints instead of a pickled copy of the graph.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from .compiled import CompiledGraph
+from .graph_engine import distances_to, search_top_k
+
+# Pool size used by the opt-in parallel mode
+PARALLEL_WORKERS = os.cpu_count() or 1
+
+_SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+_pool: ProcessPoolExecutor | None = None
+_published: weakref.WeakKeyDictionary[CompiledGraph, SharedGraph] = weakref.WeakKeyDictionary()
+
+
+class SharedGraph:
+    """A compiled graph's search columns published in a mappable file."""
+
+    def __init__(self, core: CompiledGraph):
+        source = getattr(core, "source", None)
+        if source is not None:
+            # Mapped from a snapshot: workers map that file directly
+            self.path, self.layout = source
+            self.scalars = core.scalars()
+            self._finalizer = lambda: None
+            return
+        self.layout, size = core.column_layout()
+        self.scalars = core.scalars()
+        fd, self.path = tempfile.mkstemp(prefix="apf-graph-", suffix=".bin", dir=_SHM_DIR)
+        with os.fdopen(fd, "wb") as f:
+            buf = bytearray(size)
+            core.pack_into(buf, self.layout)
+            f.write(buf)
+        self._finalizer = weakref.finalize(self, _remove, self.path)
+
+    def close(self):
+        self._finalizer()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass   # still mapped elsewhere (Windows) or already gone
+
+
+def publish(core: CompiledGraph) -> SharedGraph:
+    """Return the shared copy of `core`, creating it on first use."""
+    shared = _published.get(core)
+    if shared is None:
+        shared = _published[core] = SharedGraph(core)
+    return shared
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS)
+    return _pool
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+# ── worker side ─────────────────────────────────────────────────────────────
+# Workers keep the most recently attached graph (and its per-target distance
+# tables) mapped between tasks.
+_attached: dict = {}
+
+
+def _attach(path: str, layout, scalars) -> tuple[CompiledGraph, dict]:
+    if _attached.get("path") != path:
+        _attached.clear()
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _attached.update(path=path, mmap=mm, dist={},
+                         core=CompiledGraph.from_buffer(mm, layout, scalars))
+    return _attached["core"], _attached["dist"]
+
+
+def _search_task(
+    path: str, layout, scalars, s: int, t: int, min_depth: int, max_depth: int,
+    k: int, crit_edge: int, first_hop: int,
+) -> list[tuple[float, list[int], list[int]]]:
+    core, dist_cache = _attach(path, layout, scalars)
+    key = (t, max_depth)
+    if key not in dist_cache:
+        dist_cache.clear()
+        dist_cache[key] = distances_to(core, t, max_depth)
+    return search_top_k(core, s, t, min_depth, max_depth, k, dist_cache[key], crit_edge, first_hop)
+
+
+# ── parent side ─────────────────────────────────────────────────────────────
+def parallel_top_k(
+    core: CompiledGraph, starts: list[int], t: int, min_depth: int, max_depth: int,
+    k: int, dist: list[int], crit_edge: int,
+) -> dict[int, list[tuple[float, list[int], list[int]]]]:
+    """
+    Run `search_top_k` for every start node on the process pool and return
+    {start: results}, identical to running them one by one.
+
+    With fewer starts than workers, each start is further split into one
+    task per feasible first hop.  Per-start candidates are merged with the
+    same (risk desc, node ids asc) order the serial search uses, so the
+    result does not depend on how the work was partitioned.
+    """
+    shared = publish(core)
+    pool = get_pool()
+    split = len(starts) < PARALLEL_WORKERS
+
+    futures = []
+    for s in starts:
+        hops = [-1]
+        if split and s != t:
+            hops = [v for v, _, _ in core.succs(s) if 1 + dist[v] <= max_depth]
+        for first_hop in hops:
+            futures.append((s, pool.submit(
+                _search_task, shared.path, shared.layout, shared.scalars,
+                s, t, min_depth, max_depth, k, crit_edge, first_hop,
+            )))
+
+    merged: dict[int, list] = {s: [] for s in starts}
+    for s, fut in futures:
+        merged[s].extend(fut.result())
+    for s, cands in merged.items():
+        cands.sort(key=lambda c: (-c[0], c[1]))
+        del cands[k:]
+    return merged
@@ -0,0 +1,236 @@
+"""
+Compact analysis results — the ranked paths of one analysis as flat
+integer columns instead of one nested dict per path.
+
+A `PathSet` holds, in search order (start by start, best first), each
+path's raw risk, node ids and edge indices in `array` columns, plus the
+permutation that ranks them as `/analyze` does.  That takes well over an
+order of magnitude less memory than the path dicts, and everything the
+API returns is derived from it on demand:
+
+- `analysis()`: the `/analyze` body with full path dicts;
+- `wire()`: the compact wire format (shared node / edge tables, paths
+  as edge-table indices, `top5` as path indices), built without any
+  per-path dict;
+- `found()`: the per-start (raw, node ids, edge ids) lists the incremental
+  simulation starts from.
+
+A set can also be filled start by start (`add`), as `/analyze/stream`
+does; the ranking is then redone when next needed.
+
+Path dicts are built only for the paths actually returned, and only in
+the full format.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+
+from .compiled import CompiledGraph, OverlayGraph
+from .graph_engine import GraphEngine
+
+# Paths repeated in `top5`
+TOP_PATHS = 5
+
+# Critical (most traversed) edges reported per analysis
+TOP_CRITICAL_EDGES = 10
+
+
+class PathSet:
+    """Ranked paths of one analysis over `core`, as flat columns."""
+
+    __slots__ = ("core", "crit_edge", "chains", "raw", "node_ptr", "nodes", "edge_ptr", "edges", "_order")
+
+    def __init__(
+        self, core: CompiledGraph | OverlayGraph, crit_edge: int,
+        chains: dict[int, str] | None = None, found: dict[int, list] | None = None,
+    ):
+        self.core = core
+        self.crit_edge = crit_edge
+        # (start id, chain letter, first path, end) per start, search order
+        self.chains: list[tuple[int, str, int, int]] = []
+        self.raw = array("d")
+        self.node_ptr = array("i", [0])
+        self.nodes = array("i")
+        self.edge_ptr = array("i", [0])
+        self.edges = array("i")
+        self._order: array | None = None
+        for s, chain in (chains or {}).items():
+            self.add(s, chain, (found or {}).get(s, ()))
+
+    def add(self, s: int, chain: str, paths) -> None:
+        """Append start `s`'s (raw, node ids, edge ids) search results."""
+        lo = len(self.raw)
+        for raw, path, hop_edges in paths:
+            self.raw.append(raw)
+            self.nodes.extend(path)
+            self.node_ptr.append(len(self.nodes))
+            self.edges.extend(hop_edges)
+            self.edge_ptr.append(len(self.edges))
+        self.chains.append((s, chain, lo, len(self.raw)))
+        self._order = None
+
+    @property
+    def order(self) -> array:
+        """Path indices, highest risk first."""
+        if self._order is None:
+            # Stable, so equal risks keep search order (as `find_paths` lists them)
+            risks = [round(r, 2) for r in self.raw]
+            self._order = array("i", sorted(range(len(risks)), key=risks.__getitem__, reverse=True))
+        return self._order
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the columns (the graph is shared, not counted)."""
+        cols = (self.raw, self.node_ptr, self.nodes, self.edge_ptr, self.edges, self.order)
+        return sum(a.itemsize * len(a) for a in cols) + 100 * len(self.chains)
+
+    # ── per path (i indexes search order) ──────────────────────────────────
+    def path_id(self, i: int) -> str:
+        c = bisect_right(self.chains, i, key=lambda ch: ch[2]) - 1
+        _, chain, lo, _ = self.chains[c]
+        return f"{chain}{i - lo + 1}"
+
+    def path_nodes(self, i: int) -> list[int]:
+        return self.nodes[self.node_ptr[i]:self.node_ptr[i + 1]].tolist()
+
+    def path_edges(self, i: int) -> list[int]:
+        return self.edges[self.edge_ptr[i]:self.edge_ptr[i + 1]].tolist()
+
+    def record(self, i: int) -> dict:
+        """The API-facing dict for path `i`."""
+        core = self.core
+        hop_edges = self.path_edges(i)
+        edges_info = [core.edge_record(j) for j in hop_edges]
+        risk_data = GraphEngine._grade(self.raw[i])
+        critical_edges_in_path = [core.edge_ids[j] for j in hop_edges if j == self.crit_edge]
+        return {
+            "pathId": self.path_id(i),
+            "nodes": [core.names[x] for x in self.path_nodes(i)],
+            "edges": edges_info,
+            "hops": len(hop_edges),
+            "edgeTypes": [e["relation"] for e in edges_info],
+            "sumWeights": sum(e["weight"] for e in edges_info),
+            "risk": risk_data["risk"],
+            "normalizedScore": risk_data["normalizedScore"],
+            "impactEstimation": risk_data["impactEstimation"],
+            "throughCritical": bool(critical_edges_in_path),
+            "criticalEdgesInPath": critical_edges_in_path,
+        }
+
+    # ── whole set ───────────────────────────────────────────────────────────
+    def records(self) -> list[dict]:
+        """Path dicts, highest risk first (as `GraphEngine.find_paths`)."""
+        return [self.record(i) for i in self.order]
+
+    def found(self) -> dict[int, list]:
+        """{start id: [(raw, node ids, edge ids)]}, as the search returned them."""
+        return {
+            s: [(self.raw[i], self.path_nodes(i), self.path_edges(i)) for i in range(lo, hi)]
+            for s, _, lo, hi in self.chains
+        }
+
+    def touches(self, node_names: set[str], edge_ids: set[str]) -> bool:
+        """True if any path visits one of `node_names` or uses one of `edge_ids`."""
+        core = self.core
+        if node_names and any(core.names[x] in node_names for x in set(self.nodes)):
+            return True
+        return bool(edge_ids) and any(core.edge_ids[j] in edge_ids for j in set(self.edges))
+
+    def summary(self) -> dict:
+        """Aggregates of the `/analyze` body (everything but the path lists)."""
+        core = self.core
+        risk = 0.0
+        shortest = None
+        counts: dict[int, int] = {}
+        for i in self.order:
+            risk += round(self.raw[i], 2)
+            lo, hi = self.edge_ptr[i], self.edge_ptr[i + 1]
+            if shortest is None or hi - lo < shortest:
+                shortest = hi - lo
+            for j in self.edges[lo:hi]:
+                counts[j] = counts.get(j, 0) + 1
+        total = len(self.order)
+        edge_ids = core.edge_ids
+        ranked = sorted(counts.items(), key=lambda kv: (-kv[1], edge_ids[kv[0]]))[:TOP_CRITICAL_EDGES]
+        critical = []
+        for j, n in ranked:
+            rec = core.edge_record(j)
+            critical.append({
+                "edgeId": rec["edgeId"], "source": rec["source"],
+                "relation": rec["relation"], "target": rec["target"],
+                "traversalCount": n, "percentOfPaths": round(n / total * 100, 1),
+            })
+        return {
+            "totalPaths": total,
+            "shortestHops": shortest or 0,
+            "criticalEdges": critical,
+            "globalRisk": round(risk, 2),
+        }
+
+    def analysis(self) -> dict:
+        """The full `/analyze` body (see `GraphEngine.summarise`)."""
+        paths = self.records()
+        summary = self.summary()
+        return {
+            "totalPaths": summary["totalPaths"],
+            "paths": paths,
+            "top5": paths[:TOP_PATHS],
+            "shortestHops": summary["shortestHops"],
+            "criticalEdges": summary["criticalEdges"],
+            "globalRisk": summary["globalRisk"],
+        }
+
+    def wire(self) -> dict:
+        """
+        The `/analyze` body in the compact wire format: `nodeTable` lists
+        node names and `edgeTable` [edgeId, source, target, relation,
+        weight] rows (endpoints as `nodeTable` indices), each entry used
+        by some path; a path is [pathId, start node, [edgeTable indices],
+        risk, normalizedScore, impactEstimation]; `top5` holds `paths`
+        indices and `criticalEdge` the `edgeTable` index of the critical
+        edge (if any path uses it).
+        """
+        core = self.core
+        node_at: dict[int, int] = {}
+        edge_at: dict[int, int] = {}
+        node_table: list[str] = []
+        edge_table: list[list] = []
+
+        def node(x: int) -> int:
+            k = node_at.get(x)
+            if k is None:
+                k = node_at[x] = len(node_table)
+                node_table.append(core.names[x])
+            return k
+
+        def edge(j: int) -> int:
+            k = edge_at.get(j)
+            if k is None:
+                rec = core.edge_record(j)
+                k = edge_at[j] = len(edge_table)
+                edge_table.append([rec["edgeId"], node(core.edge_src[j]), node(core.edge_dst[j]),
+                                   rec["relation"], rec["weight"]])
+            return k
+
+        grade = GraphEngine._grade
+        raw, nodes, node_ptr, edges, edge_ptr = self.raw, self.nodes, self.node_ptr, self.edges, self.edge_ptr
+        paths = []
+        for i in self.order:
+            g = grade(raw[i])
+            hops = [edge(j) for j in edges[edge_ptr[i]:edge_ptr[i + 1]]]
+            paths.append([self.path_id(i), node(nodes[node_ptr[i]]), hops,
+                          g["risk"], g["normalizedScore"], g["impactEstimation"]])
+        return {
+            "format": "compact",
+            **self.summary(),
+            "nodeTable": node_table,
+            "edgeTable": edge_table,
+            "paths": paths,
+            "top5": list(range(min(TOP_PATHS, len(paths)))),
+            "criticalEdge": edge_at.get(self.crit_edge),
+        }
@@ -0,0 +1,159 @@
+"""
+Reachability index — per-target hop-distance tables that let the search
+drop start nodes (and prune branches) that cannot reach the target within
+the hop budget, without a fresh reverse BFS on every request.
+
+A table holds every node's shortest hop count to one target (or
+`UNREACHABLE`); it is computed once with an unbounded reverse BFS and
+serves every `max_depth`.  Tables are kept current as the engine mutates
+instead of being rebuilt:
+
+- an added edge u -> v can only shorten distances; they are repaired by a
+  reverse BFS from u over the nodes that actually improve;
+- a removed edge u -> v only matters if it was u's sole shortest way on
+  (the pair is not still joined by a parallel edge and no other successor
+  of u is as close); only then is the table dropped;
+- a removed node drops the tables of targets it can reach.
+
+Dropped tables are rebuilt on next use.  Tables are never written once
+stored, so copies of an index (engine clones) share them safely.
+"""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import OrderedDict
+
+# Distance tables kept per engine (least recently used are dropped)
+REACH_TABLES = 16
+
+# Distance of nodes that cannot reach the target at all
+UNREACHABLE = 1 << 30
+
+
+def full_distances(core, t: int) -> array:
+    """Unbounded reverse BFS: hop distance of every node to `t`."""
+    return nearest_distances(core, [t])
+
+
+def nearest_distances(core, targets: list[int]) -> array:
+    """Hop distance of every node to the nearest of `targets`."""
+    preds = core.preds
+    blocked = core.blocked()
+    dist = array("i", [UNREACHABLE]) * core.num_nodes
+    frontier = []
+    for t in targets:
+        if dist[t]:
+            dist[t] = 0
+            frontier.append(t)
+    d = 0
+    while frontier:
+        d += 1
+        nxt = []
+        for v in frontier:
+            for u in preds(v):
+                if dist[u] > d and not blocked[u]:
+                    dist[u] = d
+                    nxt.append(u)
+        frontier = nxt
+    return dist
+
+
+class ReachIndex:
+    """Distance-to-target tables for one engine's graph."""
+
+    def __init__(self, max_tables: int = REACH_TABLES):
+        self.max_tables = max_tables
+        self._tables: OrderedDict[int, array] = OrderedDict()
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.repairs = 0
+        self.drops = 0
+
+    def copy(self) -> ReachIndex:
+        idx = ReachIndex(self.max_tables)
+        with self._lock:
+            idx._tables = OrderedDict(self._tables)
+        return idx
+
+    def peek(self, core, t: int) -> array | None:
+        """The table for target `t` if one is held, else None."""
+        with self._lock:
+            dist = self._tables.get(t)
+            if dist is None:
+                return None
+            self._tables.move_to_end(t)
+        if len(dist) < core.num_nodes:
+            # Nodes added since the table was built cannot reach `t` yet
+            dist = dist + array("i", [UNREACHABLE]) * (core.num_nodes - len(dist))
+            self._store(t, dist)
+        return dist
+
+    def distances(self, core, t: int) -> array:
+        """Table for target `t`, built on first use."""
+        dist = self.peek(core, t)
+        if dist is None:
+            dist = full_distances(core, t)
+            self.builds += 1
+            self._store(t, dist)
+        return dist
+
+    def _store(self, t: int, dist: array) -> None:
+        with self._lock:
+            self._tables[t] = dist
+            self._tables.move_to_end(t)
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+
+    def _held(self) -> list[int]:
+        with self._lock:
+            return list(self._tables)
+
+    def _drop(self, t: int) -> None:
+        with self._lock:
+            if self._tables.pop(t, None) is not None:
+                self.drops += 1
+
+    # ── maintenance (call after the core has been mutated) ──────────────────
+    def edge_added(self, core, u: int, v: int) -> None:
+        for t in self._held():
+            dist = self.peek(core, t)
+            if dist is None or dist[v] + 1 >= dist[u]:
+                continue
+            dist = array("i", dist)
+            dist[u] = dist[v] + 1
+            blocked = core.blocked()
+            frontier = [u]
+            while frontier:
+                nxt = []
+                for x in frontier:
+                    d = dist[x] + 1
+                    for p in core.preds(x):
+                        if dist[p] > d and not blocked[p]:
+                            dist[p] = d
+                            nxt.append(p)
+                frontier = nxt
+            self.repairs += 1
+            self._store(t, dist)
+
+    def edge_removed(self, core, u: int, v: int) -> None:
+        if core.edge_between(u, v) >= 0:
+            return   # a parallel edge still joins the pair
+        for t in self._held():
+            dist = self.peek(core, t)
+            if dist is None or dist[u] != dist[v] + 1:
+                continue
+            if not any(dist[w] == dist[v] for w, _, _ in core.succs(u)):
+                self._drop(t)
+
+    def node_removed(self, core, x: int) -> None:
+        for t in self._held():
+            dist = self.peek(core, t)
+            if dist is not None and dist[x] < UNREACHABLE:
+                self._drop(t)
+
+    def stats(self) -> dict:
+        with self._lock:
+            held = len(self._tables)
+        return {"tables": held, "builds": self.builds, "repairs": self.repairs, "drops": self.drops}
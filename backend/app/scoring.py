@@ -0,0 +1,109 @@
+"""
+Batch path scoring — raw risks of many known paths in one NumPy pass.
+
+The search scores a path incrementally while it extends it.  Paths that
+come from elsewhere (baseline paths re-checked against a mutated graph,
+exhaustively enumerated candidates) are scored here instead of with one
+`path_raw_risk` call each.  A batch is laid out as padded integer
+matrices of node ids and edge indices; privilege weights, high-value
+flags and edge weights are gathered from per-graph columns one path
+position at a time, so each sum is evaluated in path order exactly as
+the search does it and the results are bit-identical to `path_raw_risk`.
+
+Only raw risks come out.  Rounding them into risk / normalizedScore /
+impactEstimation stays with `GraphEngine._grade`, applied to the paths
+that are actually returned (NumPy rounds some halves differently).
+"""
+
+from __future__ import annotations
+
+import weakref
+from itertools import chain
+from math import sqrt
+
+import numpy as np
+
+from .compiled import CompiledGraph, OverlayGraph
+from .graph_engine import CRITICAL_EDGE_BONUS, HV_MULTIPLIER
+
+# Padded (priv, hv, edge weight) columns per compiled graph, which never changes
+_COLUMNS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def columns(core: CompiledGraph | OverlayGraph) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-node privilege weights and high-value flags, per-edge weights,
+    each followed by one zero / false entry that padding points at.
+    """
+    if core.is_overlay:
+        priv, hv, edge_w = columns(core.base)
+        if core.priv is not core.base.priv:
+            priv = _patched(priv, core.priv, np.float64)
+        if core.hv is not core.base.hv:
+            hv = _patched(hv, core.hv, bool)
+        if core.edge_w.extra:
+            edge_w = np.concatenate((edge_w[:-1], _padded(core.edge_w.extra, np.int64)))
+        return priv, hv, edge_w
+    hit = _COLUMNS.get(core)
+    if hit is None:
+        hit = _COLUMNS[core] = (
+            _padded(core.priv, np.float64), _padded(core.hv, bool), _padded(core.edge_w, np.int64),
+        )
+    return hit
+
+
+def _padded(column, dtype) -> np.ndarray:
+    # A copy: a NumPy view would pin (and forbid resizing) the source array
+    out = np.zeros(len(column) + 1, dtype=dtype)
+    out[:-1] = column
+    return out
+
+
+def _patched(padded: np.ndarray, column, dtype) -> np.ndarray:
+    """Padded base column with an overlay's added nodes and overrides."""
+    out = np.concatenate((padded[:-1], np.asarray(column.extra, dtype=dtype), np.zeros(1, dtype=dtype)))
+    for i, value in column.over.items():
+        out[i] = value
+    return out
+
+
+def raw_risks(
+    core: CompiledGraph | OverlayGraph, paths: list[list[int]], hop_edges: list[list[int]],
+    crit_edge: int = -1,
+) -> np.ndarray:
+    """
+    Raw risk of every (node ids, edge indices) path, as `path_raw_risk`
+    computes it; float64 array in input order.
+    """
+    n = len(paths)
+    if n == 0:
+        return np.zeros(0)
+    priv, hv, edge_w = columns(core)
+    hops = np.fromiter(map(len, hop_edges), dtype=np.intp, count=n)
+    width = int(hops.max())
+
+    pad_node, pad_edge = len(priv) - 1, len(edge_w) - 1
+    nodes = _matrix(paths, hops + 1, width + 1, pad_node)
+    edges = _matrix(hop_edges, hops, max(width, 1), pad_edge)
+
+    pv = priv[nodes[:, 0]]
+    for c in range(1, width + 1):
+        pv = pv + priv[nodes[:, c]]
+    w = edge_w[edges].sum(axis=1)
+    inv_sqrt = np.array([1.0] + [1.0 / sqrt(h) for h in range(1, width + 1)])
+    raw = (w + pv) * inv_sqrt[hops]
+    raw = raw * np.where(hv[nodes].any(axis=1), HV_MULTIPLIER, 1.0)
+    if crit_edge >= 0:
+        raw = raw * np.where((edges == crit_edge).any(axis=1), CRITICAL_EDGE_BONUS, 1.0)
+    return raw
+
+
+def _matrix(rows: list[list[int]], lengths: np.ndarray, width: int, pad: int) -> np.ndarray:
+    """`rows` as an (n, width) index matrix, right-padded with `pad`."""
+    total = int(lengths.sum())
+    out = np.full((len(rows), width), pad, dtype=np.intp)
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.intp, count=total)
+    row = np.repeat(np.arange(len(rows)), lengths)
+    col = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    out[row, col] = flat
+    return out
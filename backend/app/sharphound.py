@@ -0,0 +1,257 @@
+"""
+SharpHound / BloodHound collection importer.
+
+Reads the collector's zip output (one `{"data": [...], "meta": {...}}`
+file per object type: users, groups, computers, domains, ous, gpos, …)
+and produces an active dataset directly, without an intermediate
+`{nodes, edges}` file:
+
+- group `Members`          → member  -MemberOf->   group
+- computer `LocalAdmins`    → principal -AdminTo-> computer
+- `RemoteDesktopUsers`      → principal -CanRDP->  computer
+- `Sessions` (+ privileged / registry)  computer -HasSession-> user
+- `Aces`                    → principal -<right>-> object, with
+  GetChanges + GetChangesAll on a domain collapsed to DCSync
+
+`privilegeLevel` / `highValue` are inferred from well-known SIDs
+(Domain / Enterprise Admins, Administrators, Domain Controllers),
+membership in those groups, `admincount`, SPNs and the legacy
+`highvalue` / CE `isTierZero` flags.
+
+Member files are parsed in parallel worker processes, each streaming its
+objects (see `jsonstream`) into compact tuples that the parent merges.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from . import dataset as ds
+from .jsonstream import ARRAY_START, iter_object
+
+# Parse member files in worker processes once the zip is at least this big
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# Start options offered for an imported domain
+MAX_START_OPTIONS = 4
+
+_KINDS = {
+    "users": "User", "groups": "Group", "computers": "Computer", "domains": "Domain",
+    "ous": "OU", "gpos": "GPO", "containers": "Container",
+}
+
+# ACE right names → relations (anything else keeps its BloodHound name)
+_RIGHTS = {
+    "WriteDacl": "WriteDACL",
+    "Owner": "Owns",
+    "GenericAll": "GenericAll",
+    "ForceChangePassword": "ForceChangePassword",
+    "AllExtendedRights": "AllExtendedRights",
+    "ReadLAPSPassword": "ReadLAPSPassword",
+    "Owns": "Owns",
+}
+
+# Well-known RIDs of the domain's tier-0 groups
+_ADMIN_RIDS = ("-512", "-519", "-544")   # Domain Admins, Enterprise Admins, Administrators
+_DC_RID = "-516"                          # Domain Controllers
+
+_SESSION_KEYS = ("Sessions", "PrivilegedSessions", "RegistrySessions")
+
+
+def is_collection_zip(head: bytes) -> bool:
+    """True if `head` (first bytes of an upload) starts a zip archive."""
+    return head[:4] == b"PK\x03\x04"
+
+
+def _results(block) -> list:
+    """Entries of a collector result block (`{"Results": [...]}` or a bare list)."""
+    if isinstance(block, dict):
+        return block.get("Results") or []
+    return block or []
+
+
+def _kind_from_name(member: str) -> str:
+    m = re.search(r"([a-z]+)\.json$", member.lower())
+    return m.group(1) if m else ""
+
+
+def _parse_member(path: str, member: str) -> tuple[str, list, list]:
+    """
+    Stream one collector file.  Returns (kind, objects, edges): objects are
+    (sid, name, flags) with flags a dict of the properties used for
+    inference; edges are (source sid, target sid, relation, source type).
+    """
+    objects: list[tuple[str, str | None, dict]] = []
+    edges: list[tuple[str, str, str, str]] = []
+    kind = ""
+    with zipfile.ZipFile(path) as zf, zf.open(member) as fp:
+        for key, value in iter_object(fp, ("data",)):
+            if key == "meta" and isinstance(value, dict):
+                kind = str(value.get("type", "")).lower()
+            elif key == "data" and value is not ARRAY_START and isinstance(value, dict):
+                _parse_object(value, objects, edges)
+    return kind or _kind_from_name(member), objects, edges
+
+
+def _parse_object(obj: dict, objects: list, edges: list) -> None:
+    sid = obj.get("ObjectIdentifier")
+    if not sid:
+        return
+    props = obj.get("Properties") or {}
+    objects.append((sid, props.get("name"), {
+        "admincount": bool(props.get("admincount")),
+        "highvalue": bool(props.get("highvalue") or props.get("isTierZero")),
+        "hasspn": bool(props.get("hasspn")),
+        "enabled": props.get("enabled", True) is not False,
+        "isdc": bool(obj.get("IsDC") or props.get("isdc")
+                     or str(props.get("primarygroupsid", "")).endswith(_DC_RID)),
+        "server": "server" in str(props.get("operatingsystem", "")).lower(),
+    }))
+
+    for m in obj.get("Members") or ():
+        edges.append((m.get("ObjectIdentifier") or m.get("MemberId"), sid, "MemberOf",
+                      m.get("ObjectType") or m.get("MemberType") or ""))
+
+    admins = _results(obj.get("LocalAdmins"))
+    rdp = _results(obj.get("RemoteDesktopUsers"))
+    for group in obj.get("LocalGroups") or ():   # SharpHound v2 / CE layout
+        name = str(group.get("Name", "")).upper()
+        if name.startswith("ADMINISTRATORS"):
+            admins = admins + _results(group)
+        elif name.startswith("REMOTE DESKTOP USERS"):
+            rdp = rdp + _results(group)
+    for p in admins:
+        edges.append((p.get("ObjectIdentifier"), sid, "AdminTo", p.get("ObjectType", "")))
+    for p in rdp:
+        edges.append((p.get("ObjectIdentifier"), sid, "CanRDP", p.get("ObjectType", "")))
+    for key in _SESSION_KEYS:
+        for s in _results(obj.get(key)):
+            if s.get("UserSID"):
+                edges.append((sid, s["UserSID"], "HasSession", "Computer"))
+
+    changes: dict[str, set[str]] = {}
+    for ace in obj.get("Aces") or ():
+        principal, right = ace.get("PrincipalSID"), ace.get("RightName")
+        if not principal or not right:
+            continue
+        if right in ("GetChanges", "GetChangesAll"):
+            changes.setdefault(principal, set()).add(right)
+            continue
+        edges.append((principal, sid, _RIGHTS.get(right, right), ace.get("PrincipalType", "")))
+    for principal, rights in changes.items():
+        if len(rights) == 2:
+            edges.append((principal, sid, "DCSync", ""))
+
+
+def _members(path: str) -> list[str]:
+    with zipfile.ZipFile(path) as zf:
+        return [i.filename for i in zf.infolist()
+                if not i.is_dir() and i.filename.lower().endswith(".json")]
+
+
+def load_collection(path: str, workers: int | None = None) -> tuple[dict | None, list[str]]:
+    """
+    Import a SharpHound zip at `path`.  Returns (materialised dataset,
+    []) ready for `dataset.activate`, or (None, errors).
+    """
+    try:
+        members = _members(path)
+    except zipfile.BadZipFile as exc:
+        return None, [f"Invalid zip archive: {exc}"]
+    if not members:
+        return None, ["Zip archive contains no JSON files"]
+
+    if workers is None:
+        workers = min(len(members), os.cpu_count() or 1)
+    if workers > 1 and os.path.getsize(path) >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(_parse_member, [path] * len(members), members))
+    else:
+        parsed = [_parse_member(path, m) for m in members]
+    return _build_dataset(parsed)
+
+
+def _build_dataset(parsed: list[tuple[str, list, list]]) -> tuple[dict | None, list[str]]:
+    names: dict[str, str] = {}       # sid -> unique node name
+    types: dict[str, str] = {}
+    flags: dict[str, dict] = {}
+    taken: set[str] = set()
+
+    def intern(sid: str, name: str | None, kind: str) -> None:
+        if sid in names:
+            return
+        name = name or sid
+        if name in taken:
+            name = f"{name} ({sid})"
+        taken.add(name)
+        names[sid] = name
+        types[sid] = kind
+
+    for kind, objects, _ in parsed:
+        node_type = _KINDS.get(kind, kind.rstrip("s").capitalize() or "Object")
+        for sid, name, f in objects:
+            intern(sid, name, node_type)
+            flags[sid] = f
+    # Principals only seen in references (foreign / well-known SIDs)
+    for _, _, edges in parsed:
+        for src, dst, _, src_type in edges:
+            if src:
+                intern(src, None, src_type or "Object")
+            intern(dst, None, "Object")
+    if not names:
+        return None, ["Collection contains no objects"]
+
+    # Tier 0: admin groups, their direct members, DCs, domains, flagged objects
+    tier0 = {sid for sid in names if sid.endswith(_ADMIN_RIDS)}
+    dcs = {sid for sid, f in flags.items() if f["isdc"]}
+    for _, _, edges in parsed:
+        for src, dst, rel, _ in edges:
+            if rel == "MemberOf" and src:
+                if dst in tier0 and src not in tier0 and types.get(src) == "User":
+                    tier0.add(src)
+                elif dst.endswith(_DC_RID) and types.get(src) == "Computer":
+                    dcs.add(src)
+
+    nodes = []
+    for sid, name in names.items():
+        f = flags.get(sid, {})
+        kind = types[sid]
+        if sid in dcs:
+            priv, hv, kind = "Domain Controller", True, "Server"
+        elif kind == "Domain":
+            priv, hv = "Domain Controller", True
+        elif sid in tier0:
+            priv, hv = "Domain Admin", True
+        elif kind == "User":
+            priv = "Mid-High" if f.get("admincount") else "Service" if f.get("hasspn") else "Low"
+            hv = f.get("highvalue", False)
+        else:
+            priv, hv = "", f.get("highvalue", False)
+            if kind == "Computer" and f.get("server"):
+                kind = "Server"
+        nodes.append({"id": sid, "name": name, "type": kind, "privilegeLevel": priv,
+                      "highValue": hv, "subnet": ""})
+
+    edges = []
+    critical = ""
+    weights = ds.DEFAULT_WEIGHTS
+    for _, _, found in parsed:
+        for src, dst, rel, _ in found:
+            if not src or src == dst:
+                continue
+            eid = f"E{len(edges) + 1:06d}"
+            edges.append({"id": eid, "source": names[src], "target": names[dst],
+                          "relation": rel, "weight": weights.get(rel, 5)})
+            if not critical and rel != "MemberOf" and dst in tier0 and src not in tier0:
+                critical = eid
+    if not edges:
+        return None, ["Collection contains no relationships"]
+
+    starts = [n["name"] for n in nodes
+              if n["type"] == "User" and n["privilegeLevel"] == "Low"
+              and flags.get(n["id"], {}).get("enabled", True)][:MAX_START_OPTIONS]
+    raw = {"criticalEdgeId": critical, "startOptions": starts}
+    return ds.assemble(raw, dict(weights), nodes, edges), []
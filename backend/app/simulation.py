@@ -0,0 +1,233 @@
+"""
+Incremental what-if simulation — derives the post-mutation analysis from
+the baseline one instead of re-running every search from scratch.
+
+For each start node the baseline top-k list is checked hop by hop against
+the mutated graph:
+
+- paths whose hops all resolve to the same edges are unchanged (same risk);
+- paths through a removed node/edge, or a pair whose best parallel edge
+  changed, are affected.
+
+If a start's baseline list was full (k paths) and a removal touched it, the
+next-best paths are unknown, so that start alone is searched again.  The
+same happens for every start when a mutation changes whether the critical
+edge is the best of its parallel edges, since that moves risks both ways.
+Otherwise the result is the unaffected paths, the re-scored survivors of a
+complete list, and the top-k paths that use at least one added edge (a
+search restricted to those edges).
+"""
+
+from __future__ import annotations
+
+from . import dataset as ds
+from .cache import ResultCache, estimate_size
+from .graph_engine import (
+    GraphEngine, SearchControl, distances_from, via_distances, search_top_k,
+)
+from .pathset import PathSet
+from .scoring import raw_risks
+
+
+def apply_mutations(engine: GraphEngine, mutations) -> list[str]:
+    """Apply `Mutation` models to `engine` in order; returns added edge IDs."""
+    added = []
+    for m in mutations:
+        if m.type == "removeEdge" and m.edgeId:
+            engine.remove_edge(m.edgeId)
+        elif m.type == "removeNode" and m.nodeId:
+            engine.remove_node_full(m.nodeId)
+        elif m.type == "addEdge" and m.source and m.target and m.relation:
+            added.append(engine.add_edge(m.source, m.target, m.relation, m.weight or 5))
+    return added
+
+
+def _is_collapsed(core, j: int) -> bool:
+    """True if edge `j` is the one the search uses for its node pair."""
+    return j >= 0 and core.edge_between(core.edge_src[j], core.edge_dst[j]) == j
+
+
+class Simulator:
+    """Before/after analysis for one baseline engine."""
+
+    def __init__(self, engine: GraphEngine, cache: ResultCache | None = None):
+        self.engine = engine
+        self.cache = cache if cache is not None else ResultCache()
+
+    def analysis(
+        self, start_nodes, target, min_depth, max_depth, k, parallel=False,
+        control: SearchControl | None = None,
+    ) -> tuple[PathSet, dict[int, str]]:
+        """
+        Ranked paths of the unmutated graph (see `pathset.PathSet`) and the
+        chain letter of every searched start, served from the result cache
+        when possible.  An aborted search (see `SearchControl`) is not
+        cached, nor is one an anytime budget cut short.
+        """
+        key = (ds.VERSION, "analysis", tuple(start_nodes), target, min_depth, max_depth, k)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        chains, found = self.engine._search(
+            start_nodes, target, min_depth, max_depth, k, parallel, control,
+        )
+        paths = self.engine._path_set(chains, found)
+        hit = (paths, chains)
+        if control is None or control.stopped is None:
+            self.cache.put(key, hit, paths.nbytes + estimate_size(chains))
+        return hit
+
+    def carry_over_cache(
+        self, old_version: str, changes: list[dict], base: GraphEngine,
+    ) -> tuple[int, int]:
+        """
+        After a dataset patch, re-key the cached analyses of `old_version`
+        that `changes` (see `dataset.patch`) cannot have altered and drop
+        the rest; `self.engine` must be the patched engine and `base` the
+        one it was patched from.  Removals only matter to analyses with a
+        path through the removed node / edge; added edges and node updates
+        to those whose depth bound lets a start -> target walk pass through
+        them.  If the critical edge became (or stopped being) the best of
+        its parallel edges, every analysis goes, as in `run`.  Returns
+        (kept, dropped).
+        """
+        crit_edge = self.engine._crit_edge()
+        if crit_edge >= 0 and \
+                _is_collapsed(self.engine.core, crit_edge) != _is_collapsed(base.core, base._crit_edge()):
+            return self.cache.migrate(old_version, ds.VERSION, lambda k, v: False)
+        removed_edges = {c["id"] for c in changes if c["op"] == "removeEdge"}
+        removed_nodes = {c["name"] for c in changes if c["op"] == "removeNode"}
+        grown = [c for c in changes if c["op"] in ("addEdge", "setNode")]
+        core = self.engine.core
+        reach: dict[tuple, bool] = {}
+
+        def reachable(starts: tuple, target: str, max_depth: int) -> bool:
+            key = (starts, target, max_depth)
+            if key not in reach:
+                t = core.index.get(target)
+                ids = [i for i in map(core.index.get, starts) if i is not None]
+                hit = False
+                if t is not None and ids:
+                    dt = self.engine.distances(t)
+                    df = distances_from(core, ids, max_depth)
+                    for c in grown:
+                        if c["op"] == "addEdge":
+                            u, v = core.index.get(c["source"]), core.index.get(c["target"])
+                            hit = u is not None and v is not None and df[u] + 1 + dt[v] <= max_depth
+                        else:
+                            i = core.index.get(c["name"])
+                            hit = i is not None and df[i] + dt[i] <= max_depth
+                        if hit:
+                            break
+                reach[key] = hit
+            return reach[key]
+
+        def keep(key: tuple, value) -> bool:
+            _, _, starts, target, _, max_depth, _ = key
+            if value[0].touches(removed_nodes, removed_edges):
+                return False
+            return not (grown and reachable(starts, target, max_depth))
+
+        return self.cache.migrate(old_version, ds.VERSION, keep)
+
+    def run(
+        self, mutations, start_nodes, target, min_depth, max_depth, k,
+        control: SearchControl | None = None,
+    ) -> tuple[dict, dict]:
+        """Return (before, after) analyses for `mutations`."""
+        base_paths, base_chains = self.analysis(
+            start_nodes, target, min_depth, max_depth, k, control=control,
+        )
+        before = base_paths.analysis()
+        base_found = base_paths.found()
+
+        mutated = self.engine.clone()
+        added = apply_mutations(mutated, mutations)
+        core = mutated.core
+        t = core.index.get(target)
+        if t is None or k <= 0:
+            return before, mutated.summarise([])
+
+        base = self.engine.core
+        dist = mutated.distances(t)
+        crit_edge = mutated._crit_edge()
+        via = {core.edge_index[eid] for eid in added if eid in core.edge_index}
+        via_dist = via_distances(core, via, dist, max_depth) if via else None
+        base_by_name = {base.names[s]: s for s in base_chains}
+        # If the critical edge survives but became (or stopped being) the
+        # best of its parallel edges, paths outside any baseline list can
+        # gain or lose its bonus; only a full search is safe then.
+        rescan = crit_edge >= 0 and \
+            _is_collapsed(core, crit_edge) != _is_collapsed(base, self.engine._crit_edge())
+
+        chains: dict[int, str] = {}
+        found: dict[int, list] = {}
+        plans = []
+        rescore: list[tuple[list[int], list[int]]] = []   # every start's, scored in one batch
+        for idx, start in enumerate(start_nodes):
+            s = core.index.get(start)
+            if s is None or s in chains:
+                continue
+            if dist[s] > max_depth:
+                continue
+            chains[s] = chr(65 + idx)  # A, B, C, D …
+
+            baseline = base_found.get(base_by_name.get(start), [])
+            kept, moved, stale = self._carry_over(base, core, baseline, via)
+            if rescan or (stale and len(baseline) >= k):
+                plans.append((s, None, None))
+                continue
+            plans.append((s, kept, range(len(rescore), len(rescore) + len(moved))))
+            rescore += moved
+
+        risks = raw_risks(core, [p for p, _ in rescore], [e for _, e in rescore], crit_edge).tolist()
+        for s, kept, batch in plans:
+            if kept is None:
+                found[s] = search_top_k(
+                    core, s, t, min_depth, max_depth, k, dist, crit_edge, control=control,
+                )
+                continue
+            rescored = [(risks[i], *rescore[i]) for i in batch]
+            fresh = search_top_k(
+                core, s, t, min_depth, max_depth, k, dist, crit_edge,
+                via=via, via_dist=via_dist, control=control,
+            ) if via else []
+            merged = kept + rescored + fresh
+            merged.sort(key=lambda c: (-c[0], c[1]))
+            found[s] = merged[:k]
+
+        return before, mutated.summarise(mutated._records(chains, found))
+
+    @staticmethod
+    def _carry_over(base, core, baseline, via) -> tuple[list, list, bool]:
+        """
+        Translate baseline paths into the mutated graph.  Returns (unchanged
+        paths, (node ids, edge indices) of paths whose pairs fell back to
+        another existing edge and need re-scoring, whether any path was hit
+        by a removal).
+        """
+        kept, moved = [], []
+        stale = False
+        for raw, path, hop_edges in baseline:
+            ids = [core.index.get(base.names[i]) for i in path]
+            if None in ids:
+                stale = True
+                continue
+            new_edges = [core.edge_between(u, v) for u, v in zip(ids, ids[1:])]
+            same = [
+                j >= 0 and core.edge_ids[j] == base.edge_ids[old]
+                for j, old in zip(new_edges, hop_edges)
+            ]
+            if all(same):
+                kept.append((raw, ids, new_edges))
+                continue
+            for ok, j, old in zip(same, new_edges, hop_edges):
+                # A pair outbid by an added edge only gains risk, as long as
+                # its old edge is still there; anything else is a removal.
+                if not ok and not (j in via and base.edge_ids[old] in core.edge_index):
+                    stale = True
+            if any(j in via for j in new_edges):
+                continue   # upgraded by an added edge: the via search finds it
+            if all(j >= 0 for j in new_edges):
+                moved.append((ids, new_edges))
+        return kept, moved, stale
@@ -0,0 +1,399 @@
+"""
+Binary dataset snapshots — the compiled graph plus everything needed to
+serve the dataset, in one file that is memory-mapped read-only.
+
+Layout: a fixed prefix (magic, format version, header length, data
+offset), a JSON header (dataset metadata, column layout, small
+vocabularies) and 8-byte aligned columns: the CSR / edge arrays of the
+`CompiledGraph`, node attribute codes and three string tables (node
+names, node ids, edge ids) stored as one UTF-8 blob plus offsets.
+
+Loading only parses the header and maps the file, so reopening a large
+dataset costs milliseconds instead of a JSON parse and graph build.  Node
+and edge dicts are produced on access, the name index is built on first
+lookup, and worker processes map the same file (see `parallel`), so they
+share its physical pages with the server.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+from .compiled import CompiledGraph
+from .graph_engine import PRIV_WEIGHT
+
+MAGIC = b"APFSNAP\0"
+
+# Bumped whenever the on-disk layout changes
+FORMAT_VERSION = 1
+
+# Snapshots kept by a `SnapshotStore` before the oldest are deleted
+SNAPSHOT_KEEP = 8
+
+_PREFIX = struct.Struct("<8sIIQ")   # magic, format version, header bytes, data offset
+
+# CompiledGraph columns stored as-is
+_CORE_COLUMNS = (
+    ("priv", "d"), ("hv", "B"),
+    ("edge_src", "i"), ("edge_dst", "i"), ("edge_w", "i"), ("edge_rel", "i"),
+    ("out_ptr", "i"), ("out_dst", "i"), ("out_w", "i"), ("out_edge", "i"),
+    ("in_ptr", "i"), ("in_src", "i"), ("in_edge", "i"),
+)
+_STRING_TABLES = ("names", "node_ids", "edge_ids")
+_NODE_CODES = ("type", "privilegeLevel", "subnet")
+
+# Dataset fields kept in the header as JSON (REVISION only once patched)
+_META = ("WEIGHTS", "SUBNETS", "CRITICAL_EDGE_ID", "START_OPTIONS", "SCENARIO_PRESETS", "VERSION", "REVISION")
+
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot this build can read."""
+
+
+# ── writing ─────────────────────────────────────────────────────────────────
+def _strings(values) -> tuple[bytes, array]:
+    """One UTF-8 blob plus n + 1 byte offsets."""
+    offsets = array("q", [0])
+    parts = []
+    total = 0
+    for v in values:
+        b = v.encode()
+        parts.append(b)
+        total += len(b)
+        offsets.append(total)
+    return b"".join(parts), offsets
+
+
+def _codes(values) -> tuple[list[str], array]:
+    vocab: dict[str, int] = {}
+    codes = array("i", (vocab.setdefault(v, len(vocab)) for v in values))
+    return list(vocab), codes
+
+
+def write(path: str | Path, data: dict, core: CompiledGraph) -> None:
+    """
+    Write materialised dataset `data` (as passed to `dataset.activate`)
+    and its compiled graph `core` to `path`.
+    """
+    nodes = data["NODES"]
+    if core.num_nodes != len(nodes):
+        raise SnapshotError("edges reference undeclared nodes; cannot snapshot")
+
+    columns: dict[str, tuple[str, object]] = {
+        name: (typecode, getattr(core, name)) for name, typecode in _CORE_COLUMNS
+    }
+    for name, values in (("names", core.names), ("node_ids", (n["id"] for n in nodes)),
+                         ("edge_ids", core.edge_ids)):
+        blob, offsets = _strings(values)
+        columns[f"{name}_blob"] = ("B", blob)
+        columns[f"{name}_off"] = ("q", offsets)
+    vocab = {}
+    for field in _NODE_CODES:
+        vocab[field], codes = _codes(n[field] for n in nodes)
+        columns[f"node_{field}"] = ("i", codes)
+    # Parallel edge groups: pair_ptr[g]..pair_ptr[g+1] index into pair_edges
+    pair_ptr, pair_edges = array("i", [0]), array("i")
+    for group in core.parallel.values():
+        pair_edges.extend(group)
+        pair_ptr.append(len(pair_edges))
+    columns["pair_ptr"] = ("i", pair_ptr)
+    columns["pair_edges"] = ("i", pair_edges)
+
+    layout = []
+    offset = 0
+    for name, (typecode, col) in columns.items():
+        count = len(col)
+        layout.append((name, typecode, offset, count))
+        offset += count * array(typecode).itemsize
+        offset = (offset + 7) & ~7
+
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "privWeights": PRIV_WEIGHT,
+        "numNodes": len(nodes),
+        "numEdges": len(core.edge_ids),
+        "relations": core.relations,
+        "vocab": vocab,
+        "scalars": core.scalars(),
+        "layout": layout,
+        "meta": {key: data[key] for key in _META if key in data},
+    }).encode()
+    data_offset = (_PREFIX.size + len(header) + 7) & ~7
+
+    buf = bytearray(data_offset + offset)
+    _PREFIX.pack_into(buf, 0, MAGIC, FORMAT_VERSION, len(header), data_offset)
+    buf[_PREFIX.size:_PREFIX.size + len(header)] = header
+    mv = memoryview(buf)
+    for name, typecode, off, count in layout:
+        raw = memoryview(columns[name][1]).cast("B")
+        start = data_offset + off
+        mv[start:start + len(raw)] = raw
+
+    # Write next to the target and rename, so readers never map a partial file
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# ── reading ─────────────────────────────────────────────────────────────────
+class _StringTable(Sequence):
+    """Read-only sequence of strings decoded from a mapped blob on access."""
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+class MappedGraph(CompiledGraph):
+    """
+    `CompiledGraph` whose columns live in a mapped snapshot.  The name /
+    edge-id indexes and the parallel-edge map are built on first use.
+    """
+
+    __slots__ = ("_index", "_edge_index", "_pair_ptr", "_pair_edges", "_parallel", "source")
+
+    @property
+    def index(self) -> dict[str, int]:
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.names)}
+        return self._index
+
+    @property
+    def edge_index(self) -> dict[str, int]:
+        if self._edge_index is None:
+            self._edge_index = {eid: j for j, eid in enumerate(self.edge_ids)}
+        return self._edge_index
+
+    @property
+    def parallel(self) -> dict[tuple[int, int], list[int]]:
+        if self._parallel is None:
+            ptr, edges = self._pair_ptr, self._pair_edges
+            groups = (list(edges[ptr[g]:ptr[g + 1]]) for g in range(len(ptr) - 1))
+            self._parallel = {(self.edge_src[g[0]], self.edge_dst[g[0]]): g for g in groups}
+        return self._parallel
+
+
+class _NodeView(Sequence):
+    """`dataset.NODES`-compatible view; builds each node dict on access."""
+
+    def __init__(self, core: MappedGraph, ids: _StringTable, codes: dict, vocab: dict):
+        self.core = core
+        self.ids = ids
+        self.codes = codes
+        self.vocab = vocab
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = range(len(self))[i]
+        codes, vocab = self.codes, self.vocab
+        return {
+            "id": self.ids[i],
+            "name": self.core.names[i],
+            "type": vocab["type"][codes["type"][i]],
+            "privilegeLevel": vocab["privilegeLevel"][codes["privilegeLevel"][i]],
+            "highValue": bool(self.core.hv[i]),
+            "subnet": vocab["subnet"][codes["subnet"][i]],
+        }
+
+
+class _EdgeView(Sequence):
+    """`dataset.EDGES`-compatible view over the compiled edge columns."""
+
+    def __init__(self, core: MappedGraph):
+        self.core = core
+
+    def __len__(self) -> int:
+        return len(self.core.edge_ids)
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return [self[k] for k in range(*j.indices(len(self)))]
+        j = range(len(self))[j]
+        core = self.core
+        return {
+            "id": core.edge_ids[j],
+            "source": core.names[core.edge_src[j]],
+            "target": core.names[core.edge_dst[j]],
+            "relation": core.relations[core.edge_rel[j]],
+            "weight": core.edge_w[j],
+        }
+
+
+def load(path: str | Path) -> dict:
+    """
+    Map the snapshot at `path` read-only.  Returns materialised dataset
+    data for `dataset.activate`, with node / edge views and the compiled
+    graph under "CORE".  Raises `SnapshotError` for files this build
+    cannot read.
+    """
+    path = str(path)
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:   # empty file
+            raise SnapshotError(f"{path}: not a snapshot") from None
+    if len(mm) < _PREFIX.size:
+        raise SnapshotError(f"{path}: not a snapshot")
+    magic, version, header_len, data_offset = _PREFIX.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path}: not a snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+    header = json.loads(mm[_PREFIX.size:_PREFIX.size + header_len])
+    if header["byteorder"] != sys.byteorder:
+        raise SnapshotError(f"{path}: written on a {header['byteorder']}-endian machine")
+    if header["privWeights"] != PRIV_WEIGHT:
+        raise SnapshotError(f"{path}: privilege weights changed since it was written")
+
+    layout = [(name, typecode, data_offset + off, count) for name, typecode, off, count in header["layout"]]
+    end = max((off + count * array(tc).itemsize for _, tc, off, count in layout), default=0)
+    if end > len(mm):
+        raise SnapshotError(f"{path}: truncated")
+
+    core_names = {name for name, _ in _CORE_COLUMNS}
+    core = MappedGraph.from_buffer(mm, [c for c in layout if c[0] in core_names], header["scalars"])
+    cols = {name: mv for name, mv in _columns(mm, layout) if name not in core_names}
+    tables = {name: _StringTable(cols[f"{name}_blob"], cols[f"{name}_off"]) for name in _STRING_TABLES}
+
+    core.names = tables["names"]
+    core.edge_ids = tables["edge_ids"]
+    core.relations = header["relations"]
+    core._index = core._edge_index = core._parallel = None
+    core._pair_ptr, core._pair_edges = cols["pair_ptr"], cols["pair_edges"]
+    search = {name for name, _ in CompiledGraph.SEARCH_COLUMNS}
+    core.source = (path, [c for c in layout if c[0] in search])
+
+    codes = {field: cols[f"node_{field}"] for field in _NODE_CODES}
+    return {
+        **header["meta"],
+        "NODES": _NodeView(core, tables["node_ids"], codes, header["vocab"]),
+        "EDGES": _EdgeView(core),
+        "CORE": core,
+    }
+
+
+def _columns(mm: mmap.mmap, layout):
+    mv = memoryview(mm).toreadonly()
+    for name, typecode, offset, count in layout:
+        yield name, mv[offset:offset + count * array(typecode).itemsize].cast(typecode)
+
+
+# ── on-disk store ───────────────────────────────────────────────────────────
+class SnapshotStore:
+    """
+    Directory of snapshots keyed by dataset content hash.  The most recent
+    one is what the server reopens at startup, replaying the dataset
+    patches journalled against it since (`append_patch` / `patches`), so
+    patches that stay on the engine's overlay survive a restart without a
+    full snapshot each.
+    """
+
+    def __init__(self, directory: str | Path, keep: int = SNAPSHOT_KEEP):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        # Stale snapshots (other format / weights) never match a file name
+        tag = json.dumps([FORMAT_VERSION, PRIV_WEIGHT, sys.byteorder], sort_keys=True)
+        self._tag = hashlib.sha256(tag.encode()).hexdigest()[:8]
+
+    def path(self, version: str) -> Path:
+        return self.directory / f"{version}-{self._tag}.snap"
+
+    def journal(self, version: str) -> Path:
+        return self.directory / f"{version}-{self._tag}.patches"
+
+    def save(self, data: dict, core: CompiledGraph) -> Path:
+        """
+        Write `data` unless already stored; marks it most recent either way
+        and clears its patch journal (the dataset is as stored again).
+        """
+        path = self.path(data["VERSION"])
+        self.journal(data["VERSION"]).unlink(missing_ok=True)
+        if path.exists():
+            path.touch()
+        else:
+            write(path, data, core)
+            self._trim()
+        return path
+
+    def append_patch(self, version: str, ops: list[dict]) -> None:
+        """Journal `/dataset/patch` ops applied on top of snapshot `version`."""
+        with open(self.journal(version), "a", encoding="utf-8") as f:
+            f.write(json.dumps(ops) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.path(version).touch()
+
+    def patches(self, version: str) -> list[list[dict]]:
+        """Journalled op lists of snapshot `version`, oldest first."""
+        try:
+            lines = self.journal(version).read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        out = []
+        for line in lines:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                break   # torn last write
+        return out
+
+    def get(self, version: str) -> dict | None:
+        """Mapped dataset for `version`, or None if it is not stored."""
+        path = self.path(version)
+        if not path.exists():
+            return None
+        path.touch()
+        return load(path)
+
+    def latest(self) -> dict | None:
+        versions = self.list()
+        return self.get(versions[0]["version"]) if versions else None
+
+    def list(self) -> list[dict]:
+        """Stored snapshots, most recently used first."""
+        found = []
+        for p in self.directory.glob(f"*-{self._tag}.snap"):
+            st = p.stat()
+            found.append({"version": p.name.split("-")[0], "bytes": st.st_size, "used": st.st_mtime})
+        found.sort(key=lambda s: s["used"], reverse=True)
+        return found
+
+    def _trim(self) -> None:
+        for old in self.list()[self.keep:]:
+            try:
+                self.path(old["version"]).unlink()
+                self.journal(old["version"]).unlink(missing_ok=True)
+            except OSError:
+                pass
@@ -0,0 +1,147 @@
+"""
+Synthetic dataset generator — seeded, BloodHound-like AD topologies for
+benchmarks and scale tests.
+
+The graph is tiered the way real domains are: users are members of
+groups, groups nest towards a few admin groups, groups administer or RDP
+into computers, computers hold sessions of (sometimes privileged) users,
+a sprinkling of ACL edges lets principals control each other, and the
+admin tier reaches the domain controllers.  Output uses the upload
+schema, so it passes `dataset.validate_dataset` and loads through
+`dataset.reload_from_json`.
+"""
+
+from __future__ import annotations
+
+import random
+
+from .dataset import DEFAULT_WEIGHTS
+
+# Share of the edge budget given to each relation family
+_MIX = (
+    ("MemberOf", 0.38),
+    ("AdminTo", 0.16),
+    ("CanRDP", 0.10),
+    ("HasSession", 0.22),
+    ("ACL", 0.14),
+)
+_ACL_RELATIONS = ("GenericAll", "WriteDACL", "ForceChangePassword", "Owns", "AllExtendedRights")
+
+
+def generate(num_edges: int, seed: int = 0) -> dict:
+    """
+    Return a raw dataset dict with roughly `num_edges` edges (exactly
+    `num_edges` once it is large enough to hold the fixed admin tier).
+    The same (num_edges, seed) always produces the same dataset.
+    """
+    rnd = random.Random(seed)
+    n_users = max(8, num_edges // 5)
+    n_groups = max(4, n_users // 25)
+    n_computers = max(3, n_users // 8)
+    n_dcs = 1 + num_edges // 250_000
+
+    nodes: list[dict] = []
+
+    def add(prefix: str, i: int, kind: str, priv: str, hv: bool = False, subnet: str = "") -> str:
+        name = f"{prefix}{i:06d}"
+        nodes.append({"id": name, "name": name, "type": kind, "privilegeLevel": priv,
+                      "highValue": hv, "subnet": subnet})
+        return name
+
+    subnets = [
+        {"id": "subnet-1", "cidr": "10.0.1.0/24", "label": "Corporate LAN"},
+        {"id": "subnet-2", "cidr": "10.0.2.0/24", "label": "Server Farm"},
+        {"id": "subnet-3", "cidr": "10.0.3.0/24", "label": "Domain Controllers"},
+    ]
+    users = [
+        add("U", i, "User", rnd.choices(("Low", "Mid-Low", "Mid", "Service"), (60, 25, 12, 3))[0])
+        for i in range(n_users)
+    ]
+    # Group 0 is Domain Admins, the next few are privileged admin groups
+    n_admin = max(1, n_groups // 20)
+    groups = [add("G", 0, "Group", "Domain Admin", hv=True)]
+    groups += [add("G", i, "Group", "Mid-High" if i <= n_admin else "Mid") for i in range(1, n_groups)]
+    computers = [
+        add("C", i, "Computer", "Mid" if i % 5 else "Mid-High",
+            subnet="subnet-2" if i % 5 == 0 else "subnet-1")
+        for i in range(n_computers)
+    ]
+    dcs = [add("DC", i, "Computer", "Domain Controller", hv=True, subnet="subnet-3") for i in range(n_dcs)]
+    privileged = [u for u in users if rnd.random() < 0.03] or users[:1]
+
+    edges: list[dict] = []
+
+    def link(source: str, target: str, relation: str) -> None:
+        edges.append({"id": f"E{len(edges) + 1:07d}", "source": source, "target": target,
+                      "relation": relation, "weight": DEFAULT_WEIGHTS.get(relation, 5)})
+
+    # Fixed admin tier: Domain Admins and the admin groups own the DCs
+    for dc in dcs:
+        link(groups[0], dc, "DCSync")
+        link(groups[0], dc, "AdminTo")
+    for g in groups[1:n_admin + 1]:
+        link(g, groups[0], "MemberOf")
+    for u in privileged[:3]:
+        link(u, groups[rnd.randint(1, n_admin)] if n_groups > 1 else groups[0], "MemberOf")
+
+    # Ordinary groups follow the admin ones; a few of them are very large
+    first = min(n_admin + 1, n_groups - 1)
+
+    budget = max(0, num_edges - len(edges))
+    for relation, share in _MIX:
+        for _ in range(int(budget * share)):
+            if relation == "MemberOf":
+                if rnd.random() < 0.9:
+                    link(rnd.choice(users), groups[_skewed(rnd, n_groups, first)], "MemberOf")
+                else:   # nesting only points upwards, rarely into the admin tier
+                    i = rnd.randrange(first, n_groups)
+                    low = 0 if rnd.random() < 0.02 else first
+                    if i > low:
+                        link(groups[i], groups[rnd.randrange(low, i)], "MemberOf")
+            elif relation == "AdminTo":
+                link(groups[_skewed(rnd, n_groups, 1)], rnd.choice(computers), "AdminTo")
+            elif relation == "CanRDP":
+                link(rnd.choice(users), rnd.choice(computers), "CanRDP")
+            elif relation == "HasSession":
+                who = rnd.choice(privileged) if rnd.random() < 0.05 else rnd.choice(users)
+                link(rnd.choice(computers), who, "HasSession")
+            else:
+                source = rnd.choice(users) if rnd.random() < 0.7 else rnd.choice(groups)
+                target = rnd.choice(users) if rnd.random() < 0.8 else groups[_skewed(rnd, n_groups, first)]
+                if source != target:
+                    link(source, target, rnd.choice(_ACL_RELATIONS))
+    while len(edges) < num_edges:
+        link(rnd.choice(users), groups[_skewed(rnd, n_groups, first)], "MemberOf")
+
+    admins = set(privileged)
+    starts = [u for u in users if u not in admins][:4]
+    critical = next((e["id"] for e in edges if e["target"] == groups[0] and e["relation"] in _ACL_RELATIONS),
+                    edges[0]["id"])
+    return {
+        "weights": dict(DEFAULT_WEIGHTS),
+        "subnets": subnets,
+        "nodes": nodes,
+        "edges": edges,
+        "criticalEdgeId": critical,
+        "startOptions": starts,
+        "scenarioPresets": {
+            "A": {
+                "label": f"What if {starts[0]} joins Domain Admins?",
+                "description": "Synthetic escalation: a start user is added to the top admin group.",
+                "mutations": [{"type": "addEdge", "source": starts[0], "relation": "MemberOf",
+                               "target": groups[0], "weight": 3}],
+            },
+            "B": {
+                "label": f"What if we revoke {critical}?",
+                "description": "Remove the critical ACL edge into Domain Admins.",
+                "mutations": [{"type": "removeEdge", "edgeId": critical}],
+            },
+        },
+    }
+
+
+def _skewed(rnd: random.Random, n: int, low: int = 0) -> int:
+    """Index in [low, n) biased towards the low end (few large groups)."""
+    if n <= low:
+        return n - 1
+    return low + min(n - low - 1, int((n - low) * rnd.random() ** 2))
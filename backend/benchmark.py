@@ -0,0 +1,190 @@
+"""
+Benchmark suite for the graph engine on seeded synthetic AD graphs.
+
+Times every engine entry point (build, find_paths, get_neighbors, clone +
+mutate, incremental simulate, batch scoring) across graph sizes and depth limits and
+writes latency percentiles, peak memory and paths/second as JSON.
+
+    python benchmark.py                              # 1k / 10k / 100k edges
+    python benchmark.py --sizes 1k,1m --depths 6,8 --repeat 10
+    python benchmark.py --output new.json --baseline old.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from app import dataset as ds
+from app.graph_engine import GraphEngine
+from app.models import Mutation
+from app.scoring import raw_risks
+from app.simulation import Simulator
+from app.synthetic import generate
+
+# p50 slowdown past which --baseline flags an entry as a regression
+REGRESSION_RATIO = 1.2
+
+
+def percentiles(samples: list[float]) -> dict:
+    """Nearest-rank latency percentiles in milliseconds."""
+    xs = sorted(samples)
+
+    def rank(p: float) -> float:
+        return round(xs[min(len(xs) - 1, int(p / 100 * len(xs)))] * 1000, 3)
+
+    return {
+        "p50": rank(50), "p90": rank(90), "p99": rank(99),
+        "mean": round(sum(xs) / len(xs) * 1000, 3), "max": round(xs[-1] * 1000, 3),
+    }
+
+
+def measure(fn, repeat: int) -> tuple[list[float], int, object]:
+    """Run `fn` `repeat` times; returns (seconds per run, peak bytes, last result)."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    # Separate traced run: tracemalloc slows allocation-heavy code down a lot
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return times, peak, result
+
+
+def bench_size(num_edges: int, depths: list[int], repeat: int, k: int, seed: int) -> list[dict]:
+    raw = generate(num_edges, seed)
+    ds.reload_from_json(raw)
+    rnd = random.Random(seed)
+    starts = ds.START_OPTIONS
+    target = next(n["name"] for n in ds.NODES if n["type"] == "Computer" and n["highValue"])
+    base = {"size": num_edges, "nodes": len(ds.NODES), "edges": len(ds.EDGES)}
+    rows = []
+
+    def record(entry: str, fn, depth: int | None = None, count_paths: bool = False):
+        times, peak, result = measure(fn, repeat)
+        row = {**base, "entry": entry, "maxDepth": depth, "repeat": repeat,
+               "latencyMs": percentiles(times), "peakMemoryBytes": peak}
+        if count_paths:
+            row["paths"] = len(result)
+            row["pathsPerSecond"] = round(len(result) * len(times) / sum(times), 1) if sum(times) else None
+        rows.append(row)
+        print(f"  {entry:<14} depth={depth!s:<4} p50={row['latencyMs']['p50']:>10.3f} ms  "
+              f"peak={peak / 1e6:8.1f} MB" + (f"  paths={row['paths']}" if count_paths else ""))
+
+    print(f"{num_edges} edges / {len(ds.NODES)} nodes")
+    record("build", GraphEngine)
+    engine = GraphEngine()
+
+    probes = [rnd.choice(ds.NODES)["name"] for _ in range(32)]
+    record("get_neighbors", lambda: [engine.get_neighbors(n, 2) for n in probes])
+
+    removals = [rnd.choice(ds.EDGES)["id"] for _ in range(3)]
+    victim = rnd.choice(ds.NODES)["name"]
+
+    def clone_and_mutate():
+        eng = engine.clone()
+        for eid in removals:
+            eng.remove_edge(eid)
+        eng.remove_node_full(victim)
+        eng.add_edge(starts[0], target, "AdminTo", 7)
+        return eng.core
+
+    record("clone_mutate", clone_and_mutate)
+
+    mutations = [Mutation(type="removeEdge", edgeId=eid) for eid in removals]
+    for depth in depths:
+        min_depth = min(4, depth)
+        record("find_paths", lambda: engine.find_paths(starts, target, min_depth, depth, k),
+               depth, count_paths=True)
+        batch = [r for found in engine._search(starts, target, min_depth, depth, k)[1].values() for r in found]
+        paths, hops = [p for _, p, _ in batch], [e for _, _, e in batch]
+        record("score_batch", lambda: raw_risks(engine.core, paths, hops, engine._crit_edge()),
+               depth, count_paths=True)
+        sim = Simulator(engine)
+        sim.analysis(starts, target, min_depth, depth, k)   # baseline is cached, as in /simulate
+        record("simulate", lambda: sim.run(mutations, starts, target, min_depth, depth, k), depth)
+    return rows
+
+
+def compare(rows: list[dict], baseline_path: Path) -> None:
+    """Print p50 ratios against an earlier result file."""
+    old = {
+        (r["size"], r["entry"], r["maxDepth"]): r
+        for r in json.loads(baseline_path.read_text())["results"]
+    }
+    print(f"\nvs {baseline_path} (p50 ratio, >{REGRESSION_RATIO} flagged)")
+    for r in rows:
+        prev = old.get((r["size"], r["entry"], r["maxDepth"]))
+        if prev is None or not prev["latencyMs"]["p50"]:
+            continue
+        ratio = r["latencyMs"]["p50"] / prev["latencyMs"]["p50"]
+        flag = "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+        print(f"  {r['size']:>8} {r['entry']:<14} depth={r['maxDepth']!s:<4} {ratio:6.2f}x{flag}")
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _size(text: str) -> int:
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sizes", default="1k,10k,100k", help="edge counts, e.g. 1k,10k,100k,1m")
+    ap.add_argument("--depths", default="4,6,8", help="maxDepth values for path searches")
+    ap.add_argument("--repeat", type=int, default=5, help="timed runs per entry point")
+    ap.add_argument("-k", type=int, default=20, help="paths per start node")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    ap.add_argument("--baseline", type=Path, help="earlier result file to compare against")
+    args = ap.parse_args(argv)
+
+    sizes = [_size(s) for s in args.sizes.split(",")]
+    depths = [int(d) for d in args.depths.split(",")]
+    rows: list[dict] = []
+    for size in sizes:
+        rows.extend(bench_size(size, depths, args.repeat, args.k, args.seed))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "gitRev": _git_rev(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "k": args.k,
+        },
+        "results": rows,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nwrote {args.output}")
+    if args.baseline:
+        compare(rows, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
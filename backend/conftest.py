@@ -0,0 +1,55 @@
+"""Shared fixtures: datasets loaded into the global store and emptied afterwards."""
+from math import sqrt
+from pathlib import Path
+
+import pytest
+
+from app import dataset as ds
+from app.graph_engine import CRITICAL_EDGE_BONUS, HV_MULTIPLIER, GraphEngine
+
+DATASETS = sorted((Path(__file__).parent / "data").glob("*.json"))
+
+
+@pytest.fixture
+def load():
+    """`ds.reload_from_json`; the store is emptied again after the test."""
+    yield ds.reload_from_json
+    ds.reload_from_json({"nodes": [], "edges": []})
+
+
+@pytest.fixture(params=DATASETS, ids=lambda p: p.stem)
+def dataset(request, load):
+    """Each bundled dataset, loaded; yields its raw JSON.
+
+    Parametrize it indirectly to load other files or raw dicts instead.
+    """
+    raw = request.param if isinstance(request.param, dict) else ds._load_json(request.param)
+    load(raw)
+    return raw
+
+
+@pytest.fixture
+def engine(dataset):
+    return GraphEngine()
+
+
+def reference_risk(engine: GraphEngine, path: list[str]) -> dict:
+    """
+    Graded risk of a path of node names, scored from edge records
+    (reference answer for the engine's index-based scorers):
+    (edge weights + node privileges) / sqrt(hops), times the high-value
+    and critical-edge multipliers.
+    """
+    core = engine.core
+    idx = [core.index.get(name) for name in path]
+    edges = [core.edge_between(u, v) for u, v in zip(idx, idx[1:]) if u is not None and v is not None]
+    edges = [core.edge_record(j) for j in edges if j >= 0]
+    raw = sum(e["weight"] for e in edges) + sum(core.priv[i] if i is not None else 1.0 for i in idx)
+    hops = len(path) - 1
+    if hops > 0:
+        raw *= 1.0 / sqrt(hops)
+    if any(i is not None and core.hv[i] for i in idx):
+        raw *= HV_MULTIPLIER
+    if any(e["edgeId"] == ds.CRITICAL_EDGE_ID for e in edges):
+        raw *= CRITICAL_EDGE_BONUS
+    return GraphEngine._grade(raw)
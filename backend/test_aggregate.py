@@ -0,0 +1,71 @@
+"""Aggregate path statistics agree with enumerating every path."""
+import random
+
+import pytest
+
+from app import aggregate, dataset as ds
+from app.graph_engine import GraphEngine
+from app.synthetic import generate
+from conftest import DATASETS
+
+def layered_dag(n: int, m: int, seed: int, back: float = 0.0) -> dict:
+    """Random graph whose edges point to higher ids, bar a `back` fraction."""
+    rnd = random.Random(seed)
+    nodes = [{"id": f"N{i}", "name": f"N{i}", "type": "User", "highValue": rnd.random() < 0.1,
+              "privilegeLevel": rnd.choice(["Low", "Mid", "High", "Domain Admin"])} for i in range(n)]
+    edges = []
+    for j in range(m):
+        a, b = sorted(rnd.sample(range(n), 2))
+        if rnd.random() < back:
+            a, b = b, a
+        edges.append({"id": f"E{j}", "source": f"N{a}", "target": f"N{b}",
+                      "relation": "AdminTo", "weight": rnd.randint(1, 10)})
+    return {"nodes": nodes, "edges": edges, "criticalEdgeId": "E3"}
+
+
+def enumerate_all(engine, starts, target, lo, hi):
+    _, found = engine._search(starts, target, lo, hi, 10**9)
+    paths = [p for per_start in found.values() for p in per_start]
+    incidence = {}
+    for _, _, hop_edges in paths:
+        for j in hop_edges:
+            incidence[engine.core.edge_ids[j]] = incidence.get(engine.core.edge_ids[j], 0) + 1
+    return len(paths), round(sum(raw for raw, _, _ in paths), 2), incidence
+
+
+def check(engine, starts, target, lo, hi, methods=("dp", "enumeration", "none")):
+    stats = aggregate.path_statistics(engine, starts, target, lo, hi, top_edges=10**6)
+    total, risk, incidence = enumerate_all(engine, starts, target, lo, hi)
+    assert stats["exact"]
+    assert stats["method"] in methods
+    assert stats["totalPaths"] == total
+    assert stats["globalRisk"] == pytest.approx(risk, abs=0.02)
+    assert sum(b["paths"] for b in stats["byLength"]) == total
+    assert {e["edgeId"]: e["paths"] for e in stats["edgeIncidence"]} == incidence
+
+
+@pytest.mark.parametrize("dataset", DATASETS + [generate(300, seed=4)], indirect=True)
+def test_counts_match_enumeration(engine):
+    starts = ds.START_OPTIONS[:3]
+    for target in sorted({e["target"] for e in ds.EDGES})[::3]:
+        for lo, hi in ((0, 3), (1, 5), (3, 6)):
+            check(engine, starts, target, lo, hi)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_dag_uses_exact_dp(seed, load):
+    load(layered_dag(40, 160, seed))
+    engine = GraphEngine()
+    for lo, hi in ((0, 4), (2, 6), (5, 8)):
+        check(engine, ["N0", "N1", "N5"], "N39", lo, hi, ("dp",))
+
+
+def test_over_budget_falls_back_to_upper_bound(load, monkeypatch):
+    load(layered_dag(40, 200, 3, back=0.3))
+    engine = GraphEngine()
+    starts, target = ["N0"], "N39"
+    total, _, _ = enumerate_all(engine, starts, target, 1, 6)
+    monkeypatch.setattr(aggregate, "COUNT_EXPANSION_BUDGET", 10)
+    stats = aggregate.path_statistics(engine, starts, target, 1, 6)
+    assert stats["method"] == "walks" and not stats["exact"]
+    assert stats["totalPaths"] >= total > 0
@@ -0,0 +1,42 @@
+"""Stored analyses round-trip paths and survive eviction via the spill directory."""
+import pytest
+
+from app import dataset as ds
+from app.analyses import AnalysisStore, analysis_id, compact, expand
+from app.explainer import explain_path
+
+
+@pytest.fixture
+def analysis(engine):
+    return engine.analyze(ds.START_OPTIONS, ds.EDGES[-1]["target"], 1, 7, 20)
+
+
+def test_compact_records_expand_to_the_original(analysis):
+    assert analysis["paths"]
+    for p in analysis["paths"]:
+        assert expand(compact(p)) == p
+
+
+def test_store_addresses_paths_by_analysis(analysis, tmp_path):
+    store = AnalysisStore(tmp_path, max_entries=1)
+    aid = analysis_id(ds.VERSION, "analysis", ds.START_OPTIONS, "x", 1, 7, 20)
+    other = analysis_id(ds.VERSION, "analysis", ds.START_OPTIONS, "y", 1, 7, 20)
+    assert aid != other and len(aid) == 16
+    store.put(aid, analysis["paths"])
+    store.put(other, analysis["paths"][:1])   # evicts `aid` from memory
+    first = analysis["paths"][0]
+    assert store.path(None, first["pathId"]) == first
+    assert store.path(aid, analysis["paths"][-1]["pathId"]) == analysis["paths"][-1]
+    assert explain_path(store.path(aid, first["pathId"])) == explain_path(first)
+    # A second worker sharing the directory
+    assert AnalysisStore(tmp_path).path(aid, first["pathId"]) == first
+    assert store.path(aid, "nope") is None
+    assert store.path("../../etc/passwd", first["pathId"]) is None
+
+
+def test_memory_only_store_forgets_evicted(analysis):
+    store = AnalysisStore(max_entries=1)
+    store.put("a" * 16, analysis["paths"])
+    store.put("b" * 16, analysis["paths"], latest=False)
+    assert store.latest == "a" * 16
+    assert store.get("a" * 16) is None and store.path(None, analysis["paths"][0]["pathId"]) is None
@@ -0,0 +1,51 @@
+"""Result cache bounds and its use for analyses."""
+from app import dataset as ds
+from app.cache import ResultCache
+from app.graph_engine import GraphEngine
+from app.simulation import Simulator
+
+
+def test_lru_and_byte_bounds():
+    cache = ResultCache(max_entries=2, max_bytes=100)
+    cache.put(("a",), 1, size=40)
+    cache.put(("b",), 2, size=40)
+    assert cache.get(("a",)) == 1          # "b" is now least recently used
+    cache.put(("c",), 3, size=40)
+    assert cache.get(("b",)) is None
+    cache.put(("d",), 4, size=90)          # pushes out everything else
+    assert cache.get(("a",)) is None and cache.get(("d",)) == 4
+    cache.put(("e",), 5, size=500)         # larger than the whole budget
+    assert cache.get(("e",)) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 3 and stats["bytes"] == 90 and stats["entries"] == 1
+
+
+def test_ttl_expiry():
+    cache = ResultCache(ttl=0)
+    cache.put(("a",), 1)
+    assert cache.get(("a",)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_migrate_replaces_without_leaking_bytes():
+    cache = ResultCache()
+    cache.put(("v1", "a"), 1, size=40)
+    cache.put(("v1", "b"), 2, size=30)
+    cache.put(("v2", "a"), 3, size=25)     # re-keying v1 "a" replaces it
+    assert cache.migrate("v1", "v2", lambda k, v: k[1] == "a") == (1, 1)
+    assert cache.get(("v2", "a")) == 1
+    assert cache.stats()["bytes"] == 40 and cache.stats()["entries"] == 1
+
+
+def test_analysis_served_from_cache(load):
+    ds.reset_to_default()
+    cache = ResultCache()
+    sim = Simulator(GraphEngine(), cache)
+    first = sim.analysis(ds.START_OPTIONS, "DC01", 1, 7, 5)[0]
+    assert sim.analysis(ds.START_OPTIONS, "DC01", 1, 7, 5)[0] is first
+    sim.run([], ds.START_OPTIONS, "DC01", 1, 7, 5)   # baseline half of /simulate
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+    # Same content, fresh engine: still a hit.  Different content: a miss.
+    assert Simulator(GraphEngine(), cache).analysis(ds.START_OPTIONS, "DC01", 1, 7, 5)[0] is first
+    load(ds._load_json(ds._DATA_DIR / "test_hospital_network.json"))
+    assert Simulator(GraphEngine(), cache).analysis(ds.START_OPTIONS, "DC01", 1, 7, 5)[0] is not first
@@ -0,0 +1,56 @@
+"""Chokepoints and minimum cuts agree with the enumerated path set."""
+import random
+
+import pytest
+
+from app import chokepoints as cp, dataset as ds
+from app.synthetic import generate
+from conftest import DATASETS
+
+pytestmark = pytest.mark.parametrize("dataset", DATASETS + [generate(300, seed=1)], indirect=True)
+
+
+def all_paths(engine, starts, target, max_depth):
+    _, found = engine._search(starts, target, 1, max_depth, 10**9)
+    return [(nodes, edges) for per_start in found.values() for _, nodes, edges in per_start]
+
+
+def test_chokepoints_are_on_every_path(engine):
+    core = engine.core
+    names = [n["name"] for n in ds.NODES]
+    rnd = random.Random(5)
+    checked = 0
+    for _ in range(40):
+        target = rnd.choice(names)
+        starts = rnd.sample(names, rnd.choice((1, 2, 3)))
+        max_depth = rnd.choice((3, 5, 7))
+        result = cp.chokepoints(engine, starts, target, max_depth)
+        paths = all_paths(engine, starts, target, max_depth)
+        assert result["reachable"] == bool(paths)
+        if not paths:
+            continue
+        checked += 1
+        start_ids = {core.index[s] for s in starts}
+        must_nodes = set.intersection(*(set(p[1:-1]) for p, _ in paths)) - start_ids
+        must_edges = set.intersection(*(set(e) for _, e in paths))
+        assert {core.index[n["name"]] for n in result["nodes"]} == must_nodes
+        assert {core.edge_index[e["edgeId"]] for e in result["edges"]} == must_edges
+
+        cut = {core.edge_index[i] for e in result["minCut"] for i in e["parallelEdgeIds"]}
+        assert len(cut) == result["edgeDisjointPaths"]
+        assert all(cut.intersection(e) for _, e in paths)
+    assert checked
+
+
+def test_flow_limit_skips_cut(engine):
+    starts = ds.START_OPTIONS
+    target = ds.EDGES[-1]["target"]
+    full = cp.chokepoints(engine, starts, target, 7)
+    if full["edgeDisjointPaths"] < 2:
+        pytest.skip("single-edge cut")
+    capped = cp.chokepoints(engine, starts, target, 7, cut_limit=1)
+    assert capped["edges"] == full["edges"]
+    if capped["cutComplete"]:   # one augmenting path carried every parallel unit
+        assert capped == full
+    else:
+        assert capped["minCut"] == [] and 1 <= capped["edgeDisjointPaths"] < full["edgeDisjointPaths"]
@@ -0,0 +1,52 @@
+"""Streaming dataset ingestion agrees with the in-memory loader."""
+import io
+import json
+
+import pytest
+
+from app import dataset as ds, jsonstream
+from app.synthetic import generate
+from conftest import DATASETS
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Tiny windows make every value straddle chunk boundaries
+    monkeypatch.setattr(jsonstream, "CHUNK_SIZE", 37)
+
+
+@pytest.mark.parametrize("raw", [ds._load_json(p) for p in DATASETS] + [generate(500, seed=1)])
+def test_stream_matches_materialise(raw):
+    reports = []
+    data, errors = ds.parse_stream(io.BytesIO(json.dumps(raw, indent=1).encode()),
+                                   lambda *a: reports.append(a))
+    assert errors == []
+    assert data == ds._materialise(raw)
+    assert reports[-1][1:] == (len(raw["nodes"]), len(raw["edges"]))
+
+
+def test_weights_after_edges():
+    raw = ds._load_json(DATASETS[0])
+    reordered = {"edges": raw["edges"], "nodes": raw["nodes"], "weights": {"MemberOf": 1}}
+    data, _ = ds.parse_stream(io.BytesIO(json.dumps(reordered).encode()))
+    assert data == ds._materialise(reordered)
+
+
+@pytest.mark.parametrize("raw", [
+    {},
+    {"nodes": [], "edges": []},
+    {"nodes": 5, "edges": [{"id": "e"}]},
+    {"nodes": [{"id": "a", "name": "a"}], "edges": [{"id": "e", "source": "a", "target": "a", "relation": "X"}]},
+    {"nodes": [{"id": "a", "name": "a", "type": "User"}],
+     "edges": [{"id": "e", "source": "a", "target": "b", "relation": "X"}]},
+])
+def test_stream_validation_messages(raw):
+    data, errors = ds.parse_stream(io.BytesIO(json.dumps(raw).encode()))
+    assert data is None
+    assert errors == ds.validate_dataset(raw)
+
+
+@pytest.mark.parametrize("text", [b'{"nodes": [}', b'{"a": 1,}', b'{"a": 1} []', b'[1]', b'{"n": [1 2]}'])
+def test_malformed_json(text):
+    with pytest.raises(json.JSONDecodeError):
+        ds.parse_stream(io.BytesIO(text))
@@ -0,0 +1,33 @@
+"""Structured explanations carry what the text says; step sentences are memoized."""
+import pytest
+
+from app import dataset as ds
+from app.explainer import explain_path, explain_steps, render_text, step_text
+
+@pytest.fixture
+def paths(engine):
+    return engine.analyze(ds.START_OPTIONS, ds.EDGES[-1]["target"], 1, 7, 20)["paths"]
+
+
+def test_steps_follow_the_path(paths):
+    assert paths
+    for p in paths:
+        info = explain_steps(p)
+        assert [s["edgeId"] for s in info["steps"]] == [e["edgeId"] for e in p["edges"]]
+        assert info["steps"][-1]["cumulativeWeight"] == p["sumWeights"]
+        text = explain_path(p)
+        assert text == render_text(info)
+        for s in info["steps"]:
+            assert f"STEP {s['step']}: {s['source']}" in text
+            assert s["privilegeGained"] in text
+        assert f"RESULT: {p['nodes'][-1]} — Target Reached" in text
+
+
+def test_step_sentences_are_rendered_once(paths):
+    step_text.cache_clear()
+    for p in paths:
+        explain_path(p)
+    distinct = {(e["relation"], e["source"], e["target"]) for p in paths for e in p["edges"]}
+    info = step_text.cache_info()
+    assert info.misses == len(distinct)
+    assert info.hits == sum(p["hops"] for p in paths) - len(distinct)
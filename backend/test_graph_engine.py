@@ -0,0 +1,149 @@
+"""Correctness checks for the graph engine against the bundled datasets."""
+import networkx as nx
+import pytest
+
+from app import dataset as ds
+from app.graph_engine import GraphEngine
+from conftest import reference_risk
+
+
+def brute_force(eng: GraphEngine, start: str, target: str, min_depth: int, max_depth: int) -> list[float]:
+    """Risk of every distinct simple path, highest first (reference answer)."""
+    seen = set()
+    risks = []
+    for path in nx.all_simple_paths(eng.G, start, target, cutoff=max_depth):
+        if len(path) - 1 < min_depth or tuple(path) in seen:
+            continue
+        seen.add(tuple(path))
+        risks.append(reference_risk(eng, path)["risk"])
+    return sorted(risks, reverse=True)
+
+
+def test_top_k_matches_brute_force(engine):
+    hv_targets = [n["name"] for n in engine.nodes if n["highValue"]]
+    for target in hv_targets:
+        for start in ds.START_OPTIONS:
+            for min_depth, max_depth in ((1, 7), (3, 5), (4, 7)):
+                expected = brute_force(engine, start, target, min_depth, max_depth)
+                for k in (1, 3, 5, 1000):
+                    got = engine.find_paths([start], target, min_depth, max_depth, k)
+                    assert [p["risk"] for p in got] == expected[:k]
+                    assert len({tuple(p["nodes"]) for p in got}) == len(got)
+                    assert all(min_depth <= p["hops"] <= max_depth for p in got)
+
+
+def test_path_ids_follow_risk_rank(engine):
+    paths = engine.find_paths(ds.START_OPTIONS, "DC01" if "DC01" in engine.G else "DC-PRIMARY", 1, 7, 5)
+    for chain in {p["pathId"][0] for p in paths}:
+        ranked = [p for p in paths if p["pathId"][0] == chain]
+        assert [p["pathId"] for p in ranked] == [f"{chain}{i}" for i in range(1, len(ranked) + 1)]
+
+
+def test_parallel_matches_serial(engine, monkeypatch):
+    from app import parallel
+    target = "DC01" if "DC01" in engine.core.index else "DC-PRIMARY"
+    # Few starts per worker forces the first-hop split as well.
+    for workers in (1, 8):
+        monkeypatch.setattr(parallel, "PARALLEL_WORKERS", workers)
+        for k in (1, 3, 50):
+            serial = engine.find_paths(ds.START_OPTIONS, target, 1, 7, k)
+            fanned = engine.find_paths(ds.START_OPTIONS, target, 1, 7, k, parallel=True)
+            assert [(p["pathId"], p["nodes"], p["risk"]) for p in fanned] == \
+                [(p["pathId"], p["nodes"], p["risk"]) for p in serial]
+        parallel.shutdown()
+
+
+def test_mitigations_match_removal(engine):
+    target = "DC01" if "DC01" in engine.core.index else "DC-PRIMARY"
+    # k large enough that the path set is complete, so removal is exact
+    paths = engine.find_paths(ds.START_OPTIONS, target, 1, 7, 10_000)
+    ranked = engine.rank_mitigations(paths, cut_size=3)
+    for c in ranked["candidates"]:
+        mutated = engine.clone()
+        mutated.remove_edge(c["edgeId"])
+        after = mutated.analyze(ds.START_OPTIONS, target, 1, 7, 10_000)
+        if c["eliminatedPaths"]:
+            assert after["totalPaths"] == len(paths) - c["eliminatedPaths"]
+            assert after["globalRisk"] == pytest.approx(ranked["globalRisk"] - c["riskReduction"], abs=0.01)
+
+    mutated = engine.clone()
+    for step in ranked["greedyCut"]:
+        mutated.remove_edge(step["edgeId"])
+    after = mutated.analyze(ds.START_OPTIONS, target, 1, 7, 10_000)
+    if ranked["greedyCut"]:
+        last = ranked["greedyCut"][-1]
+        assert after["totalPaths"] == last["remainingPaths"]
+        assert after["globalRisk"] == pytest.approx(ranked["globalRisk"] - last["cumulativeRiskReduction"], abs=0.01)
+        gains = [s["riskReduction"] for s in ranked["greedyCut"]]
+        assert gains == sorted(gains, reverse=True)
+
+
+def test_streamed_analysis_matches_analyze(engine):
+    target = "DC01" if "DC01" in engine.core.index else "DC-PRIMARY"
+    for k in (1, 3, 50):
+        full = engine.analyze(ds.START_OPTIONS, target, 1, 7, k)
+        collected = engine._path_set({}, {})
+        frames = list(engine.iter_analysis(ds.START_OPTIONS, target, 1, 7, k, into=collected))
+        assert collected.analysis() == full
+        assert frames[-1]["type"] == "summary"
+        streamed = [p for f in frames if f["type"] == "paths" for p in f["paths"]]
+        assert sorted(p["pathId"] for p in streamed) == sorted(p["pathId"] for p in full["paths"])
+        summary = frames[-1]
+        for key in ("totalPaths", "globalRisk", "shortestHops"):
+            assert summary[key] == full[key]
+        assert summary["top5"] == full["top5"]
+        assert summary["criticalEdges"] == full["criticalEdges"]
+
+
+def test_multi_target_matches_single_searches(engine):
+    targets = engine.high_value_targets() + [e["target"] for e in ds.EDGES[::5]]
+    starts = ds.START_OPTIONS + targets[:1]
+    for min_depth, max_depth in ((0, 4), (1, 7), (4, 7)):
+        for k in (1, 5, 1000):
+            multi = engine.find_paths_multi(starts, targets, min_depth, max_depth, k)
+            assert multi == {t: engine.find_paths(starts, t, min_depth, max_depth, k)
+                             for t in dict.fromkeys(targets)}
+    grouped = engine.analyze_multi(ds.START_OPTIONS, engine.high_value_targets(), 1, 7, 10)
+    assert [g["globalRisk"] for g in grouped["targets"]] == \
+        sorted((g["globalRisk"] for g in grouped["targets"]), reverse=True)
+    assert grouped["totalPaths"] == sum(g["totalPaths"] for g in grouped["targets"])
+
+
+def scan_neighborhood(eng: GraphEngine, names: list[str], radius: int, direction: str) -> dict:
+    """Reference: BFS on the NetworkX view, then filter the full lists."""
+    G = eng.G
+    seen = {n for n in names if n in G}
+    frontier = list(seen)
+    for _ in range(radius):
+        nxt = []
+        for n in frontier:
+            nbrs = []
+            if direction != "in":
+                nbrs += G.successors(n)
+            if direction != "out":
+                nbrs += G.predecessors(n)
+            for m in nbrs:
+                if m not in seen:
+                    seen.add(m)
+                    nxt.append(m)
+        frontier = nxt
+    return {
+        "nodes": [n for n in eng.nodes if n["name"] in seen],
+        "edges": [e for e in eng.edges if e["source"] in seen and e["target"] in seen],
+    }
+
+
+def test_neighborhood_matches_full_scan(engine):
+    mutated = engine.clone()
+    mutated.remove_edge(ds.EDGES[0]["id"])
+    mutated.add_edge(ds.NODES[0]["name"], ds.NODES[-1]["name"], "AdminTo", 7)
+    for eng in (engine, mutated):
+        names = [n["name"] for n in eng.nodes]
+        for focus in (names[:1], names[-1:], names[::4]):
+            for radius in (0, 1, 2, 3):
+                for direction in ("in", "out", "both"):
+                    assert eng.get_neighborhood(focus, radius, direction) == \
+                        scan_neighborhood(eng, focus, radius, direction)
+    assert engine.get_neighbors(names[0], 2) == engine.get_neighborhood([names[0]], 2, "both")
+    with pytest.raises(ValueError):
+        engine.get_neighborhood(names[:1], 1, "sideways")
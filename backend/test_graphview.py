@@ -0,0 +1,63 @@
+"""Serialised /graph views: shapes, pagination and per-version caching."""
+import gzip
+import json
+
+import pytest
+
+from app import dataset as ds
+from app.graphview import GraphViews
+from app.models import GraphOverviewResponse, GraphResponse
+from app.synthetic import generate
+
+
+@pytest.fixture
+def views(load):
+    load(generate(400, seed=2))
+    return GraphViews()
+
+
+def test_pages_cover_the_graph(views):
+    full = json.loads(views.get("full").body)
+    assert len(full["nodes"]) == full["totalNodes"] == len(ds.NODES)
+    assert full["nextOffset"] is None
+    nodes, edges, offset = [], [], 0
+    while offset is not None:
+        page = json.loads(gzip.decompress(views.get("full", offset=offset, limit=20).gzipped))
+        GraphResponse.model_validate(page)
+        nodes += page["nodes"]
+        received = {n["name"] for n in nodes}
+        # A page's edges only refer to nodes already sent
+        assert all(e["source"] in received and e["target"] in received for e in page["edges"])
+        edges += page["edges"]
+        offset = page["nextOffset"]
+    assert nodes == full["nodes"]
+    assert sorted(e["id"] for e in edges) == sorted(e["id"] for e in full["edges"])
+
+
+def test_subnet_filter_and_overview(views):
+    subnet = ds.SUBNETS[0]["id"]
+    part = json.loads(views.get("full", subnets=(subnet,)).body)
+    names = {n["name"] for n in part["nodes"]}
+    assert names and all(n["subnet"] == subnet for n in part["nodes"])
+    assert all(e["source"] in names and e["target"] in names for e in part["edges"])
+
+    for group_by in ("subnet", "type"):
+        doc = json.loads(views.get("overview", group_by).body)
+        GraphOverviewResponse.model_validate(doc)
+        assert sum(g["nodes"] for g in doc["groups"]) == len(ds.NODES)
+        assert sum(link["edges"] for link in doc["edges"]) == len(ds.EDGES)
+    by_subnet = {g["id"]: g for g in json.loads(views.get("overview", "subnet").body)["groups"]}
+    assert by_subnet[subnet]["nodes"] == len(names)
+
+
+def test_cached_per_version(views):
+    first = views.get("full")
+    assert views.get("full") is first
+    assert first.matches(first.etag) and first.matches(f'W/{first.etag}, "other"')
+    assert not first.matches('"other"')
+    data, _, errors = ds.patch([{"op": "removeEdge", "id": ds.EDGES[0]["id"]}])
+    assert errors == []
+    ds.activate(data)
+    second = views.get("full")
+    assert second.etag != first.etag
+    assert len(json.loads(second.body)["edges"]) == len(ds.EDGES)
@@ -0,0 +1,127 @@
+"""Job queue: results, cancellation and budgets."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import dataset as ds
+from app.graph_engine import GraphEngine, SearchAborted, SearchControl
+from app.jobs import JobManager
+
+
+def spin(control: SearchControl, started: threading.Event | None = None):
+    """A search that never finishes on its own."""
+    if started is not None:
+        started.set()
+    while True:
+        control.tick(1, 0)
+
+
+def test_job_result_and_budgets(load):
+    ds.reset_to_default()
+    engine = GraphEngine()
+    jobs = JobManager(workers=1)
+    try:
+        ok = jobs.submit("analysis", lambda c: engine.analyze(ds.START_OPTIONS, "DC01", 1, 7, 50, control=c))
+        assert ok.future.result()["totalPaths"] == ok.result["totalPaths"] > 0
+        assert ok.status == "done" and ok.control.paths_found >= ok.result["totalPaths"]
+
+        capped = jobs.submit(
+            "analysis", lambda c: engine.analyze(ds.START_OPTIONS, "DC01", 1, 7, 50, control=c),
+            max_paths=1,
+        )
+        with pytest.raises(SearchAborted):
+            capped.future.result()
+        assert capped.status == "overBudget"
+
+        timed = jobs.submit("analysis", spin, time_limit=0.05)
+        with pytest.raises(SearchAborted):
+            timed.future.result()
+        assert timed.status == "timedOut"
+    finally:
+        jobs.shutdown()
+
+
+def test_cancel_running_and_queued_jobs():
+    jobs = JobManager(workers=1)
+    started = threading.Event()
+    running = jobs.submit("analysis", lambda c: spin(c, started))
+    queued = jobs.submit("analysis", spin)
+    started.wait(5)
+    assert queued.status == "queued"
+    jobs.cancel(queued.id)
+    jobs.cancel(running.id)
+    for job in (running, queued):
+        with pytest.raises(SearchAborted):
+            job.future.result(timeout=5)
+        assert job.status == "cancelled"
+    jobs.shutdown()
+
+
+def test_anytime_budget_returns_best_paths_so_far(load):
+    from app.simulation import Simulator
+    from app.synthetic import generate
+
+    load(generate(20000, seed=3))
+    engine = GraphEngine()
+    target = next(n["name"] for n in ds.NODES if n["highValue"] and n["type"] == "Computer")
+    q = (ds.START_OPTIONS, target, 1, 8, 30)
+    full = engine.analyze(*q)
+    control = SearchControl()
+    control.set_budget(None, 1000)
+    sim = Simulator(engine)
+    paths, chains = sim.analysis(*q, control=control)
+    assert control.stopped == "expansionBudget"
+    assert control.nodes_expanded < 1000 + 256 * len(chains)
+    assert 0 < len(paths) <= full["totalPaths"]
+    assert control.stats()["branchesPruned"] >= 0
+    # Every start got a share of the budget
+    assert all(hi > lo for _, _, lo, hi in paths.chains)
+    # Best-so-far paths are real paths, ranked no higher than the full answer
+    best = paths.analysis()["paths"][0]
+    assert best["risk"] <= full["paths"][0]["risk"]
+    assert set(best["nodes"]) <= {n["name"] for n in ds.NODES}
+    # A partial result is not cached: an unbudgeted query gets the full answer
+    assert sim.analysis(*q)[0].analysis() == full
+    # The streamed analysis shares the budget out the same way
+    control = SearchControl()
+    control.set_budget(None, 1000)
+    frames = list(engine.iter_analysis(*q, control=control))
+    assert control.stopped == "expansionBudget"
+    assert all(f["paths"] for f in frames if f["type"] == "paths")
+
+
+def test_history_bounded_by_result_bytes():
+    jobs = JobManager(workers=1, history_bytes=10_000)
+    try:
+        kept = [jobs.submit("analysis", lambda c: "x" * 4000) for _ in range(4)]
+        for job in kept:
+            job.future.result()
+        assert [j.id for j in jobs.list()] == [j.id for j in kept[-2:]]
+        inline = jobs.submit("analysis", lambda c: "y" * 4000, keep_result=False)
+        assert inline.future.result() == "y" * 4000 and inline.result is None
+        jobs.release(inline)
+        assert inline.future is None and jobs.get(inline.id) is inline
+    finally:
+        jobs.shutdown()
+
+
+def test_abandoned_inline_job_is_cancelled():
+    from app import main
+
+    started = threading.Event()
+
+    async def client():
+        request = asyncio.ensure_future(main._run_job("analysis", lambda c: spin(c, started)))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        request.cancel()   # the client disconnected
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+    asyncio.run(client())
+    job = main.jobs.list()[-1]
+    deadline = time.monotonic() + 5
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == "cancelled"
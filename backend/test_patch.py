@@ -0,0 +1,157 @@
+"""Dataset patches agree with reloading the patched dataset from scratch."""
+import random
+
+from app import dataset as ds, graph_engine
+from app.cache import ResultCache
+from app.graph_engine import GraphEngine
+from app.models import Mutation
+from app.simulation import Simulator
+
+
+def random_ops(rnd: random.Random, n: int) -> list[dict]:
+    names = [x["name"] for x in ds.NODES]
+    edges = {e["id"]: (e["source"], e["target"]) for e in ds.EDGES}
+    ops = []
+    for i in range(n):
+        kind = rnd.choice(("addEdge", "removeEdge", "updateEdge", "addNode", "updateNode", "removeNode"))
+        if kind == "addEdge":
+            u, v = rnd.choice(names), rnd.choice(names)
+            ops.append({"op": kind, "id": f"P{rnd.random()}", "source": u, "target": v,
+                        "relation": "GenericAll", "weight": rnd.randint(1, 10)})
+            edges[ops[-1]["id"]] = (u, v)
+        elif kind in ("removeEdge", "updateEdge") and edges:
+            eid = rnd.choice(sorted(edges))
+            ops.append({"op": kind, "id": eid, "weight": rnd.randint(1, 10)})
+            if kind == "removeEdge":
+                del edges[eid]
+        elif kind == "addNode":
+            names.append(f"NEW{rnd.random()}")
+            ops.append({"op": kind, "name": names[-1], "type": "User", "privilegeLevel": "Mid"})
+        elif kind == "updateNode":
+            ops.append({"op": kind, "name": rnd.choice(names), "privilegeLevel": "Domain Admin",
+                        "highValue": rnd.random() < 0.5})
+        elif kind == "removeNode" and len(names) > 10:
+            name = names.pop(rnd.randrange(len(names)))
+            ops.append({"op": kind, "name": name})
+            edges = {eid: ends for eid, ends in edges.items() if name not in ends}
+    return ops
+
+
+def test_patched_engine_matches_rebuild(dataset, monkeypatch):
+    monkeypatch.setattr(graph_engine, "PATCH_COMPACT_FRACTION", float("inf"))   # stay on the overlay
+    rnd = random.Random(7)
+    engine = GraphEngine()
+    for _ in range(5):
+        data, changes, errors = ds.patch(random_ops(rnd, 6))
+        assert errors == []
+        ds.activate(data)
+        engine = engine.patched(ds.NODES, ds.EDGES, changes)
+        assert engine.core.is_overlay
+        fresh = GraphEngine()
+        assert engine.nodes == fresh.nodes
+        assert engine.edges == fresh.edges
+        starts = ds.START_OPTIONS or [ds.NODES[0]["name"]]
+        target = ds.EDGES[-1]["target"]
+        assert engine.analyze(starts, target, 1, 6, 10) == fresh.analyze(starts, target, 1, 6, 10)
+        muts = [Mutation(type="removeEdge", edgeId=ds.EDGES[0]["id"])]
+        assert Simulator(engine).run(muts, starts, target, 1, 6, 10) == \
+            Simulator(fresh).run(muts, starts, target, 1, 6, 10)
+
+
+def test_cache_kept_only_when_unaffected(dataset):
+    engine = GraphEngine()
+    cache = ResultCache()
+    sim = Simulator(engine, cache)
+    starts = ds.START_OPTIONS
+    queries = [(starts, t, 1, d, 10) for t in {e["target"] for e in ds.EDGES[::7]} for d in (3, 6)]
+    for q in queries:
+        sim.analysis(*q)
+    rnd = random.Random(3)
+    for _ in range(4):
+        data, changes, errors = ds.patch(random_ops(rnd, 2))
+        assert errors == []
+        old = ds.VERSION
+        ds.activate(data)
+        engine = engine.patched(ds.NODES, ds.EDGES, changes)
+        if not engine.core.is_overlay:
+            break
+        sim, base = Simulator(engine, cache), sim.engine
+        sim.carry_over_cache(old, changes, base)
+        fresh = GraphEngine()
+        for q in queries:
+            cached = cache.get((ds.VERSION, "analysis", tuple(q[0]), *q[1:]))
+            if cached is not None:
+                assert cached[0].analysis() == fresh.analyze(*q)
+
+
+def test_cache_dropped_when_critical_edge_collapses(load, monkeypatch):
+    monkeypatch.setattr(graph_engine, "PATCH_COMPACT_FRACTION", float("inf"))
+    node = lambda name: {"id": name, "name": name, "type": "User", "privilegeLevel": "Low", "highValue": False}
+    edge = lambda eid, u, v, w: {"id": eid, "source": u, "target": v, "relation": "GenericAll", "weight": w}
+    load({
+        "nodes": [node(x) for x in "SABT"],
+        "edges": [edge("CRIT", "S", "A", 2), edge("STRONG", "S", "A", 9), edge("AT", "A", "T", 20),
+                  edge("SB", "S", "B", 10), edge("BT", "B", "T", 20)],
+        "criticalEdgeId": "CRIT", "startOptions": ["S"],
+    })
+    engine = GraphEngine()
+    cache = ResultCache()
+    q = (["S"], "T", 1, 3, 1)
+    before = Simulator(engine, cache).analysis(*q)[0].analysis()
+    assert before["paths"][0]["nodes"] == ["S", "B", "T"]
+    data, changes, errors = ds.patch([{"op": "removeEdge", "id": "STRONG"}])
+    assert errors == []
+    old = ds.VERSION
+    ds.activate(data)
+    patched = engine.patched(ds.NODES, ds.EDGES, changes)
+    assert Simulator(patched, cache).carry_over_cache(old, changes, engine) == (0, 1)
+    fresh = GraphEngine().analyze(*q)
+    assert fresh["paths"][0]["throughCritical"] and fresh != before
+    assert Simulator(patched, cache).analysis(*q)[0].analysis() == fresh
+
+
+def test_overlay_node_changes_are_sparse(dataset):
+    base = GraphEngine().core
+    over = base.overlay()
+    name = ds.NODES[0]["name"]
+    before = (base.priv[base.index[name]], base.hv[base.index[name]])
+    i = over.set_node(name, 9.0, True)
+    j = over.set_node("Fresh", 3.0, True)
+    copy = over.copy()
+    copy.set_node(name, 1.0, False)
+    assert over.priv.base is base.priv and over.hv.base is base.hv
+    assert (over.priv[i], over.hv[i], over.priv[j], over.hv[j]) == (9.0, 1, 3.0, 1)
+    assert (copy.priv[i], copy.hv[i]) == (1.0, 0)
+    assert (base.priv[i], base.hv[i]) == before
+    e = over.add_edge("X1", name, "Fresh", "GenericAll", 4)
+    assert over.pair_edges(i, j) == [e] and copy.pair_edges(i, j) == []
+
+
+def test_patch_errors_are_atomic(dataset):
+    before = (ds.VERSION, list(ds.NODES), list(ds.EDGES))
+    data, changes, errors = ds.patch([
+        {"op": "removeEdge", "id": ds.EDGES[0]["id"]},
+        {"op": "addEdge", "id": "X1", "source": ds.NODES[0]["name"], "target": "nope", "relation": "AdminTo"},
+        {"op": "addNode", "name": ds.NODES[0]["name"], "type": "User"},
+        {"op": "frobnicate"},
+    ])
+    assert data is None and changes == []
+    assert len(errors) == 3
+    assert (ds.VERSION, list(ds.NODES), list(ds.EDGES)) == before
+
+
+def test_remove_node_cascades_and_compacts(dataset):
+    victim = ds.EDGES[0]["source"]
+    data, changes, errors = ds.patch([{"op": "removeNode", "name": victim}] + [
+        {"op": "addEdge", "id": f"Q{i}", "source": ds.NODES[1]["name"],
+         "target": ds.NODES[2]["name"], "relation": "CanRDP"} for i in range(len(ds.EDGES) // 10)
+    ])
+    assert errors == []
+    assert data["REVISION"] == 1 and data["VERSION"] != ds.VERSION
+    assert all(victim not in (e["source"], e["target"]) for e in data["EDGES"])
+    assert data["EDGES"][-1]["weight"] == ds.WEIGHTS["CanRDP"]
+    engine = GraphEngine()
+    ds.activate(data)
+    patched = engine.patched(ds.NODES, ds.EDGES, changes)
+    assert not patched.core.is_overlay
+    assert patched.edges == GraphEngine().edges
@@ -0,0 +1,61 @@
+"""Compact path sets reproduce the /analyze body, in both wire formats."""
+import json
+
+from app import dataset as ds
+from app.cache import estimate_size
+
+
+def decode(wire: dict) -> dict:
+    """Full /analyze body from the compact wire format (as a client would)."""
+    nodes, table = wire["nodeTable"], wire["edgeTable"]
+    crit = wire["criticalEdge"]
+    paths = []
+    for path_id, start, hops, risk, normalized, impact in wire["paths"]:
+        edges = [{"edgeId": eid, "source": nodes[s], "target": nodes[t], "relation": rel, "weight": w}
+                 for eid, s, t, rel, w in (table[k] for k in hops)]
+        paths.append({
+            "pathId": path_id,
+            "nodes": [nodes[start]] + [e["target"] for e in edges],
+            "edges": edges,
+            "hops": len(edges),
+            "edgeTypes": [e["relation"] for e in edges],
+            "sumWeights": sum(e["weight"] for e in edges),
+            "risk": risk,
+            "normalizedScore": normalized,
+            "impactEstimation": impact,
+            "throughCritical": crit in hops,
+            "criticalEdgesInPath": [table[crit][0]] if crit in hops else [],
+        })
+    return {
+        "totalPaths": wire["totalPaths"],
+        "paths": paths,
+        "top5": [paths[i] for i in wire["top5"]],
+        "shortestHops": wire["shortestHops"],
+        "criticalEdges": wire["criticalEdges"],
+        "globalRisk": wire["globalRisk"],
+    }
+
+
+def test_path_set_matches_analysis(engine):
+    target = next(n["name"] for n in engine.nodes if n["highValue"])
+    for min_depth, k in ((1, 50), (4, 3), (7, 5)):
+        chains, found = engine._search(ds.START_OPTIONS, target, min_depth, 7, k)
+        paths = engine._path_set(chains, found)
+        expected = engine.analyze(ds.START_OPTIONS, target, min_depth, 7, k)
+        assert paths.analysis() == expected
+        assert paths.found() == {s: [(r, p, e) for r, p, e in found[s]] for s in chains}
+        wire = json.loads(json.dumps(paths.wire()))
+        assert wire["format"] == "compact"
+        assert decode(wire) == expected
+        if len(paths) >= 20:
+            assert paths.nbytes * 10 < estimate_size(expected)
+            assert len(json.dumps(wire)) * 3 < len(json.dumps(expected))
+
+
+def test_touches(engine):
+    target = next(n["name"] for n in engine.nodes if n["highValue"])
+    paths = engine._path_set(*engine._search(ds.START_OPTIONS, target, 1, 7, 5))
+    first = paths.records()[0]
+    assert paths.touches({first["nodes"][1]}, set())
+    assert paths.touches(set(), {first["edges"][0]["edgeId"]})
+    assert not paths.touches({"no such node"}, {"no such edge"})
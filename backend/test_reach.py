@@ -0,0 +1,44 @@
+"""Reachability tables stay exact as the engine mutates."""
+import random
+
+import pytest
+
+from app import dataset as ds
+from app.reach import UNREACHABLE, full_distances
+from app.synthetic import generate
+
+
+pytestmark = pytest.mark.parametrize("dataset", [generate(400, seed=s) for s in range(3)], indirect=True)
+
+
+def test_tables_match_rebuild_after_mutations(engine):
+    rnd = random.Random(11)
+    names = [n["name"] for n in ds.NODES]
+    targets = [engine.core.index[n] for n in rnd.sample(names, 5)] + [engine.core.index["DC000000"]]
+    for t in targets:
+        engine.distances(t)
+    for step in range(60):
+        eng = engine.clone() if step % 10 == 0 else engine
+        r = rnd.random()
+        if r < 0.4:
+            eng.add_edge(rnd.choice(names), rnd.choice(names), "GenericAll", 9)
+        elif r < 0.9:
+            eng.remove_edge(rnd.choice(eng.edges)["id"])
+        else:
+            eng.remove_node_full(rnd.choice(names))
+        core = eng.core
+        for t in targets:
+            if core.blocked()[t]:
+                continue
+            assert list(eng.distances(t)) == list(full_distances(core, t))
+    assert engine.reach_stats()["repairs"] > 0
+
+
+def test_unreachable_starts_are_skipped(engine):
+    dc = "DC000000"
+    t = engine.core.index[dc]
+    cut_off = [n for n in engine.core.names if engine.distances(t)[engine.core.index[n]] == UNREACHABLE]
+    assert cut_off
+    builds = engine.reach_stats()["builds"]
+    assert engine.find_paths(cut_off[:50], dc, 1, 8, 5) == []
+    assert engine.reach_stats()["builds"] == builds
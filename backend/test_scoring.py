@@ -0,0 +1,53 @@
+"""Batch scoring must reproduce the per-path raw risks bit for bit."""
+import networkx as nx
+
+from app import dataset as ds
+from app.graph_engine import GraphEngine, path_raw_risk
+from app.scoring import raw_risks
+from conftest import reference_risk
+
+
+def simple_paths(eng: GraphEngine) -> tuple[list[list[int]], list[list[int]]]:
+    core = eng.core
+    paths, hops = [], []
+    for target in (n["name"] for n in eng.nodes if n["highValue"]):
+        for start in ds.START_OPTIONS:
+            for names in nx.all_simple_paths(eng.G, start, target, cutoff=7):
+                ids = [core.index[x] for x in names]
+                paths.append(ids)
+                hops.append([core.edge_between(u, v) for u, v in zip(ids, ids[1:])])
+    return paths, hops
+
+
+def test_batch_matches_per_path(engine):
+    paths, hops = simple_paths(engine)
+    assert paths
+    crit = engine._crit_edge()
+    got = raw_risks(engine.core, paths, hops, crit).tolist()
+    assert got == [path_raw_risk(engine.core, p, e, crit) for p, e in zip(paths, hops)]
+    # The dict-based reference scorer grades them the same way
+    core = engine.core
+    for raw, p in zip(got[:200], paths):
+        assert GraphEngine._grade(raw) == reference_risk(engine, [core.names[i] for i in p])
+    # Search results carry the same raw risks
+    target = next(n["name"] for n in engine.nodes if n["highValue"])
+    _, found = engine._search(ds.START_OPTIONS, target, 1, 7, 50)
+    for results in found.values():
+        raws = [r for r, _, _ in results]
+        assert raw_risks(engine.core, [p for _, p, _ in results], [e for _, _, e in results], crit).tolist() == raws
+    assert raw_risks(engine.core, [], []).size == 0
+
+
+def test_overlay_columns(engine):
+    eng = engine.clone()
+    names = [n["name"] for n in eng.nodes]
+    eng.add_edge(names[0], "Newcomer", "GenericAll", 9)
+    eng.add_edge("Newcomer", names[-1], "AdminTo", 7)
+    core = eng.core
+    core.set_node(names[0], 4.5, True)
+    core.set_node("Newcomer", 2.0, False)
+    a, b, c = core.index[names[0]], core.index["Newcomer"], core.index[names[-1]]
+    paths = [[a, b, c], [a, b], [c]]
+    hops = [[core.edge_between(a, b), core.edge_between(b, c)], [core.edge_between(a, b)], []]
+    got = raw_risks(core, paths, hops, eng._crit_edge()).tolist()
+    assert got == [path_raw_risk(core, p, e, eng._crit_edge()) for p, e in zip(paths, hops)]
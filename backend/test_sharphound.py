@@ -0,0 +1,111 @@
+"""SharpHound collection import."""
+import json
+import zipfile
+
+import pytest
+
+from app import dataset as ds, sharphound
+from app.graph_engine import GraphEngine
+
+D = "S-1-5-21-1000"
+
+
+def _collection() -> dict[str, dict]:
+    user = lambda rid, name, **p: {"ObjectIdentifier": f"{D}-{rid}", "Properties": {"name": name, **p}, "Aces": []}
+    return {
+        "20240101_users.json": {
+            "data": [
+                user(1101, "ALICE@CORP.LOCAL", enabled=True),
+                user(1102, "BOB@CORP.LOCAL", hasspn=True),
+                {**user(1103, "ADMIN@CORP.LOCAL", admincount=True),
+                 "Aces": [{"PrincipalSID": f"{D}-1101", "PrincipalType": "User",
+                           "RightName": "ForceChangePassword", "IsInherited": False}]},
+            ],
+            "meta": {"type": "users", "count": 3, "version": 5},
+        },
+        "20240101_groups.json": {
+            "meta": {"type": "groups", "count": 2, "version": 5},   # meta first is fine too
+            "data": [
+                {"ObjectIdentifier": f"{D}-512", "Properties": {"name": "DOMAIN ADMINS@CORP.LOCAL"},
+                 "Members": [{"ObjectIdentifier": f"{D}-1103", "ObjectType": "User"}],
+                 "Aces": [{"PrincipalSID": f"{D}-1102", "PrincipalType": "User", "RightName": "WriteDacl"}]},
+                {"ObjectIdentifier": f"{D}-516", "Properties": {"name": "DOMAIN CONTROLLERS@CORP.LOCAL"},
+                 "Members": [{"ObjectIdentifier": f"{D}-1000", "ObjectType": "Computer"}], "Aces": []},
+            ],
+        },
+        "20240101_computers.json": {
+            "data": [
+                {"ObjectIdentifier": f"{D}-1000", "Properties": {"name": "DC01.CORP.LOCAL"},
+                 "Sessions": {"Results": [], "Collected": True}, "Aces": []},
+                {"ObjectIdentifier": f"{D}-1200", "Properties": {"name": "WS01.CORP.LOCAL"},
+                 "Sessions": {"Results": [{"UserSID": f"{D}-1103", "ComputerSID": f"{D}-1200"}]},
+                 "LocalAdmins": {"Results": [{"ObjectIdentifier": f"{D}-1101", "ObjectType": "User"}]},
+                 "RemoteDesktopUsers": {"Results": [{"ObjectIdentifier": f"{D}-1102", "ObjectType": "User"}]},
+                 "Aces": []},
+            ],
+            "meta": {"type": "computers", "count": 2, "version": 5},
+        },
+        "20240101_domains.json": {
+            "data": [{"ObjectIdentifier": D, "Properties": {"name": "CORP.LOCAL"}, "Aces": [
+                {"PrincipalSID": f"{D}-512", "PrincipalType": "Group", "RightName": "GetChanges"},
+                {"PrincipalSID": f"{D}-512", "PrincipalType": "Group", "RightName": "GetChangesAll"},
+                {"PrincipalSID": f"{D}-1102", "PrincipalType": "User", "RightName": "GetChanges"},
+            ]}],
+            "meta": {"type": "domains", "count": 1, "version": 5},
+        },
+    }
+
+
+@pytest.fixture
+def collection_zip(tmp_path):
+    path = tmp_path / "collection.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, body in _collection().items():
+            zf.writestr(name, json.dumps(body))
+    return str(path)
+
+
+def test_import_maps_objects_and_relations(load, collection_zip):
+    data, errors = sharphound.load_collection(collection_zip, workers=1)
+    assert errors == []
+    nodes = {n["name"]: n for n in data["NODES"]}
+    assert nodes["DC01.CORP.LOCAL"]["privilegeLevel"] == "Domain Controller"
+    assert nodes["DC01.CORP.LOCAL"]["highValue"]
+    assert nodes["DOMAIN ADMINS@CORP.LOCAL"]["privilegeLevel"] == "Domain Admin"
+    assert nodes["ADMIN@CORP.LOCAL"]["privilegeLevel"] == "Domain Admin"
+    assert nodes["BOB@CORP.LOCAL"]["privilegeLevel"] == "Service"
+    assert nodes["CORP.LOCAL"]["type"] == "Domain"
+
+    rels = {(e["source"], e["relation"], e["target"]) for e in data["EDGES"]}
+    assert ("ADMIN@CORP.LOCAL", "MemberOf", "DOMAIN ADMINS@CORP.LOCAL") in rels
+    assert ("WS01.CORP.LOCAL", "HasSession", "ADMIN@CORP.LOCAL") in rels
+    assert ("ALICE@CORP.LOCAL", "AdminTo", "WS01.CORP.LOCAL") in rels
+    assert ("BOB@CORP.LOCAL", "CanRDP", "WS01.CORP.LOCAL") in rels
+    assert ("BOB@CORP.LOCAL", "WriteDACL", "DOMAIN ADMINS@CORP.LOCAL") in rels
+    assert ("DOMAIN ADMINS@CORP.LOCAL", "DCSync", "CORP.LOCAL") in rels
+    assert not any(r == "DCSync" and s == "BOB@CORP.LOCAL" for s, r, _ in rels)   # GetChanges alone
+    assert all(e["weight"] == ds.DEFAULT_WEIGHTS.get(e["relation"], 5) for e in data["EDGES"])
+    assert data["START_OPTIONS"] == ["ALICE@CORP.LOCAL"]
+
+    ds.activate(data)
+    result = GraphEngine().analyze(ds.START_OPTIONS, "CORP.LOCAL", 1, 6, 5)
+    found = [p["nodes"] for p in result["paths"]]
+    assert ["ALICE@CORP.LOCAL", "ADMIN@CORP.LOCAL", "DOMAIN ADMINS@CORP.LOCAL", "CORP.LOCAL"] in found
+    assert ["ALICE@CORP.LOCAL", "WS01.CORP.LOCAL", "ADMIN@CORP.LOCAL",
+            "DOMAIN ADMINS@CORP.LOCAL", "CORP.LOCAL"] in found
+
+
+def test_parallel_import_matches_serial(collection_zip, monkeypatch):
+    monkeypatch.setattr(sharphound, "PARALLEL_MIN_BYTES", 0)
+    assert sharphound.load_collection(collection_zip, workers=2) == \
+        sharphound.load_collection(collection_zip, workers=1)
+
+
+def test_bad_archives(tmp_path):
+    bad = tmp_path / "bad.zip"
+    bad.write_bytes(b"PK\x03\x04 not really a zip")
+    assert sharphound.load_collection(str(bad))[0] is None
+    empty = tmp_path / "empty.zip"
+    with zipfile.ZipFile(empty, "w") as zf:
+        zf.writestr("readme.txt", "hi")
+    assert sharphound.load_collection(str(empty)) == (None, ["Zip archive contains no JSON files"])
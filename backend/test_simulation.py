@@ -0,0 +1,49 @@
+"""Incremental simulation must agree with a full re-analysis."""
+from app import dataset as ds
+from app.graph_engine import GraphEngine
+from app.models import Mutation
+from app.simulation import Simulator, apply_mutations
+
+
+def scenarios(eng: GraphEngine) -> list[list[Mutation]]:
+    out = [[Mutation(**m) for m in p["mutations"]] for p in ds.SCENARIO_PRESETS.values()]
+    for e in eng.edges:
+        out.append([Mutation(type="removeEdge", edgeId=e["id"])])
+    for n in eng.nodes:
+        out.append([Mutation(type="removeNode", nodeId=n["name"])])
+    names = [n["name"] for n in eng.nodes]
+    out.append([
+        Mutation(type="addEdge", source=names[0], target=names[-1], relation="GenericAll", weight=9),
+        Mutation(type="removeEdge", edgeId=eng.edges[0]["id"]),
+    ])
+    return out
+
+
+def test_incremental_matches_full(engine):
+    sim = Simulator(engine)
+    target = "DC01" if "DC01" in engine.core.index else "DC-PRIMARY"
+    for muts in scenarios(engine):
+        mutated = engine.clone()
+        apply_mutations(mutated, muts)
+        for k in (1, 3, 50):
+            _, after = sim.run(muts, ds.START_OPTIONS, target, 1, 7, k)
+            expected = mutated.analyze(ds.START_OPTIONS, target, 1, 7, k)
+            assert [(p["pathId"], p["nodes"], p["risk"]) for p in after["paths"]] == \
+                [(p["pathId"], p["nodes"], p["risk"]) for p in expected["paths"]]
+            assert after["globalRisk"] == expected["globalRisk"]
+
+
+def test_overlay_matches_rebuild(engine):
+    target = "DC01" if "DC01" in engine.core.index else "DC-PRIMARY"
+    for muts in scenarios(engine):
+        mutated = engine.clone()
+        apply_mutations(mutated, muts)
+        rebuilt = GraphEngine(mutated.nodes, mutated.edges)
+        for k in (3, 50):
+            got = mutated.analyze(ds.START_OPTIONS, target, 1, 7, k)["paths"]
+            want = rebuilt.analyze(ds.START_OPTIONS, target, 1, 7, k)["paths"]
+            # Node ids differ after a rebuild, so equal-risk ties may rank differently
+            assert [p["risk"] for p in got] == [p["risk"] for p in want]
+            if k == 50:
+                assert sorted((p["risk"], p["nodes"]) for p in got) == \
+                    sorted((p["risk"], p["nodes"]) for p in want)
@@ -0,0 +1,94 @@
+"""A memory-mapped snapshot serves the same dataset and analyses as JSON."""
+from pathlib import Path
+
+import pytest
+
+from app import dataset as ds, parallel, snapshot
+from app.graph_engine import GraphEngine
+from app.models import Mutation
+from app.simulation import Simulator
+from app.synthetic import generate
+from conftest import DATASETS
+
+
+def roundtrip(raw: dict, tmp_path: Path) -> tuple[dict, dict]:
+    data = ds._materialise(raw)
+    core = GraphEngine(data["NODES"], data["EDGES"]).core
+    snapshot.write(tmp_path / "g.snap", data, core)
+    return data, snapshot.load(tmp_path / "g.snap")
+
+
+@pytest.mark.parametrize("raw", [ds._load_json(p) for p in DATASETS] + [generate(800, seed=3)])
+def test_snapshot_matches_json(raw, tmp_path):
+    data, mapped = roundtrip(raw, tmp_path)
+    assert list(mapped.pop("NODES")) == data.pop("NODES")
+    assert list(mapped.pop("EDGES")) == data.pop("EDGES")
+    mapped.pop("CORE")
+    assert mapped == data
+
+
+def test_mapped_engine_analyses_match(dataset, tmp_path):
+    _, mapped = roundtrip(dataset, tmp_path)
+    built = GraphEngine()
+    starts, target = ds.START_OPTIONS, ds.EDGES[-1]["target"]
+    expected = built.analyze(starts, target, 1, 6, 10)
+    mutations = [Mutation(type="removeEdge", edgeId=ds.EDGES[0]["id"]),
+                 Mutation(type="addEdge", source=starts[0], target=target, relation="AdminTo", weight=7)]
+    expected_sim = Simulator(built).run(mutations, starts, target, 1, 6, 10)
+
+    ds.activate(mapped)
+    engine = GraphEngine(core=ds.CORE)
+    assert engine.analyze(starts, target, 1, 6, 10) == expected
+    assert Simulator(engine).run(mutations, starts, target, 1, 6, 10) == expected_sim
+    assert engine.get_neighbors(starts[0], 2) == built.get_neighbors(starts[0], 2)
+
+
+def test_workers_map_snapshot_file(tmp_path, monkeypatch):
+    _, mapped = roundtrip(generate(600, seed=5), tmp_path)
+    shared = parallel.publish(mapped["CORE"])
+    assert shared.path == str(tmp_path / "g.snap")
+
+
+def test_store_reopens_latest(tmp_path):
+    store = snapshot.SnapshotStore(tmp_path, keep=2)
+    for seed in range(3):
+        data = ds._materialise(generate(200, seed=seed))
+        store.save(data, GraphEngine(data["NODES"], data["EDGES"]).core)
+    assert len(store.list()) == 2
+    assert store.latest()["VERSION"] == data["VERSION"]
+
+
+def test_rejects_foreign_files(tmp_path):
+    bad = tmp_path / "bad.snap"
+    bad.write_bytes(b"not a snapshot at all")
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.load(bad)
+
+
+def test_patches_survive_restart(load, tmp_path, monkeypatch):
+    import importlib
+
+    from app import main
+    from app.models import DatasetPatch
+
+    monkeypatch.setenv("APF_SNAPSHOT_DIR", str(tmp_path))
+    main = importlib.reload(main)
+    main._switch_dataset(ds._materialise(generate(300, seed=4)))
+    eid, name = ds.EDGES[0]["id"], ds.NODES[1]["name"]
+    for ops in ([{"op": "removeEdge", "id": eid}],
+                [{"op": "updateNode", "name": name, "privilegeLevel": "Domain Admin"}]):
+        assert not main.patch_dataset(DatasetPatch(ops=ops)).compacted
+    version, revision, edges = ds.VERSION, ds.REVISION, list(ds.EDGES)
+    target = ds.EDGES[-1]["target"]
+    expected = main.engine.analyze(ds.START_OPTIONS, target, 1, 6, 10)
+    main.jobs.shutdown()
+
+    ds.reload_from_json({"nodes": [], "edges": []})
+    main = importlib.reload(main)   # a restart
+    try:
+        assert (ds.VERSION, ds.REVISION, list(ds.EDGES)) == (version, revision, edges)
+        assert main.engine.analyze(ds.START_OPTIONS, target, 1, 6, 10) == expected
+    finally:
+        main.jobs.shutdown()
+        monkeypatch.delenv("APF_SNAPSHOT_DIR")
+        importlib.reload(main)
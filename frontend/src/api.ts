@@ -1,6 +1,9 @@
 /* ── API client — talks to FastAPI backend on port 8000 ──────────────── */
 
-import type { AnalysisResult, GraphNode, GraphEdge, SimulateResult, MutationDef, SubnetDef } from './types';
+import type {
+  AnalysisResult, AnalysisFrame, Chokepoints, CompactAnalysisResult, ExplanationStep, GraphNode, GraphEdge,
+  PathExplanation, PathInfo, SimulateResult, MutationDef, SubnetDef,
+} from './types';
 
 const API = 'http://localhost:8000';
 
@@ -42,18 +45,117 @@ export async function runAnalysis(params: {
   const r = await fetch(`${API}/analyze`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify(params),
+    body: JSON.stringify({ ...params, compact: true }),
   });
   if (!r.ok) throw new Error('Analysis failed');
+  return expandAnalysis(await r.json());
+}
+
+/** Full analysis result from the compact wire format. */
+export function expandAnalysis(c: CompactAnalysisResult): AnalysisResult {
+  const { nodeTable: nodes, edgeTable: table, criticalEdge: crit } = c;
+  const paths: PathInfo[] = c.paths.map(([pathId, start, hops, risk, normalizedScore, impactEstimation]) => {
+    const edges = hops.map((k) => {
+      const [edgeId, s, t, relation, weight] = table[k];
+      return { edgeId, source: nodes[s], target: nodes[t], relation, weight };
+    });
+    const throughCritical = crit !== null && hops.includes(crit);
+    return {
+      pathId,
+      nodes: [nodes[start], ...edges.map((e) => e.target)],
+      edges,
+      hops: edges.length,
+      edgeTypes: edges.map((e) => e.relation),
+      sumWeights: edges.reduce((sum, e) => sum + e.weight, 0),
+      risk,
+      normalizedScore,
+      impactEstimation,
+      throughCritical,
+      criticalEdgesInPath: throughCritical ? [table[crit!][0]] : [],
+    };
+  });
+  return {
+    totalPaths: c.totalPaths,
+    paths,
+    top5: c.top5.map((i) => paths[i]),
+    shortestHops: c.shortestHops,
+    criticalEdges: c.criticalEdges,
+    globalRisk: c.globalRisk,
+    analysisId: c.analysisId,
+  };
+}
+
+/** Streaming /analyze: calls `onFrame` for each NDJSON frame as it arrives. */
+export async function streamAnalysis(
+  params: {
+    startNodes: string[];
+    targetNode: string;
+    minDepth: number;
+    maxDepth: number;
+    k: number;
+  },
+  onFrame: (frame: AnalysisFrame) => void,
+): Promise<void> {
+  const r = await fetch(`${API}/analyze/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(params),
+  });
+  if (!r.ok || !r.body) throw new Error('Analysis failed');
+  const reader = r.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffered = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffered += value;
+    const lines = buffered.split('\n');
+    buffered = lines.pop() ?? '';
+    for (const line of lines) {
+      if (line) onFrame(JSON.parse(line));
+    }
+  }
+  if (buffered) onFrame(JSON.parse(buffered));
+}
+
+export async function fetchChokepoints(params: {
+  startNodes: string[];
+  targetNode: string;
+  maxDepth: number;
+}): Promise<Chokepoints> {
+  const r = await fetch(`${API}/chokepoints`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(params),
+  });
+  if (!r.ok) throw new Error('Chokepoint analysis failed');
   return r.json();
 }
 
-export async function fetchExplanation(pathId: string): Promise<{ pathId: string; explanation: string }> {
-  const r = await fetch(`${API}/explain?pathId=${encodeURIComponent(pathId)}`);
+export async function fetchExplanation(
+  pathId: string,
+  analysisId?: string,
+): Promise<{ pathId: string; explanation: string; steps: ExplanationStep[] }> {
+  const query = analysisId ? `&analysisId=${encodeURIComponent(analysisId)}` : '';
+  const r = await fetch(`${API}/explain?pathId=${encodeURIComponent(pathId)}${query}`);
   if (!r.ok) throw new Error('Explanation not found');
   return r.json();
 }
 
+/** Explanations of many paths of one analysis (all of them if `pathIds` is empty). */
+export async function fetchExplanations(
+  pathIds: string[],
+  analysisId?: string,
+  opts: { text?: boolean; steps?: boolean } = {},
+): Promise<{ analysisId: string; explanations: PathExplanation[]; missing: string[] }> {
+  const r = await fetch(`${API}/explain/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ pathIds, analysisId, ...opts }),
+  });
+  if (!r.ok) throw new Error('Explanations not found');
+  return r.json();
+}
+
 export async function runSimulation(
   scenarioId: string,
   mutations: MutationDef[],
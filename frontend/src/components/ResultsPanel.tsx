@@ -4,6 +4,7 @@ import { useStore } from '../store';
 
 export default function ResultsPanel() {
   const analysis = useStore((s: any) => s.analysis);
+  const chokepoints = useStore((s: any) => s.chokepoints);
   const selectedPathId = useStore((s: any) => s.selectedPathId);
   const selectPath = useStore((s: any) => s.selectPath);
   const loadExplanation = useStore((s: any) => s.loadExplanation);
@@ -17,6 +18,8 @@ export default function ResultsPanel() {
     );
   }
 
+  const mustPass = new Set<string>((chokepoints?.edges ?? []).map((e: any) => e.edgeId));
+
   return (
     <div className="panel">
       <h3>Results</h3>
@@ -80,20 +83,51 @@ export default function ResultsPanel() {
         </tbody>
       </table>
 
+      {/* Structural chokepoints (every path, not just the listed ones) */}
+      {chokepoints?.reachable && (
+        <>
+          <h4>Chokepoints (on every path)</h4>
+          <div className="critical-list">
+            {chokepoints.edges.map((ce: any) => (
+              <div key={ce.edgeId} className="critical-item highlight">
+                <strong>{ce.edgeId}</strong>
+                &nbsp;{ce.source} &rarr;&nbsp;
+                <em>{ce.relation}</em>
+                &nbsp;&rarr; {ce.target}
+              </div>
+            ))}
+            {chokepoints.nodes.map((n: any) => (
+              <div key={n.name} className="critical-item">
+                <strong>{n.name}</strong>{n.highValue ? ' ★' : ''}
+              </div>
+            ))}
+            {chokepoints.edges.length === 0 && chokepoints.nodes.length === 0 && (
+              <p className="muted">No single node or edge is on every path.</p>
+            )}
+            {chokepoints.cutComplete && (
+              <p className="muted">
+                Minimum cut: {chokepoints.edgeDisjointPaths} edge(s) —{' '}
+                {chokepoints.minCut.map((e: any) => e.edgeId).join(', ')}
+              </p>
+            )}
+          </div>
+        </>
+      )}
+
       {/* Critical edges */}
       <h4>Critical Edges (bottlenecks)</h4>
       <div className="critical-list">
         {analysis.criticalEdges.slice(0, 5).map((ce) => (
           <div
             key={ce.edgeId}
-            className={`critical-item ${ce.edgeId === 'E090' ? 'highlight' : ''}`}
+            className={`critical-item ${ce.edgeId === 'E090' || mustPass.has(ce.edgeId) ? 'highlight' : ''}`}
           >
             <strong>{ce.edgeId}</strong>
             &nbsp;{ce.source} &rarr;&nbsp;
             <em>{ce.relation}</em>
             &nbsp;&rarr; {ce.target}
             <span className="badge-sm">
-              {ce.traversalCount} paths ({ce.percentOfPaths}%)
+              {mustPass.has(ce.edgeId) ? 'every path' : `${ce.traversalCount} paths (${ce.percentOfPaths}%)`}
             </span>
           </div>
         ))}
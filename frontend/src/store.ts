@@ -2,7 +2,7 @@
 
 import { create } from 'zustand';
 import type {
-  GraphNode, GraphEdge, AnalysisResult, SimulateResult,
+  GraphNode, GraphEdge, AnalysisResult, Chokepoints, SimulateResult,
   MutationDef, PathInfo, SubnetDef, NodeFilters, EdgeFilters,
 } from './types';
 import * as api from './api';
@@ -50,6 +50,7 @@ interface AppState {
   subnets: SubnetDef[];
   startOptions: string[];
   analysis: AnalysisResult | null;
+  chokepoints: Chokepoints | null;
   selectedPathId: string | null;
   scenario: SimulateResult | null;
   scenarioLabel: string;
@@ -120,6 +121,7 @@ export const useStore = create<AppState>((set: any, get: any) => ({
   subnets: [],
   startOptions: [],
   analysis: null,
+  chokepoints: null,
   selectedPathId: null,
   scenario: null,
   scenarioLabel: '',
@@ -162,16 +164,19 @@ export const useStore = create<AppState>((set: any, get: any) => ({
   },
 
   runAnalysis: async (startNodes: string[], target: string) => {
-    set({ loading: true, analysis: null, scenario: null, selectedPathId: null, scenarioHighlight: null, error: null });
+    set({ loading: true, analysis: null, chokepoints: null, scenario: null, selectedPathId: null, scenarioHighlight: null, error: null });
     try {
-      const result = await api.runAnalysis({
-        startNodes,
-        targetNode: target,
-        minDepth: 1,
-        maxDepth: 7,
-        k: 50,
-      });
-      set({ analysis: result, loading: false });
+      const [result, chokepoints] = await Promise.all([
+        api.runAnalysis({
+          startNodes,
+          targetNode: target,
+          minDepth: 1,
+          maxDepth: 7,
+          k: 50,
+        }),
+        api.fetchChokepoints({ startNodes, targetNode: target, maxDepth: 7 }).catch(() => null),
+      ]);
+      set({ analysis: result, chokepoints, loading: false });
     } catch (e: any) {
       set({ loading: false, error: e.message });
     }
@@ -248,7 +253,7 @@ export const useStore = create<AppState>((set: any, get: any) => ({
 
   loadExplanation: async (pathId: string) => {
     try {
-      const data = await api.fetchExplanation(pathId);
+      const data = await api.fetchExplanation(pathId, get().analysis?.analysisId);
       set({ explanation: data.explanation, showExplanation: true });
     } catch (e: any) {
       set({ error: e.message });
@@ -48,6 +48,25 @@ export interface CriticalEdge {
   percentOfPaths: number;
 }
 
+/** Structural chokepoints from /chokepoints (exact, not from the path list). */
+export interface ChokepointEdge {
+  edgeId: string;
+  source: string;
+  relation: string;
+  target: string;
+  parallelEdgeIds: string[];
+}
+
+export interface Chokepoints {
+  reachable: boolean;
+  relevantNodes: number;
+  nodes: { name: string; highValue: boolean }[];
+  edges: ChokepointEdge[];
+  edgeDisjointPaths: number;
+  cutComplete: boolean;
+  minCut: ChokepointEdge[];
+}
+
 export interface AnalysisResult {
   totalPaths: number;
   paths: PathInfo[];
@@ -55,6 +74,62 @@ export interface AnalysisResult {
   shortestHops: number;
   criticalEdges: CriticalEdge[];
   globalRisk: number;
+  analysisId?: string;
+  /** A timeBudget / expansionBudget ran out: best paths found so far */
+  partial?: boolean;
+  stopReason?: 'timeBudget' | 'expansionBudget' | null;
+  searchStats?: SearchStats | null;
+}
+
+export interface SearchStats {
+  nodesExpanded: number;
+  branchesPruned: number;
+  pathsScored: number;
+}
+
+/** /analyze body with `compact: true`: shared node / edge tables, paths as indices. */
+export interface CompactAnalysisResult extends Omit<AnalysisResult, 'paths' | 'top5'> {
+  format: 'compact';
+  nodeTable: string[];
+  /** [edgeId, source, target, relation, weight]; endpoints index nodeTable */
+  edgeTable: [string, number, number, string, number][];
+  /** [pathId, start node, edgeTable indices, risk, normalizedScore, impactEstimation] */
+  paths: [string, number, number[], number, number, string][];
+  top5: number[];
+  criticalEdge: number | null;
+}
+
+/** Running aggregates sent by /analyze/stream (no full path list). */
+export type StreamAggregates = Omit<AnalysisResult, 'paths'>;
+
+export type AnalysisFrame =
+  | { type: 'paths'; chain: string; startNode: string; paths: PathInfo[] }
+  | ({ type: 'progress'; completedStarts: number; totalStarts: number } & StreamAggregates)
+  | ({ type: 'summary'; analysisId: string } & StreamAggregates)
+  | { type: 'error'; error: string };
+
+export interface ExplanationStep {
+  step: number;
+  edgeId: string;
+  source: string;
+  target: string;
+  relation: string;
+  weight: number;
+  cumulativeWeight: number;
+  description: string;
+  privilegeGained: string;
+}
+
+export interface PathExplanation {
+  pathId: string;
+  risk: number;
+  normalizedScore: number | null;
+  impactEstimation: string;
+  hops: number;
+  sumWeights: number;
+  throughCritical: boolean;
+  steps: ExplanationStep[] | null;
+  explanation: string | null;
 }
 
 export interface AnalysisSummary {
@@ -63,6 +138,7 @@ export interface AnalysisSummary {
   shortestHops: number;
   highValueTargetsReachable: number;
   pathIds: string[];
+  analysisId?: string;
 }
 
 export interface SimulateResult {